@@ -0,0 +1,19 @@
+"""
+Benchmarks of map generation, FOV, pathfinding, turn processing and saving
+
+Game modules are imported from src and run in headless mode
+
+Usage:
+    python -m benchmarks
+    python -m benchmarks --only fov pathfinding
+    python -m benchmarks --save-baseline
+"""
+import os
+import sys
+
+# Has to be set before game modules are imported
+os.environ.setdefault("ROGUELIKE_HEADLESS", "1")
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
@@ -0,0 +1,139 @@
+"""
+Runs benchmarks, writes results to JSON and compares them against a baseline
+
+Results are compared by name and params. A result more than --threshold
+slower than baseline is a regression and makes the run exit with 1. The
+default threshold of 2x is above the run to run noise of a busy machine,
+lower it when benchmarking on a quiet one. If anything is slower, benchmarks
+are run again and only results slower both times are regressions. Times
+from another machine or Python can't be compared, so regressions are only
+reported, not failed on, if baseline was recorded on one
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+
+import benchmarks
+from benchmarks import suite
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, 'results.json')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+
+def result_key(name, params):
+    """
+    Returns key of result, ie name[param=value,...]
+
+    Args:
+        name (String): name of benchmark result
+        params (dict): params result was timed with
+    """
+    return "{}[{}]".format(name, ",".join("{}={}".format(key, value) for key, value in sorted(params.items())))
+
+
+def run_benchmarks(names):
+    """
+    Runs benchmarks and returns results
+
+    Args:
+        names (List): names of benchmarks in suite.benchmark_dict to run
+
+    Returns:
+        results (dict): dictionary with result key as key and seconds as value
+    """
+    results = {}
+    for name in names:
+        for result_name, params, seconds in suite.benchmark_dict[name]():
+            key = result_key(result_name, params)
+            results[key] = seconds
+            print("{:<60}{:>12.3f} ms".format(key, seconds * 1000))
+    return results
+
+
+def machine():
+    """
+    Returns description of machine and Python benchmarks are run on
+
+    Returns:
+        machine (dict): python version, platform, processor and # of CPUs
+    """
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints results next to baseline and returns keys of regressions
+
+    Args:
+        results (dict): results of this run
+        baseline (dict): results of baseline run
+        threshold (float): fraction result can be slower than baseline
+            before it counts as a regression
+
+    Returns:
+        regressions (List): keys of results slower than threshold
+    """
+    regressions = []
+    print("\n{:<60}{:>12}{:>12}{:>9}".format("benchmark", "baseline ms", "now ms", "ratio"))
+    for key, seconds in results.items():
+        if key not in baseline:
+            continue
+        ratio = seconds / baseline[key]
+        status = ""
+        if ratio > 1 + threshold:
+            status = "  slower"
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            status = "  faster"
+        print("{:<60}{:>12.3f}{:>12.3f}{:>8.2f}x{}".format(
+            key, baseline[key] * 1000, seconds * 1000, ratio, status))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--only", nargs="+", choices=list(suite.benchmark_dict), default=list(suite.benchmark_dict),
+                        help="benchmarks to run")
+    parser.add_argument("--output", default=RESULTS_PATH, help="JSON file to write results to")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="JSON file of results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write results to baseline instead")
+    parser.add_argument("--threshold", type=float, default=1.0,
+                        help="fraction slower than baseline that counts as a regression")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.only)
+    data = dict(machine(), seed=suite.SEED, results=results)
+    output = args.baseline if args.save_baseline else args.output
+    with open(output, 'w') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+    print("\nWrote results to " + output)
+
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            # Runs this slower than baseline are often just a busy machine, so
+            # benchmarks are run again and only results slower both times count
+            print("\nRunning benchmarks again to confirm regressions\n")
+            rerun = run_benchmarks(args.only)
+            results = {key: min(seconds, rerun[key]) for key, seconds in results.items()}
+            regressions = compare(results, baseline["results"], args.threshold)
+        baseline_machine = {key: baseline.get(key) for key in machine()}
+        if baseline_machine != machine():
+            print("\nBaseline was recorded on {}, not this machine, so regressions don't fail the run"
+                  .format(baseline_machine))
+        elif regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark of the FOV algorithms in fov.py
+
+Prints microseconds per FOV calculation for every algorithm in
+fov.fov_algorithm_dict across FOV radii and map sizes
+
+Usage:
+    python benchmarks/fov_benchmark.py
+"""
+import os
+import random
+import sys
+import timeit
+from types import SimpleNamespace
+
+# Game modules open a window on import, so use a dummy video driver
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from constant import *
+# config has to be imported before other game modules because of circular imports
+import config
+import gamemap
+import fov
+
+MAP_SIZES = [35, 100, 200]
+RADII = [4, 8, 16]
+# Number of positions to calculate FOV from on each map
+NUM_POSITIONS = 50
+REPEAT = 3
+
+
+def _floor_positions(map_info, count):
+    """
+    Returns count random positions of non wall tiles on map
+
+    Args:
+        map_info (MapInfo): Map to choose positions from
+        count (int): Number of positions to choose
+
+    Returns:
+        positions (List): List of positions with x and y attributes
+    """
+    floors = [(x, y) for y in range(map_info.tile_height) for x in range(map_info.tile_width)
+              if map_info.tile_array[y][x].type != WALL]
+    return [SimpleNamespace(x=x, y=y) for x, y in random.choices(floors, k=count)]
+
+
+def benchmark_fov(map_info, algorithm, positions, radius):
+    """
+    Returns microseconds per call of algorithm on map_info
+
+    Args:
+        map_info (MapInfo): Map to calculate FOV on
+        algorithm (fn pointer): FOV algorithm to time
+        positions (List): Positions to calculate FOV from
+        radius (int): FOV radius
+
+    Returns:
+        micro_seconds (float): best average microseconds per call
+    """
+    fov_array = fov.new_fov(map_info)
+    tile_array = map_info.tile_array
+
+    def run():
+        for position in positions:
+            algorithm(map_info, tile_array, fov_array, position, radius)
+
+    best = min(timeit.repeat(run, number=1, repeat=REPEAT))
+    return best / len(positions) * 1000000
+
+
+def main():
+    random.seed(0)
+    print("{:<15}{:>10}{:>8}{:>12}".format("algorithm", "map", "radius", "us/call"))
+    for size in MAP_SIZES:
+        map_info = gamemap.MapInfo(size, size)
+        positions = _floor_positions(map_info, NUM_POSITIONS)
+        for radius in RADII:
+            for name, algorithm in fov.fov_algorithm_dict.items():
+                micro_seconds = benchmark_fov(map_info, algorithm, positions, radius)
+                print("{:<15}{:>10}{:>8}{:>12.1f}".format(name, "{0}x{0}".format(size), radius, micro_seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+Benchmark of the searches in pathfinding.Graph
+
+Compares the heapq/flat index searches against the old Node graph with
+queue.Queue/queue.PriorityQueue searches (copied below as LegacyGraph)
+and checks both find paths of the same cost
+
+Usage:
+    python benchmarks/pathfinding_benchmark.py
+"""
+import os
+import queue
+import random
+import sys
+import timeit
+from dataclasses import dataclass, field
+from typing import Any
+
+# Game modules open a window on import, so use a dummy video driver
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from constant import *
+# config has to be imported before other game modules because of circular imports
+import config
+import gamemap
+import pathfinding
+
+MAP_SIZES = [35, 500]
+SEARCHES = ["bfs", "dijkstra", "a_star"]
+# Number of start and goal pairs to search on each map
+NUM_PAIRS = {35: 50, 500: 5}
+REPEAT = 3
+
+
+@dataclass(order=True)
+class PrioritizedItem:
+    priority: int
+    item: Any = field(compare=False)
+
+
+class Node:
+    """
+    Node of LegacyGraph, with its neighbours and their edge weights in edges
+    """
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.edges = {}
+
+
+class LegacyGraph(pathfinding.Graph):
+    """
+    Graph with the old Node objects and queue based searches
+    """
+
+    def make_graph(self, map_info):
+        super().make_graph(map_info)
+        self.nodes = {}
+        for index, passable in enumerate(self.passable):
+            if passable:
+                x, y = index % self.width, index // self.width
+                self.nodes[(x, y)] = Node(x, y)
+
+    def neighbour(self):
+        dirs = [[-1, 0], [1, 0], [0, -1], [0, 1],
+                [-1, -1], [1, -1], [-1, 1], [1, 1]]
+        for node in self.nodes.values():
+            for dir in dirs:
+                neighbour = (node.x + dir[0], node.y + dir[1])
+                if neighbour in self.nodes:
+                    node.edges[neighbour] = self.costs[neighbour[1] * self.width + neighbour[0]]
+
+    def bfs(self, start, goal):
+        if (goal not in self.nodes):
+            return
+        visiting = queue.Queue()
+        visiting.put(self.nodes[start])
+        visited = {}
+        visited[start] = None
+
+        while not visiting.empty():
+            node = visiting.get()
+
+            if (node.x, node.y) == goal:
+                break
+
+            for next in node.edges:
+                if next not in visited:
+                    visiting.put(self.nodes[next])
+                    visited[next] = (node.x, node.y)
+
+        return visited
+
+    def dijkstra(self, start, goal):
+        if (goal not in self.nodes):
+            return
+        visiting = queue.PriorityQueue()
+        visiting.put(PrioritizedItem(0, self.nodes[start]))
+        visited = {}
+        current_cost = {}
+        visited[start] = None
+        current_cost[start] = 0
+
+        while not visiting.empty():
+            node = visiting.get().item
+
+            if (node.x, node.y) == goal:
+                break
+
+            for next in node.edges:
+                new_cost = current_cost[(node.x, node.y)] + node.edges[next]
+                if next not in current_cost or new_cost < current_cost[next]:
+                    current_cost[next] = new_cost
+                    visiting.put(PrioritizedItem(new_cost, self.nodes[next]))
+                    visited[next] = (node.x, node.y)
+
+        return visited
+
+    def a_star(self, start, goal):
+        if (goal not in self.nodes):
+            return
+        visiting = queue.PriorityQueue()
+        visiting.put(PrioritizedItem(0, self.nodes[start]))
+        visited = {}
+        current_cost = {}
+        visited[start] = None
+        current_cost[start] = 0
+
+        while not visiting.empty():
+            node = visiting.get().item
+
+            if (node.x, node.y) == goal:
+                break
+
+            for next in node.edges:
+                new_cost = current_cost[(node.x, node.y)] + node.edges[next]
+                if next not in current_cost or new_cost < current_cost[next]:
+                    current_cost[next] = new_cost
+                    visiting.put(PrioritizedItem(new_cost + pathfinding.distance(next, goal), self.nodes[next]))
+                    visited[next] = (node.x, node.y)
+
+        return visited
+
+
+def _make_graph(graph_class, map_info):
+    """
+    Returns graph of graph_class made from map_info
+
+    Args:
+        graph_class (class): Graph class to make
+        map_info (MapInfo): Map to make graph of
+
+    Returns:
+        graph (Graph): graph of map
+    """
+    graph = graph_class()
+    graph.make_graph(map_info)
+    graph.neighbour()
+    return graph
+
+
+def _path_cost(graph, path):
+    """
+    Returns cost of walking path on graph
+    """
+    return sum(graph.costs[y * graph.width + x] for x, y in path)
+
+
+def benchmark_search(graph, search, pairs):
+    """
+    Returns milliseconds per search and cost of every path found
+
+    Args:
+        graph (Graph): Graph to search
+        search (String): Name of search method of graph
+        pairs (List): List of (start, goal) coords to search between
+
+    Returns:
+        milli_seconds (float): best average milliseconds per search
+        costs (List): cost of path found for every pair
+    """
+    method = getattr(graph, search)
+
+    def run():
+        for start, goal in pairs:
+            method(start, goal)
+
+    best = min(timeit.repeat(run, number=1, repeat=REPEAT))
+    costs = []
+    for start, goal in pairs:
+        visited = method(start, goal)
+        costs.append(_path_cost(graph, graph.find_path(start, goal, visited)))
+    return best / len(pairs) * 1000, costs
+
+
+def main():
+    random.seed(0)
+    print("{:<10}{:>10}{:>12}{:>12}{:>10}".format("search", "map", "legacy ms", "heapq ms", "speedup"))
+    for size in MAP_SIZES:
+        map_info = gamemap.MapInfo(size, size)
+        graph = _make_graph(pathfinding.Graph, map_info)
+        legacy_graph = _make_graph(LegacyGraph, map_info)
+
+        # Only pick pairs with a path between them
+        floors = graph.passable_coords()
+        pairs = []
+        while len(pairs) < NUM_PAIRS[size]:
+            start, goal = random.sample(floors, 2)
+            if goal in graph.bfs(start, goal):
+                pairs.append((start, goal))
+
+        for search in SEARCHES:
+            legacy_ms, legacy_costs = benchmark_search(legacy_graph, search, pairs)
+            new_ms, new_costs = benchmark_search(graph, search, pairs)
+            if legacy_costs != new_costs:
+                print("{} found different path costs on {}x{} map".format(search, size, size))
+            print("{:<10}{:>10}{:>12.2f}{:>12.2f}{:>9.1f}x".format(
+                search, "{0}x{0}".format(size), legacy_ms, new_ms, legacy_ms / new_ms))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""
+Benchmarks run by python -m benchmarks
+
+Every benchmark returns a list of (name, params, seconds) results, where
+seconds is the time of one run in the best of REPEAT samples. Every sample
+runs enough times to last MIN_SAMPLE_TIME. Random is seeded with SEED before
+every run so every run works on the same maps and entities
+"""
+import gc
+import math
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+
+from constant import *
+# config has to be imported before other game modules because of circular imports
+import config
+import entity_generator
+import fov
+import game
+import gamemap
+import map_generator
+import pathfinding
+
+SEED = 0
+REPEAT = 5
+# Min seconds of timed runs in every sample. Runs faster than this are run
+# more times per sample, so timer and scheduler noise don't decide results
+MIN_SAMPLE_TIME = 0.01
+MAP_SIZES = [35, 100, 200]
+FOV_RADII = [PLAYER_FOV, 8]
+ENEMY_COUNTS = [10, 50, 200]
+# Number of FOV origins and pathfinding start/goal pairs per map
+NUM_POSITIONS = 200
+NUM_PAIRS = 10
+# Number of turns timed per update_creatures run
+NUM_TURNS = 20
+
+
+def _timed_runs(run, setup, number):
+    """
+    Returns seconds spent in number runs of run
+
+    Random is seeded before every run and setup, which is not timed
+
+    Args:
+        run (fn pointer): function to time. Takes return value of setup if given
+        setup (fn pointer): function returning state run works on
+        number (int): # of times to run run
+    """
+    if setup is None:
+        start = time.perf_counter()
+        for _ in range(number):
+            # Seeding takes microseconds, so it is timed with run
+            random.seed(SEED)
+            run()
+        return time.perf_counter() - start
+
+    seconds = 0.0
+    for _ in range(number):
+        random.seed(SEED)
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        seconds += time.perf_counter() - start
+    return seconds
+
+
+def _best_time(run, setup=None, repeat=REPEAT):
+    """
+    Returns best time of one run of run out of repeat samples
+
+    Random is seeded before setup, which is not timed. run is run once
+    more first without being timed, so code paths are warmed up, and that
+    run decides how many runs each sample needs to last MIN_SAMPLE_TIME.
+    Garbage collection is off while samples are timed
+
+    Args:
+        run (fn pointer): function to time. Takes return value of setup if given
+        setup (fn pointer): function returning state run works on
+        repeat (int): # of samples to time
+
+    Returns:
+        seconds (float): best time of run
+    """
+    warmup = _timed_runs(run, setup, 1)
+    number = max(1, math.ceil(MIN_SAMPLE_TIME / max(warmup, 1e-9)))
+    # Like timeit, garbage collection is off while timing, so garbage left by
+    # earlier benchmarks doesn't get collected in the middle of a sample
+    gc.collect()
+    gc.disable()
+    try:
+        return min(_timed_runs(run, setup, number) for _ in range(repeat)) / number
+    finally:
+        gc.enable()
+
+
+def _make_map(size):
+    """
+    Returns seeded MapInfo of size x size tiles
+    """
+    random.seed(SEED)
+    return gamemap.MapInfo(size, size)
+
+
+def _floor_positions(map_info, count):
+    """
+    Returns count seeded random coords of non wall tiles on map
+    """
+    floors = [(index % map_info.tile_width, index // map_info.tile_width)
+              for index in map_info.find_tiles_not_of_type(WALL)]
+    random.seed(SEED)
+    return random.choices(floors, k=count)
+
+
+def benchmark_map_generation():
+    """
+    Times each step of generating a map with map_generator.Tree
+    """
+    results = []
+    steps = ["build_bsp", "build_rooms", "build_path"]
+    for size in MAP_SIZES:
+        for step_index, step in enumerate(steps):
+            # Every run starts on a tree with the steps before step done
+            def setup():
+                tree = map_generator.Tree([[WALL for x in range(size)] for y in range(size)])
+                for previous_step in steps[:step_index]:
+                    getattr(tree, previous_step)()
+                return tree
+
+            seconds = _best_time(lambda tree: getattr(tree, step)(), setup=setup)
+            results.append(("map_generator.Tree." + step, {"map_size": size}, seconds))
+    return results
+
+
+def benchmark_map_info():
+    """
+    Times making a MapInfo, which generates a map and its arrays
+    """
+    results = []
+    for size in MAP_SIZES:
+        seconds = _best_time(lambda: gamemap.MapInfo(size, size))
+        results.append(("gamemap.MapInfo", {"map_size": size}, seconds))
+    return results
+
+
+def benchmark_fov():
+    """
+    Times calculating FOV with every algorithm and changing seen tiles from it
+    """
+    results = []
+    for size in MAP_SIZES:
+        positions = [SimpleNamespace(x=x, y=y) for x, y in _floor_positions(_make_map(size), NUM_POSITIONS)]
+        for radius in FOV_RADII:
+            for name, algorithm in fov.fov_algorithm_dict.items():
+                # Every run starts on an unseen copy of the same map
+                def run(map_info):
+                    tile_array = map_info.tile_array
+                    for position in positions:
+                        fov_array = fov.new_fov(map_info)
+                        algorithm(map_info, tile_array, fov_array, position, radius)
+                        fov.change_seen(map_info, tile_array, fov_array)
+
+                seconds = _best_time(run, setup=lambda: _make_map(size)) / len(positions)
+                results.append(("fov." + algorithm.__name__ + "+change_seen",
+                                {"map_size": size, "radius": radius}, seconds))
+    return results
+
+
+def benchmark_pathfinding():
+    """
+    Times making a graph of map and searching it
+    """
+    results = []
+    for size in MAP_SIZES:
+        map_info = _make_map(size)
+
+        def make_graph():
+            graph = pathfinding.Graph()
+            graph.make_graph(map_info)
+            return graph
+
+        results.append(("pathfinding.Graph.make_graph", {"map_size": size},
+                        _best_time(lambda: make_graph())))
+        results.append(("pathfinding.Graph.neighbour", {"map_size": size},
+                        _best_time(lambda graph: graph.neighbour(), setup=make_graph)))
+
+        graph = make_graph()
+        graph.neighbour()
+        # Only search between coords with a path between them
+        floors = graph.passable_coords()
+        random.seed(SEED)
+        pairs = []
+        while len(pairs) < NUM_PAIRS:
+            start, goal = random.sample(floors, 2)
+            if goal in graph.bfs(start, goal):
+                pairs.append((start, goal))
+
+        for search in ["bfs", "a_star"]:
+            method = getattr(graph, search)
+
+            def run():
+                for start, goal in pairs:
+                    method(start, goal)
+
+            results.append(("pathfinding.Graph." + search, {"map_size": size},
+                            _best_time(run) / len(pairs)))
+    return results
+
+
+def _setup_game(num_enemies):
+    """
+    Makes new game on a seeded map with num_enemies enemies
+
+    Args:
+        num_enemies (int): # of enemies on level
+    """
+    game.new_game()
+    enemies = []
+    while len(enemies) < num_enemies:
+        enemies += entity_generator.generate_enemies(config.MAP_INFO.map_tree)
+    config.GAME_DATA.creature_data["enemy"] = enemies[:num_enemies]
+    config.GAME_DATA.rebuild_spatial_index()
+    # Player shouldn't die while being timed
+    config.PLAYER.creature.stat.hp = 10 ** 9
+    game.update_game()
+
+
+def benchmark_update_creatures():
+    """
+    Times processing turns with different numbers of enemies
+    """
+    results = []
+    for num_enemies in ENEMY_COUNTS:
+        def run(state):
+            for _ in range(NUM_TURNS):
+                game.update_creatures(config.GAME_DATA.creature_data, 0, 0)
+
+        seconds = _best_time(run, setup=lambda: _setup_game(num_enemies)) / NUM_TURNS
+        results.append(("game.update_creatures", {"enemies": num_enemies}, seconds))
+    return results
+
+
+def benchmark_save_load():
+    """
+    Times saving and loading a game
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "save.txt")
+        for num_enemies in ENEMY_COUNTS:
+            def setup():
+                _setup_game(num_enemies)
+                game.save_game(path)
+
+            results.append(("game.save_game", {"enemies": num_enemies},
+                            _best_time(lambda state: game.save_game(path), setup=setup)))
+            results.append(("game.load_game", {"enemies": num_enemies},
+                            _best_time(lambda state: game.load_game(path), setup=setup)))
+    return results
+
+
+# Lookup table for benchmarks
+benchmark_dict = {
+    "map_generation": benchmark_map_generation,
+    "map_info": benchmark_map_info,
+    "fov": benchmark_fov,
+    "pathfinding": benchmark_pathfinding,
+    "update_creatures": benchmark_update_creatures,
+    "save_load": benchmark_save_load,
+}
@@ -1,8 +1,53 @@
 from constant import *
 import config
+import pathfinding
 import random
 
 
+# Dijkstra maps to and away from player shared by every AI,
+# and the graph and player coord they were made for
+_chase_map = None
+_flee_map = None
+_chase_map_graph = None
+_chase_map_coord = None
+
+
+def chase_map():
+    """
+    Returns Dijkstra map leading to player
+
+    The map is only remade if player moved or level changed, so all
+    chasing enemies share one map per turn
+
+    Returns:
+        chase_map (DijkstraMap): Dijkstra map leading to player
+    """
+    global _chase_map, _flee_map, _chase_map_graph, _chase_map_coord
+    player_coord = (config.PLAYER.x, config.PLAYER.y)
+    if _chase_map_graph is not config.PATHFINDING or _chase_map_coord != player_coord:
+        _chase_map = pathfinding.DijkstraMap.from_goals(config.PATHFINDING, [player_coord])
+        _flee_map = None
+        _chase_map_graph = config.PATHFINDING
+        _chase_map_coord = player_coord
+    return _chase_map
+
+
+def flee_map():
+    """
+    Returns Dijkstra map leading away from player
+
+    Made from chase map and only remade when chase map is
+
+    Returns:
+        flee_map (DijkstraMap): Dijkstra map leading away from player
+    """
+    global _flee_map
+    current_chase_map = chase_map()
+    if _flee_map is None:
+        _flee_map = current_chase_map.flee_map()
+    return _flee_map
+
+
 def _calculate_change_in_position(diff):
     """
     Helper function for take_turn. Returns int that moves
@@ -109,26 +154,6 @@ class ChaseAI:
                 [0, 1, -1]), random.choice([0, 1, -1]))
         # Else move towards player using shortest path
         else:
-            # Find path to player if no path creature has no path calculated
-            self._make_path_to_player(creature, player)
-
-            dest = creature.current_path.pop(0)
-            dest_x = dest[0] - creature.x
-            dest_y = dest[1] - creature.y
-
-            creature.move(dest_x, dest_y)
-
-    def _make_path_to_player(self, creature, player):
-        """
-        Makes path to player
-
-        Args:
-            creature (Creature): Creature to make path for
-            player (Creature): The player the creature paths to
-        """
-        start = (creature.x, creature.y)
-        goal = (player.x, player.y)
-        visited = config.PATHFINDING.bfs(start, goal)
-        if visited:
-            path = config.PATHFINDING.find_path(start, goal, visited)
-            creature.current_path = path
+            step = chase_map().next_step((creature.x, creature.y))
+            if step:
+                creature.move(step[0] - creature.x, step[1] - creature.y)
@@ -0,0 +1,79 @@
+import atexit
+import threading
+from constant import *
+import save_file
+
+
+class AutoSaver:
+    """
+    Writes save snapshots on a background thread so the game never waits on disk
+
+    Only the newest snapshot waiting to be written is kept, so saves asked
+    for while one is being written are coalesced into one save
+
+    Args:
+        path (String): path of save file
+
+    Attributes:
+        path (arg, String): path of save file
+        last_turn (int): turn count of last save asked for
+        pending (dictionary): newest snapshot waiting to be written, None if there isn't one
+        writing (Boolean): True while a snapshot is being written
+        condition (Condition): guards pending and writing
+        thread (Thread): thread writing snapshots, None until first save
+    """
+
+    def __init__(self, path=SAVE_PATH):
+        self.path = path
+        self.last_turn = 0
+        self.pending = None
+        self.writing = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def save(self, game_snapshot, turn_count):
+        """
+        Queues snapshot to be written, replacing any snapshot not written yet
+
+        Args:
+            game_snapshot (dictionary): snapshot made by save_file.snapshot
+            turn_count (int): turn count snapshot was taken at
+        """
+        self.last_turn = turn_count
+        with self.condition:
+            self.pending = game_snapshot
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+                # Saves still queued are finished before game exits
+                atexit.register(self.wait)
+            self.condition.notify_all()
+
+    def wait(self):
+        """
+        Waits until every queued snapshot is written
+        """
+        with self.condition:
+            while self.pending is not None or self.writing:
+                self.condition.wait()
+
+    def _run(self):
+        """
+        Writes queued snapshots forever on save thread
+        """
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                game_snapshot = self.pending
+                self.pending = None
+                self.writing = True
+
+            try:
+                save_file.write(self.path, game_snapshot)
+            except Exception as error:
+                print("Autosave failed: {}".format(error))
+
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
@@ -69,6 +69,14 @@ class ButtonManager:
             This surface is blitted to game surface
         button_dict (list): list of buttons
         colorkey (arg, Colour): Colour to make transparent
+        button_index (dictionary): dictionary with cell coord as key and list of
+            buttons overlapping cell, in order they were added, as value. Cells are
+            BUTTON_INDEX_CELL_SIZE pixels wide, so hit-tests only check buttons in
+            one cell. Buttons shouldn't be moved after they are added
+        button_cells (dictionary): dictionary with button_id as key and list of
+            cells button is indexed in as value
+        hovered (tuple): last mouse coord relative to button manager and button
+            hovered at it, None if buttons changed since
     """
     def __init__(self, x, y, width, height, colorkey=None):
         self.x = x
@@ -79,6 +87,9 @@ class ButtonManager:
         if colorkey:
             self.image.set_colorkey(colorkey)
         self.button_dict = {}
+        self.button_index = {}
+        self.button_cells = {}
+        self.hovered = None
 
     def add_button(self, icon_button, button_id):
         """
@@ -93,6 +104,7 @@ class ButtonManager:
         """
         if button_id not in self.button_dict:
             self.button_dict[button_id] = icon_button
+            self._index_button(icon_button, button_id)
         else:
             raise IconButtonException("IconButton exist")
 
@@ -106,10 +118,56 @@ class ButtonManager:
             button_id (String): Key of button to remove
         """
         if button_id in self.button_dict:
-            self.button_dict.pop(button_id)
+            self._unindex_button(self.button_dict.pop(button_id), button_id)
         else:
             raise IconButtonException("IconButton doesn't exist")
 
+    def _index_button(self, icon_button, button_id):
+        """
+        Adds button to every cell of button_index its rect overlaps,
+        right and bottom edges included since hovering includes them
+
+        Args:
+            icon_button (IconButton): IconButton to index
+            button_id (String): String of button key
+        """
+        rect = icon_button.rect
+        cells = [(cell_x, cell_y)
+                 for cell_y in range(rect.top // BUTTON_INDEX_CELL_SIZE, rect.bottom // BUTTON_INDEX_CELL_SIZE + 1)
+                 for cell_x in range(rect.left // BUTTON_INDEX_CELL_SIZE, rect.right // BUTTON_INDEX_CELL_SIZE + 1)]
+        for cell in cells:
+            self.button_index.setdefault(cell, []).append(icon_button)
+        self.button_cells[button_id] = cells
+        self.hovered = None
+
+    def _unindex_button(self, icon_button, button_id):
+        """
+        Removes button from button_index
+
+        Args:
+            icon_button (IconButton): IconButton to remove
+            button_id (String): String of button key
+        """
+        for cell in self.button_cells.pop(button_id):
+            buttons = self.button_index[cell]
+            buttons.remove(icon_button)
+            if not buttons:
+                del self.button_index[cell]
+        self.hovered = None
+
+    def _buttons_at(self, x, y):
+        """
+        Returns buttons that could be at (x, y), in order they were added
+
+        Args:
+            x (int): x coord relative to button manager
+            y (int): y coord relative to button manager
+
+        Returns:
+            buttons (List): buttons in cell (x, y) is in
+        """
+        return self.button_index.get((x // BUTTON_INDEX_CELL_SIZE, y // BUTTON_INDEX_CELL_SIZE), ())
+
     def get_button(self, button_id):
         """
         Args:
@@ -154,10 +212,16 @@ class ButtonManager:
         """
         final_x = mouse_x - self.x
         final_y = mouse_y - self.y
-        for button in self.button_dict.values():
+        # Hovered button can only change when mouse moves or buttons change
+        if self.hovered is not None and self.hovered[0] == (final_x, final_y):
+            return self.hovered[1]
+        hovered_button = None
+        for button in self._buttons_at(final_x, final_y):
             if button.check_if_button_hovered(final_x, final_y):
-                return button
-        return None
+                hovered_button = button
+                break
+        self.hovered = ((final_x, final_y), hovered_button)
+        return hovered_button
 
     def check_if_specific_button_hovered(self, button_id, mouse_x, mouse_y):
         """
@@ -201,7 +265,7 @@ class ButtonManager:
         """
         final_x = mouse_x - self.x
         final_y = mouse_y - self.y
-        for button in self.button_dict.values():
+        for button in self._buttons_at(final_x, final_y):
             if button.check_if_button_clicked(final_x, final_y):
                 return button
         return None
@@ -266,6 +330,7 @@ class GridButtonManager(ButtonManager):
         """
         if not self.button_count >= self.num_button and button_id not in self.button_dict:
             self.button_dict[button_id] = icon_button
+            self._index_button(icon_button, button_id)
             self.button_count += 1
         else:
             raise IconButtonException("IconButton exist")
@@ -296,6 +361,7 @@ class GridButtonManager(ButtonManager):
                 y = self.button_count // self.width
                 button = IconButton(SPRITE_SIZE * x, SPRITE_SIZE * y, img, left_click_fn, right_click_fn, mouse_over_fn)
                 self.button_dict[button_id] = button
+                self._index_button(button, button_id)
                 self.button_count += 1
             else:
                 raise IconButtonException("IconButton exist")
@@ -310,7 +376,7 @@ class GridButtonManager(ButtonManager):
             button_id (String): Key of button to remove
         """
         if button_id in self.button_dict:
-            self.button_dict.pop(button_id)
+            self._unindex_button(self.button_dict.pop(button_id), button_id)
             self.button_count -= 1
         else:
             raise IconButtonException("IconButton doesn't exist")
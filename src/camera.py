@@ -69,6 +69,24 @@ class Camera:
         x, y = self.camera.topleft
         return -x, -y
 
+    def visible_tile_range(self):
+        """
+        Returns the range of tiles that are on screen, clamped to the map
+
+        The end coords are exclusive so the range can be used
+        directly with range()
+
+        Returns:
+            x_start, y_start, x_end, y_end ((int, int, int, int)): Tile range on screen
+        """
+        camera_x, camera_y = self.camera_position
+        x_start = max(0, camera_x // SPRITE_SIZE)
+        y_start = max(0, camera_y // SPRITE_SIZE)
+        # Round up so partially shown tiles are included
+        x_end = min(self.map_info.tile_width, -(-(camera_x + self.camera_width) // SPRITE_SIZE))
+        y_end = min(self.map_info.tile_height, -(-(camera_y + self.camera_height) // SPRITE_SIZE))
+        return x_start, y_start, x_end, y_end
+
     def get_relative_screen_coord(self, x, y):
         """
         Returns the coord of (x_coord, y_coord) relative to the camera/screen
@@ -1,84 +1,140 @@
 from constant import *
 import pygame
+import startup
 import sprite
 import entity_generator
 import gamemap
 import camera
 import pathfinding
 import fov
+import level_generator
+import scheduler
+import autosave
 import buttonmanager
 import game_data
 import menu
 
 pygame.init()
 
-SURFACE_MAIN = pygame.display.set_mode(RESOLUTION, pygame.RESIZABLE)
+with startup.stage("display"):
+    SURFACE_MAIN = pygame.display.set_mode(RESOLUTION, pygame.RESIZABLE)
 CLOCK = pygame.time.Clock()
 # Load in all the sprites
-SPRITE = sprite.GameSprites()
+with startup.stage("sprites"):
+    SPRITE = sprite.GameSprites()
 
 # Save this
 CURRENT_FLOOR = 1
 # Save this
 TURN_COUNT = 0
 
-# Save this
-MAP_INFO = gamemap.MapInfo()
+# Writes saves in background
+AUTOSAVER = autosave.AutoSaver(SAVE_PATH)
 
-CAMERA = camera.Camera(MAP_INFO)
+PARTICLE_LIST = []
 
-PATHFINDING = pathfinding.Graph()
-PATHFINDING.make_graph(MAP_INFO)
-PATHFINDING.neighbour()
+WALL_HACK = False
 
-# Save this
-PLAYER = entity_generator.generate_player(MAP_INFO.map_tree, "knight")
+MINIMAP = False
 
-# Save this
-GAME_DATA = game_data.GameData()
+# Game session state. None of it exists until new_game is called or it is
+# first used, so the main menu shows without making a game that would be
+# thrown away. BUTTON_PANEL is also made on first use by _make_button_panel
 
-FOV = fov.new_fov(MAP_INFO)
 
-PARTICLE_LIST = []
+def _make_pathfinding():
+    """
+    Returns pathfinding graph of MAP_INFO
+    """
+    graph = pathfinding.Graph()
+    graph.make_graph(MAP_INFO)
+    graph.neighbour()
+    return graph
 
-WALL_HACK = False
 
-MINIMAP = False
+# Lookup table for making game session state, in the order it is made.
+# Other state is made from MAP_INFO, so it is first
+_session_state_dict = {
+    # Save this
+    "MAP_INFO": lambda: gamemap.MapInfo(),
+    "CAMERA": lambda: camera.Camera(MAP_INFO),
+    "PATHFINDING": _make_pathfinding,
+    # Save this
+    "PLAYER": lambda: entity_generator.generate_player(MAP_INFO.map_tree, "knight"),
+    # Save this
+    "GAME_DATA": lambda: game_data.GameData(),
+    "FOV": lambda: fov.new_fov(MAP_INFO),
+    "FOV_MANAGER": lambda: fov.FovManager(),
+    "TURN_SCHEDULER": lambda: scheduler.TurnScheduler(),
+    # Generates next floor in background
+    "NEXT_LEVEL_GENERATOR": lambda: level_generator.LevelGenerator(),
+}
+
 
-BUTTON_PANEL = buttonmanager.GridButtonManager(
-    SURFACE_MAIN.get_width() - (SPRITE_SIZE * ((TILE_WIDTH // 2) + (NUM_OF_BUTTONS_X // 2))),
-    SURFACE_MAIN.get_height() - SPRITE_SIZE, NUM_OF_BUTTONS_X, NUM_OF_BUTTONS_Y, (NUM_OF_BUTTONS_X * NUM_OF_BUTTONS_Y),
-    BLACK)
+def __getattr__(name):
+    """
+    Makes game session state or BUTTON_PANEL the first time it is used
 
-BUTTON_PANEL.create_button(PLAYER.image, 'stats', menu.stat_menu)
-BUTTON_PANEL.create_button(SPRITE.inventory_button, 'inventory', menu.inventory_menu)
-BUTTON_PANEL.create_button(SPRITE.minimap_button, 'map', menu.map_menu)
+    Args:
+        name (String): name of module attribute that doesn't exist yet
 
-def new_game():
+    Returns:
+        value of attribute
     """
-    Makes new game by deleting old data and making new data
+    if name in _session_state_dict:
+        _make_session_state(name)
+    elif name == "BUTTON_PANEL":
+        _make_button_panel()
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    return globals()[name]
+
+
+def _make_session_state(last_name=None):
     """
-    global CURRENT_FLOOR, TURN_COUNT, MAP_INFO, CAMERA, PATHFINDING, PLAYER, GAME_DATA, FOV
+    Makes every game session state that doesn't exist yet, in order,
+    up to last_name. State that exists, ie from a loaded game, is kept
 
-    CURRENT_FLOOR = 1
-    # Save this
-    TURN_COUNT = 0
+    Args:
+        last_name (String): name of last state to make, all state if None
+    """
+    for name, make_state in _session_state_dict.items():
+        if name not in globals():
+            globals()[name] = make_state()
+        if name == last_name:
+            break
 
-    # Save this
-    MAP_INFO = gamemap.MapInfo()
 
-    CAMERA = camera.Camera(MAP_INFO)
+def _make_button_panel():
+    """
+    Makes BUTTON_PANEL, the buttons on bottom of the game screen
+    """
+    global BUTTON_PANEL
 
-    PATHFINDING = pathfinding.Graph()
-    PATHFINDING.make_graph(MAP_INFO)
-    PATHFINDING.neighbour()
+    _make_session_state("PLAYER")
 
-    # Save this
-    PLAYER = entity_generator.generate_player(MAP_INFO.map_tree, "knight")
+    BUTTON_PANEL = buttonmanager.GridButtonManager(
+        SURFACE_MAIN.get_width() - (SPRITE_SIZE * ((TILE_WIDTH // 2) + (NUM_OF_BUTTONS_X // 2))),
+        SURFACE_MAIN.get_height() - SPRITE_SIZE, NUM_OF_BUTTONS_X, NUM_OF_BUTTONS_Y,
+        (NUM_OF_BUTTONS_X * NUM_OF_BUTTONS_Y), BLACK)
 
-    # Save this
-    GAME_DATA = game_data.GameData()
+    BUTTON_PANEL.create_button(PLAYER.image, 'stats', menu.stat_menu)
+    BUTTON_PANEL.create_button(SPRITE.inventory_button, 'inventory', menu.inventory_menu)
+    BUTTON_PANEL.create_button(SPRITE.minimap_button, 'map', menu.map_menu)
 
-    FOV = fov.new_fov(MAP_INFO)
+
+def new_game():
+    """
+    Makes new game by deleting old data and making new data
+    """
+    global CURRENT_FLOOR, TURN_COUNT, PARTICLE_LIST
+
+    CURRENT_FLOOR = 1
+    # Save this
+    TURN_COUNT = 0
 
     PARTICLE_LIST = []
+
+    for name in _session_state_dict:
+        globals().pop(name, None)
+    _make_session_state()
@@ -1,6 +1,14 @@
 import pygame
 import os
 
+# Headless mode runs game logic without drawing anything, for simulations
+# and tests. Turned on by setting the ROGUELIKE_HEADLESS environment variable to 1
+HEADLESS = os.environ.get("ROGUELIKE_HEADLESS", "0") not in ("", "0")
+if HEADLESS:
+    # SDL's dummy drivers so no window or sound device is opened
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
 pygame.font.init()
 
 # Display constants
@@ -32,13 +40,28 @@ SUB_DUNGEON_HEIGHT = 10
 DIST_FROM_SISTER_NODE_MIN = 2
 # DIST_FROM_SISTER_NODE_MAX * 2 has to be <= SUB_DUNGEON WIDTH/HEIGHT
 DIST_FROM_SISTER_NODE_MAX = 3
+# Width/height in tiles of each chunk maps are split into for
+# searching, redrawing and saving only the parts that changed
+MAP_CHUNK_SIZE = 32
+
+# Performance HUD constants
+# Number of frames timings are averaged over
+PERF_HUD_FRAMES = 60
+
+# Tile renderer constants
+# Width/height in tiles of each cached seen tile surface
+TILE_LAYER_CHUNK_SIZE = 16
 
 # Minimap constants
 MINIMAP_SCALE = 2
+# Max number of scaled sprites kept by sprite.scale_image
+SCALED_SPRITE_CACHE_SIZE = 256
 
 # IconButton manager constants
 NUM_OF_BUTTONS_X = 4
 NUM_OF_BUTTONS_Y = 1
+# Width/height in pixels of each cell of button hit-test index
+BUTTON_INDEX_CELL_SIZE = SPRITE_SIZE
 
 # TextButton constants
 BUTTON_WIDTH = CAMERA_WIDTH // 4
@@ -52,6 +75,16 @@ PATH = '0'
 DOWNSTAIR = '>'
 UPSTAIR = '<'
 
+# Cost of moving onto a tile type. Tile types not in here
+# cost DEFAULT_MOVEMENT_COST. Costs must be at least 1
+DEFAULT_MOVEMENT_COST = 1
+MOVEMENT_COST = {
+    FLOOR: 1,
+    PATH: 1,
+    DOWNSTAIR: 1,
+    UPSTAIR: 1,
+}
+
 # Colours
 GREY = (128, 128, 128)
 RED = (255, 0, 0)
@@ -75,15 +108,37 @@ REGEN_TIME = 5
 # and so player can move out of enemy FOV before enemy acts
 SLIME_FOV = 3
 
+# Number of enemies generated in every room
+ENEMIES_PER_ROOM = 1
+
+# Pathfinding
+# Distances of flee maps are multiplied by this, so fleeing creatures
+# prefer getting far away over the closest escape
+FLEE_COEFFICIENT = -1.2
+
 # Resource path
 RESOURCE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resource')
 
 #Save path
 SAVE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data/save.txt')
+# Bumped whenever the save format changes. Saves without SAVE_MAGIC are old pickled saves
+SAVE_MAGIC = b"RLSAVE"
+SAVE_VERSION = 2
+# True if sections and map chunks of save files are zlib compressed
+SAVE_COMPRESSION = True
+# # of turns between autosaves
+AUTOSAVE_TURNS = 100
 
 # Data path
 DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 
+# Sprite cache path. Scaled sprites are packed into an atlas cached here
+SPRITE_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache', 'sprites')
+# Bumped whenever the way sprites are made changes, so old atlases are rebuilt
+SPRITE_ATLAS_VERSION = 1
+# Width of atlas in pixels, unless a sprite is wider
+SPRITE_ATLAS_WIDTH = 1024
+
 # FONTS
 font_path_name = os.path.join(RESOURCE_PATH, 'fonts/FFF_Tusj.ttf')
 FONT_SIZE = 28
@@ -92,15 +147,38 @@ FONT_DEBUG_MESSAGE = pygame.font.Font(font_path_name, 28)
 FONT_MESSAGE_TEXT = pygame.font.Font(font_path_name, 28)
 FONT_ITEM_DESCRIPTION = pygame.font.Font(font_path_name, 28)
 TEXT_SPACE_BUFFER = 5
+# Max number of rendered text surfaces kept by game_text
+TEXT_CACHE_SIZE = 256
 
 # MESSAGE DEFAULTS
 NUM_MESSAGES = 8
+# Max number of game messages kept in memory. Older messages go to MESSAGE_LOG_PATH
+MESSAGE_LOG_SIZE = 200
+MESSAGE_LOG_PATH = os.path.join(DATA_PATH, 'messages.log')
+# Size in bytes message log file is rotated at
+MESSAGE_LOG_MAX_BYTES = 256 * 1024
 
 # ANIMATIONS
 ANIMATION_SPEED = 0.75
 FPS = 60
 
+# FOV
+# Algorithm used to calculate FOV, either "shadowcasting" or "raycasting"
+FOV_ALGORITHM = "shadowcasting"
+PLAYER_FOV = 4
+
+# Turn scheduler
+# Time between turns of a creature
+TURN_TIME = 100
+# Enemies further than this many tiles from player sleep until player comes closer
+ENEMY_SLEEP_DISTANCE = PLAYER_FOV * 2
+# How far from a fight sleeping enemies are woken
+COMBAT_NOISE_RADIUS = PLAYER_FOV * 2
+# Turns enemies woken by noise stay awake for
+NOISE_AWAKE_TURNS = 5
+# Turns between room to room moves of sleeping enemies
+COARSE_TURNS = 10
+
 # RAYCASTING
 RAYS = 360
 STEP = 3
-PLAYER_FOV = 4
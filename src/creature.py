@@ -1,11 +1,7 @@
-import os
-import json
 import config
 from particle import *
 import game_text
-
-with open(os.path.join(DATA_PATH, 'creature.json')) as f:
-    data = json.load(f)
+import json_data
 
 
 class CreatureStat:
@@ -167,6 +163,7 @@ class Creature:
         Returns:
             stat (Stat): Stat of creature with name_instance
         """
+        data = json_data.load('creature.json')
         if self.name_instance in data.keys():
             str = data[self.name_instance]
             stat = CreatureStat(str["hp"], str["mp"], str["strength"],
@@ -184,6 +181,7 @@ class Creature:
         Returns:
             equip_slot (Dict): Equipment scheme of creature with name_instance
         """
+        data = json_data.load('creature.json')
         if self.name_instance in data.keys():
             str = data[self.name_instance]
             equip = str["equip"]
@@ -254,6 +252,7 @@ class Creature:
             description (String): Description of creature from creature.json
                 else return No description available if creature doesn't have description
         """
+        data = json_data.load('creature.json')
         if "desc" in data[self.name_instance].keys():
             description = data[self.name_instance]["desc"] + "\n"
             return description
@@ -285,10 +284,13 @@ class Creature:
     def die(self):
         """
         Prints that Entity is dead and removes it from config.GAME_DATA.creature_data
+        and turn scheduler
         """
         game_text.add_game_message_to_print(
             self.name_instance + " is dead", BLUE)
         config.GAME_DATA.creature_data[self.team].remove(self.owner)
+        config.GAME_DATA.creature_index.remove(self.owner)
+        config.TURN_SCHEDULER.remove(self.owner)
 
     def move(self, dx, dy):
         """
@@ -306,19 +308,17 @@ class Creature:
 
         if not self.walk_through_tile:
             # check to see if entity collided with wall and if so don't move
-            if config.MAP_INFO.tile_array[self.y + dy][self.x + dx].type == WALL:
+            if config.MAP_INFO.is_wall(self.x + dx, self.y + dy):
                 return
 
         if self.team:
             # check to see if entity collided with enemy or ally and if so don't move
-            for team, entity_list in config.GAME_DATA.creature_data.items():
-                for entity in entity_list:
-                    if (entity.x, entity.y) == (self.x + dx, self.y + dy):
-                        if team == self.team:
-                            return
-                        else:
-                            self.attack(entity, self.total_physical_damage)
-                            return
+            for entity in config.GAME_DATA.creature_index.at(self.x + dx, self.y + dy):
+                if entity.creature.team == self.team:
+                    return
+                else:
+                    self.attack(entity, self.total_physical_damage)
+                    return
 
         self.owner.x += dx
         self.owner.y += dy
@@ -360,6 +360,8 @@ class Creature:
         game_text.add_game_message_to_print(
             self.name_instance + " attacks " + target.creature.name_instance
             + " for " + str(damage) + " damage", WHITE)
+        # Fighting wakes enemies sleeping nearby
+        config.TURN_SCHEDULER.make_noise(self.x, self.y, COMBAT_NOISE_RADIUS)
         if target.creature.take_damage(damage):
             self.gain_exp(target)
             self.check_for_level_up()
@@ -1,11 +1,101 @@
+from array import array
 from constant import *
 import config
 import game_text
 import minimap
 import fov
+import perf
 import sprite
 
 
+class SeenTileLayer:
+    """
+    Cached layer of seen tiles of a level
+
+    The layer is split into chunks of TILE_LAYER_CHUNK_SIZE x TILE_LAYER_CHUNK_SIZE
+    tiles which are only made once a tile in them is seen, so unexplored parts of
+    the map cost nothing. Chunks only change when newly seen tiles are logged
+
+    Attributes:
+        map_info (arg, MapInfo): map info of level the layer is for
+        revision (int): map_info.revision the layer was drawn with
+        chunks (dict): dictionary with chunk coord as key and
+            surface with the seen tiles of the chunk as value
+        seen_count (int): number of tiles in map_info.seen_log already drawn
+    """
+
+    def __init__(self, map_info):
+        self.map_info = map_info
+        self.revision = map_info.revision
+        self.chunks = {}
+        self.seen_count = 0
+
+    def update(self):
+        """
+        Draws tiles seen since last update onto their chunk
+        """
+        seen_log = self.map_info.seen_log
+        tile_width = self.map_info.tile_width
+        tile_types = self.map_info.tile_types
+        for index in seen_log[self.seen_count:]:
+            y, x = divmod(index, tile_width)
+            chunk_x = x // TILE_LAYER_CHUNK_SIZE
+            chunk_y = y // TILE_LAYER_CHUNK_SIZE
+            chunk = self.chunks.get((chunk_x, chunk_y))
+            if chunk is None:
+                chunk = self._make_chunk(chunk_x, chunk_y)
+            chunk.blit(config.SPRITE.tile_dict[chr(tile_types[index])]["seen"],
+                       ((x % TILE_LAYER_CHUNK_SIZE) * SPRITE_SIZE, (y % TILE_LAYER_CHUNK_SIZE) * SPRITE_SIZE))
+        self.seen_count = len(seen_log)
+
+    def _make_chunk(self, chunk_x, chunk_y):
+        """
+        Makes black (unseen) surface for chunk at (chunk_x, chunk_y)
+        and returns it
+
+        Args:
+            chunk_x (int): x coord of chunk
+            chunk_y (int): y coord of chunk
+
+        Returns:
+            chunk (Surface): Surface of chunk
+        """
+        width = min(TILE_LAYER_CHUNK_SIZE, self.map_info.tile_width - chunk_x * TILE_LAYER_CHUNK_SIZE)
+        height = min(TILE_LAYER_CHUNK_SIZE, self.map_info.tile_height - chunk_y * TILE_LAYER_CHUNK_SIZE)
+        chunk = pygame.Surface((width * SPRITE_SIZE, height * SPRITE_SIZE)).convert()
+        chunk.fill(BLACK)
+        self.chunks[(chunk_x, chunk_y)] = chunk
+        return chunk
+
+    def draw(self, surface, x_start, y_start, x_end, y_end, offset_x, offset_y):
+        """
+        Draws chunks overlapping tile range onto surface
+
+        Args:
+            surface (Surface): Surface to draw on
+            x_start (int): x coord of first tile to draw
+            y_start (int): y coord of first tile to draw
+            x_end (int): x coord of last tile to draw (exclusive)
+            y_end (int): y coord of last tile to draw (exclusive)
+            offset_x (int): x camera offset in pixels
+            offset_y (int): y camera offset in pixels
+        """
+        chunk_pixel_size = TILE_LAYER_CHUNK_SIZE * SPRITE_SIZE
+        blits = 0
+        for chunk_y in range(y_start // TILE_LAYER_CHUNK_SIZE, (y_end - 1) // TILE_LAYER_CHUNK_SIZE + 1):
+            for chunk_x in range(x_start // TILE_LAYER_CHUNK_SIZE, (x_end - 1) // TILE_LAYER_CHUNK_SIZE + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk:
+                    surface.blit(chunk, (chunk_x * chunk_pixel_size + offset_x,
+                                         chunk_y * chunk_pixel_size + offset_y))
+                    blits += 1
+        perf.count("blits", blits)
+
+
+# Seen tile layer of current level
+_seen_tile_layer = None
+
+
 def draw_game():
     """
     Draws map and entities
@@ -13,33 +103,63 @@ def draw_game():
     Note: Always call game.clock.tick(FPS) before and pygame.display.flip()
     after calling this method to update display
     """
-    # Draws all tiles
-    draw_tiles(config.MAP_INFO.tile_array)
+    # Draws all tiles on screen
+    with perf.timer("tiles"):
+        draw_tiles(config.MAP_INFO)
 
-    draw_game_objects()
+    with perf.timer("entities"):
+        draw_game_objects()
 
-    draw_grid()
+    with perf.timer("tiles"):
+        draw_grid()
 
-    draw_particles()
+    with perf.timer("particles"):
+        draw_particles()
 
-    config.BUTTON_PANEL.draw_buttons(config.SURFACE_MAIN)
+    with perf.timer("ui"):
+        config.BUTTON_PANEL.draw_buttons(config.SURFACE_MAIN)
 
-    draw_ui()
+        draw_ui()
 
-    if config.MINIMAP:
-        draw_minimap()
+        if config.MINIMAP:
+            draw_minimap()
 
 
-def draw_tiles(tile_list):
+def draw_tiles(map_info):
     """
-    Draws all tiles offset by camera
+    Draws tiles on screen offset by camera
+
+    Seen tiles are drawn from the cached seen tile layer and only
+    tiles in player FOV are drawn individually on top
 
     Args:
-        tile_list (list): List of tiles to draw
-    """
-    for col in tile_list:
-        for tile in col:
-            draw_at_camera_offset_without_image(tile)
+        map_info (MapInfo): Map info of level to draw
+    """
+    global _seen_tile_layer
+    # Remake layer on level change or when a tile changed type
+    if _seen_tile_layer is None or _seen_tile_layer.map_info is not map_info \
+            or _seen_tile_layer.revision != map_info.revision:
+        _seen_tile_layer = SeenTileLayer(map_info)
+    _seen_tile_layer.update()
+
+    x_start, y_start, x_end, y_end = config.CAMERA.visible_tile_range()
+    offset_x, offset_y = config.CAMERA.camera.topleft
+
+    config.SURFACE_MAIN.fill(BLACK)
+    _seen_tile_layer.draw(config.SURFACE_MAIN, x_start, y_start, x_end, y_end, offset_x, offset_y)
+
+    tile_types = map_info.tile_types
+    seeing = map_info.seeing
+    tile_dict = config.SPRITE.tile_dict
+    blits = 0
+    for y in range(y_start, y_end):
+        row_start = y * map_info.tile_width
+        for x in range(x_start, x_end):
+            if seeing[row_start + x]:
+                config.SURFACE_MAIN.blit(tile_dict[chr(tile_types[row_start + x])]["seeing"],
+                                         (x * SPRITE_SIZE + offset_x, y * SPRITE_SIZE + offset_y))
+                blits += 1
+    perf.count("blits", blits)
 
 
 def draw_grid():
@@ -61,6 +181,7 @@ def draw_at_camera_offset_without_image(obj):
         obj (Object): Entity to draw
     """
     config.SURFACE_MAIN.blit(obj.image, config.CAMERA.apply_without_image(obj))
+    perf.count("blits")
 
 
 def draw_at_camera_offset_with_image(obj):
@@ -71,14 +192,126 @@ def draw_at_camera_offset_with_image(obj):
         obj (Object): Entity to draw
     """
     config.SURFACE_MAIN.blit(obj.image, config.CAMERA.apply_with_image(obj))
+    perf.count("blits")
 
 
 def draw_debug():
     """
-    Draws FPS counter on top right of screen
+    Draws FPS counter on top right of screen and
+    performance HUD under it if it is on
     """
     game_text.draw_text(config.SURFACE_MAIN, (config.CAMERA.camera_width - 125, 15), WHITE,
                         "FPS: " + str(int(config.CLOCK.get_fps())), BLACK)
+    if perf.ENABLED:
+        _draw_perf_hud()
+
+
+def _draw_perf_hud():
+    """
+    Draws average and worst ms of every frame stage and
+    counters of the last frames on top right of screen
+    """
+    rows = [("stage (ms)", "avg", "max")]
+    for stage, average, worst in perf.stage_stats():
+        rows.append((stage, "{:.2f}".format(average), "{:.2f}".format(worst)))
+    rows.append(("counter", "avg", "last"))
+    for counter, average, last in perf.counter_stats():
+        rows.append((counter, "{:.0f}".format(average), str(last)))
+
+    text_height = game_text.text_height_helper(FONT_DEBUG_MESSAGE)
+    columns_x = [config.CAMERA.camera_width - 460, config.CAMERA.camera_width - 200,
+                 config.CAMERA.camera_width - 100]
+    for i, row in enumerate(rows):
+        y = 15 + (i + 1) * text_height
+        for column_x, text in zip(columns_x, row):
+            game_text.draw_text(config.SURFACE_MAIN, (column_x, y), WHITE, text, BLACK)
+
+
+class MapLayer:
+    """
+    Cached full map shown by map menu, scaled to fit screen
+
+    Only chunks of the map whose revision changed, ie a tile in them was
+    newly seen, went in or out of FOV or changed type, are redrawn, so
+    showing the map every frame only costs one blit plus the player
+
+    Args:
+        map_info (MapInfo): map info of level the layer is for
+        size (tuple): width, height in pixels to scale map to
+
+    Attributes:
+        map_info (arg, MapInfo): map info of level the layer is for
+        size (arg, tuple): width, height in pixels map is scaled to
+        scale_factor_x (float): what tile x pixel coords are divided by
+        scale_factor_y (float): what tile y pixel coords are divided by
+        revisions (array): revision of every chunk of map_info.chunks map was drawn with,
+            None until map is drawn
+        surface (Surface): scaled map
+    """
+
+    def __init__(self, map_info, size):
+        self.map_info = map_info
+        self.size = size
+        self.scale_factor_x = SPRITE_SIZE / (size[0] / map_info.tile_width)
+        self.scale_factor_y = SPRITE_SIZE / (size[1] / map_info.tile_height)
+        self.revisions = None
+        self.surface = pygame.Surface(size)
+
+    def update(self):
+        """
+        Redraws chunks of map whose revision changed since last update
+        """
+        chunks = self.map_info.chunks
+        if self.revisions is None:
+            changed = range(len(chunks))
+        elif self.revisions == chunks.revisions:
+            return
+        else:
+            changed = [chunk for chunk, revision in enumerate(chunks.revisions) if revision != self.revisions[chunk]]
+        self.revisions = array('I', chunks.revisions)
+        for chunk in changed:
+            self._draw_chunk(*chunks.tile_range(chunk))
+
+    def _draw_chunk(self, x_start, y_start, x_end, y_end):
+        """
+        Draws tiles of chunk, which are within
+        (x_start, y_start) and (x_end, y_end) exclusive
+
+        Args:
+            x_start (int): x coord of leftmost tile in chunk
+            y_start (int): y coord of top tile in chunk
+            x_end (int): x coord after rightmost tile in chunk
+            y_end (int): y coord after bottom tile in chunk
+        """
+        map_info = self.map_info
+        tile_size = (int(SPRITE_SIZE / self.scale_factor_x), int(SPRITE_SIZE / self.scale_factor_y))
+        tile_dict = config.SPRITE.tile_dict
+        unseen_img = sprite.scale_image(tile_dict["unseen"], tile_size)
+        tile_types = map_info.tile_types
+        seen = map_info.seen
+        seeing = map_info.seeing
+
+        # Chunk's pixels end where next chunk's first tile starts, so neighbouring chunks aren't drawn over
+        left = int(x_start * SPRITE_SIZE / self.scale_factor_x)
+        top = int(y_start * SPRITE_SIZE // self.scale_factor_y)
+        self.surface.fill(BLACK, (left, top, int(x_end * SPRITE_SIZE / self.scale_factor_x) - left,
+                                  int(y_end * SPRITE_SIZE // self.scale_factor_y) - top))
+        for y in range(y_start, y_end):
+            pixel_y = int(y * SPRITE_SIZE // self.scale_factor_y)
+            row_start = y * map_info.tile_width
+            for x in range(x_start, x_end):
+                index = row_start + x
+                if seen[index]:
+                    state = "seeing" if seeing[index] else "seen"
+                    tile_img = sprite.scale_image(tile_dict[chr(tile_types[index])][state], tile_size)
+                else:
+                    tile_img = unseen_img
+                self.surface.blit(tile_img, (int(x * SPRITE_SIZE / self.scale_factor_x), pixel_y))
+        perf.count("blits", (x_end - x_start) * (y_end - y_start))
+
+
+# Map layer shown by map menu
+_map_layer = None
 
 
 def draw_map(map_info):
@@ -89,27 +322,16 @@ def draw_map(map_info):
     Args:
         map_info (MapInfo): Has all map data
     """
-    map_data = map_info
-    tile_array = map_data.tile_array
-
-    scale_tile_width = RESOLUTION[0] / map_data.tile_width
-    scale_tile_height = RESOLUTION[1] / map_data.tile_height
-    scale_factor_x = SPRITE_SIZE / scale_tile_width
-    scale_factor_y = SPRITE_SIZE / scale_tile_height
-
-    minimap = pygame.Surface((RESOLUTION[0], RESOLUTION[1]))
-
-    for y in range(map_data.tile_height):
-        for x in range(map_data.tile_width):
-            tile = tile_array[y][x]
-            tile_img, tile_img_rect = sprite.scale_for_minimap(tile, scale_factor_x, scale_factor_y)
-            minimap.blit(tile_img, tile_img_rect)
-
-    player_img, player_img_rect = sprite.scale_for_minimap(config.PLAYER, scale_factor_x, scale_factor_y)
+    global _map_layer
+    if _map_layer is None or _map_layer.map_info is not map_info or _map_layer.size != RESOLUTION:
+        _map_layer = MapLayer(map_info, RESOLUTION)
+    _map_layer.update()
 
-    minimap.blit(player_img, player_img_rect)
+    config.SURFACE_MAIN.blit(_map_layer.surface, (0, 0))
 
-    config.SURFACE_MAIN.blit(minimap, (0, 0))
+    player_img, player_img_rect = sprite.scale_for_minimap(config.PLAYER, _map_layer.scale_factor_x,
+                                                           _map_layer.scale_factor_y)
+    config.SURFACE_MAIN.blit(player_img, player_img_rect)
 
 
 def draw_img_at_coord(img, x_coord, y_coord):
@@ -217,15 +439,16 @@ def _draw_and_update_anim_creatures(creatures_list):
             draw_at_camera_offset_without_image(creature)
 
 
-def _draw_items(item_list):
+def _draw_items(item_index):
     """
-    Draws item if the tile item is on is seen offset by camera
+    Draws items on screen if the tile item is on is seen offset by camera
 
     Args:
-        item_list (list): List of items to draw
+        item_index (SpatialIndex): Spatial index of items to draw
     """
-    for item in item_list:
-        if config.MAP_INFO.tile_array[item.y][item.x].seen:
+    map_info = config.MAP_INFO
+    for item in item_index.in_rect(*config.CAMERA.visible_tile_range()):
+        if map_info.seen[item.y * map_info.tile_width + item.x]:
             draw_at_camera_offset_without_image(item)
 
 
@@ -233,7 +456,7 @@ def draw_game_objects():
     """
     Draws all game objects offset by camera
     """
-    _draw_items(config.GAME_DATA.item_data)
+    _draw_items(config.GAME_DATA.item_index)
     _draw_and_update_anim_creatures(config.GAME_DATA.creature_data["enemy"] + config.GAME_DATA.creature_data["player"])
 
 
@@ -27,11 +27,14 @@ class Entity:
         ai (arg, ai): Ai Entity has
         item (arg, Item): Item self is
         container (arg, Container): Container self is
+        spatial_index (SpatialIndex): index of level self is in, None
+            if self isn't on a level (ie in inventory)
     """
 
     def __init__(self, x, y, object_name, creature=None, ai=None, item=None, container=None):
-        self.x = x
-        self.y = y
+        self.spatial_index = None
+        self._x = x
+        self._y = y
         self.object_name = object_name
 
         if isinstance(config.SPRITE.entity_dict[self.object_name], dict):
@@ -64,6 +67,48 @@ class Entity:
         if self.container:
             self.container.owner = self
 
+    def __getstate__(self):
+        # Spatial index is rebuilt when level is loaded, so it isn't saved
+        state = self.__dict__.copy()
+        state["spatial_index"] = None
+        return state
+
+    def __setstate__(self, state):
+        if "x" in state:
+            # Entity from save made before entities kept a spatial index
+            state["_x"] = state.pop("x")
+            state["_y"] = state.pop("y")
+            state["spatial_index"] = None
+        self.__dict__.update(state)
+
+    @property
+    def x(self):
+        """
+        Returns:
+            Position on x axis
+        """
+        return self._x
+
+    @x.setter
+    def x(self, x):
+        if self.spatial_index is not None:
+            self.spatial_index.move(self, x, self._y)
+        self._x = x
+
+    @property
+    def y(self):
+        """
+        Returns:
+            Position on y axis
+        """
+        return self._y
+
+    @y.setter
+    def y(self, y):
+        if self.spatial_index is not None:
+            self.spatial_index.move(self, self._x, y)
+        self._y = y
+
     @property
     def position(self):
         """
@@ -1,3 +1,4 @@
+from constant import *
 import config
 import random
 import creature
@@ -7,26 +8,35 @@ import container
 import item
 
 
-def generate_enemies(tree):
+def generate_enemies(tree, player_coord=None, level=None, rng=random):
     """
-    Generates one creature in every room
+    Generates ENEMIES_PER_ROOM creatures in every room
 
     Args:
         tree (BSP tree): Tree representing rooms
+        player_coord ((int, int)): coord no enemy is generated on,
+            player's coord if None
+        level (int): level of enemies, current floor if None
+        rng (Random): random number generator to place enemies with
 
     Returns:
         enemy_list (List): List of generated enemies
     """
+    if player_coord is None:
+        player_coord = (config.PLAYER.x, config.PLAYER.y)
+    if level is None:
+        level = config.CURRENT_FLOOR
     enemy_list = []
     # get all rooms in map
     for child_room in tree.root.child_room_list:
-        # generate monster in room
-        _generate_enemy(child_room, enemy_list)
+        # generate monsters in room
+        for _ in range(ENEMIES_PER_ROOM):
+            _generate_enemy(child_room, enemy_list, player_coord, level, rng)
 
     return enemy_list
 
 
-def _generate_enemy(room, enemy_list):
+def _generate_enemy(room, enemy_list, player_coord, level, rng):
     """
     Generates a random monster in room at random coords
     as long as coords is not the same as player coord
@@ -34,64 +44,70 @@ def _generate_enemy(room, enemy_list):
     Args:
         room (Room): Room to generate monste rin
         enemy_list (list): list to append created enemy to
+        player_coord ((int, int)): coord of player
+        level (int): level of monster
+        rng (Random): random number generator to place monster with
     """
     x1, y1, x2, y2 = room.coords
-    x = random.randint(x1, x2)
-    y = random.randint(y1, y2)
+    x = rng.randint(x1, x2)
+    y = rng.randint(y1, y2)
     # This makes it so no mosters spawn on same tile as player
-    while (x, y) == (config.PLAYER.x, config.PLAYER.y):
-        x = random.randint(x1, x2)
-        y = random.randint(y1, y2)
+    while (x, y) == player_coord:
+        x = rng.randint(x1, x2)
+        y = rng.randint(y1, y2)
 
-    random_num = random.randint(0, 2)
+    random_num = rng.randint(0, 2)
     if random_num == 0:
-        new_enemy = _generate_slime(x, y)
+        new_enemy = _generate_slime(x, y, level)
     elif random_num == 1:
-        new_enemy = _generate_goblin(x, y)
+        new_enemy = _generate_goblin(x, y, level)
     else:
-        new_enemy = _generate_skeleton(x, y)
+        new_enemy = _generate_skeleton(x, y, level)
 
     enemy_list.append(new_enemy)
 
 
-def _generate_slime(x, y):
+def _generate_slime(x, y, level):
     """
     Generates slime at coords (x, y)
 
     Args:
         x (int): x coord to generate monster at
         y (int): y coord to generate monster at
+        level (int): level of monster
     """
     ai_gen = ai.ChaseAI()
-    creature_gen = creature.Creature("slime", True, "enemy", level=config.CURRENT_FLOOR)
+    creature_gen = creature.Creature("slime", True, "enemy", level=level)
     generated_enemy = entity.Entity(x, y, "slime", creature=creature_gen, ai=ai_gen)
     return generated_enemy
 
 
-def _generate_goblin(x, y):
+def _generate_goblin(x, y, level):
     """
     Generates goblin at coords (x, y)
 
     Args:
         x (int): x coord to generate monster at
         y (int): y coord to generate monster at
+        level (int): level of monster
     """
     ai_gen = ai.ChaseAI()
-    creature_gen = creature.Creature("goblin", True, "enemy", level=config.CURRENT_FLOOR)
+    creature_gen = creature.Creature("goblin", True, "enemy", level=level)
     generated_enemy = entity.Entity(x, y, "goblin", creature=creature_gen, ai=ai_gen)
     return generated_enemy
 
 
-def _generate_skeleton(x, y):
+def _generate_skeleton(x, y, level):
     """
     Generates skeleton at coords (x, y)
 
     Args:
         x (int): x coord to generate monster at
         y (int): y coord to generate monster at
+        level (int): level of monster
     """
     ai_gen = ai.ChaseAI()
-    creature_gen = creature.Creature("skeleton", True, "enemy", level=config.CURRENT_FLOOR)
+    creature_gen = creature.Creature("skeleton", True, "enemy", level=level)
     generated_enemy = entity.Entity(x, y, "skeleton", creature=creature_gen, ai=ai_gen)
     return generated_enemy
 
@@ -114,7 +130,7 @@ def generate_player(tree, player_class):
     return player
 
 
-def generate_player_spawn(tree):
+def generate_player_spawn(tree, rng=random):
     """
     Generates player coords for random room
 
@@ -124,14 +140,15 @@ def generate_player_spawn(tree):
 
     Args:
         tree (BSP tree): Tree representing rooms
+        rng (Random): random number generator to pick coords with
 
     Returns:
         x, y (int, int): Coords to spawn player at
     """
-    room = random.choice(tree.root.child_room_list)
+    room = rng.choice(tree.root.child_room_list)
     x1, y1, x2, y2 = room.coords
-    x = random.randint(x1, x2)
-    y = random.randint(y1, y2)
+    x = rng.randint(x1, x2)
+    y = rng.randint(y1, y2)
     return x, y
 
 
@@ -144,12 +161,13 @@ def generate_free_camera():
     return free_camera
 
 
-def generate_items(tree):
+def generate_items(tree, rng=random):
     """
     Randomly generates items in rooms
 
     Args:
         tree (BSP tree): Tree representing rooms
+        rng (Random): random number generator to place items with
 
     Returns:
         item_list (List): list of all items generated
@@ -157,26 +175,27 @@ def generate_items(tree):
     item_list = []
     # get all rooms in map
     for child_room in tree.root.child_room_list:
-        random_num = random.randint(0, 100)
+        random_num = rng.randint(0, 100)
         # 50% chance of spawning item
         if random_num < 75:
-            _generate_item(child_room, item_list)
+            _generate_item(child_room, item_list, rng)
 
     return item_list
 
 
-def _generate_item(room, item_list):
+def _generate_item(room, item_list, rng):
     """
     Generates a item in room at random coords and appends to item_list
 
     Args:
         room (Room): Room to generate monster in
         item_list (list): list to append created item to
+        rng (Random): random number generator to place item with
     """
     x1, y1, x2, y2 = room.coords
-    x = random.randint(x1, x2)
-    y = random.randint(y1, y2)
-    random_num = random.randint(0, 5)
+    x = rng.randint(x1, x2)
+    y = rng.randint(y1, y2)
+    random_num = rng.randint(0, 5)
     if random_num == 0:
         new_item = _generate_hp_potion(x, y)
     elif random_num == 1:
@@ -271,20 +290,21 @@ def _generate_teleport_scroll(x, y):
     return generated_item
 
 
-def generate_win_item(tree):
+def generate_win_item(tree, rng=random):
     """
     Generates win item in random room
 
     Args:
         tree (BSP tree): Tree representing rooms
+        rng (Random): random number generator to place item with
 
     Returns:
         item (Entity): Win item entity
     """
-    random_room = random.choice(tree.root.child_room_list)
+    random_room = rng.choice(tree.root.child_room_list)
     x1, y1, x2, y2 = random_room.coords
-    x = random.randint(x1, x2)
-    y = random.randint(y1, y2)
+    x = rng.randint(x1, x2)
+    y = rng.randint(y1, y2)
 
     item_com = item.Item("chest", 0, 0)
     generated_item = entity.Entity(x, y, "chest", item=item_com)
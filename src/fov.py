@@ -1,21 +1,196 @@
 from gamemap import *
+import perf
+
+
+class FovManager:
+    """
+    Keeps player FOV up to date
+
+    FOV is only recalculated when the player moves, the map changes or
+    wall hack is toggled. When it is recalculated only the tiles that
+    went in or out of FOV have their seen/seeing changed
+
+    Args:
+        radius (int): How far player can see
+
+    Attributes:
+        map_info (MapInfo): map info FOV was last calculated for
+        key (tuple): player x, player y, map revision and wall hack flag
+            FOV was last calculated for
+        fov (2D array): fov array telling which tile is seen
+        visible (set): flat index of tiles in FOV. None if every tile
+            is in FOV because of wall hack
+    """
+
+    def __init__(self, radius=PLAYER_FOV):
+        self.radius = radius
+        self.map_info = None
+        self.key = None
+        self.fov = None
+        self.visible = set()
+
+    def update(self, map_info, player, wall_hack=False):
+        """
+        Recalculates FOV of map_info from player if anything it depends on
+        changed since last update and returns fov array
+
+        Args:
+            map_info (MapInfo): Map info of map player is on
+            player (Entity): Entity to calculate FOV from
+            wall_hack (Boolean): True if every tile should be in FOV
+
+        Returns:
+            fov (2D array): fov array telling which tile is seen
+        """
+        key = (player.x, player.y, map_info.revision, wall_hack)
+        if map_info is self.map_info and key == self.key:
+            return self.fov
+
+        if map_info is not self.map_info:
+            # Tiles still marked seeing from the last time map was visited
+            self.map_info = map_info
+            self.fov = new_fov(map_info)
+            self.visible = set(_find_set_bytes(map_info.seeing))
+        self.key = key
+
+        if wall_hack:
+            self.fov = full_fov(map_info)
+            change_seen(map_info, map_info.tile_array, self.fov)
+            self.visible = None
+            return self.fov
+
+        if self.visible is None:
+            # Wall hack was on, so every tile is seeing
+            self.fov = new_fov(map_info)
+            map_info.seeing[:] = bytes(len(map_info.seeing))
+            map_info.chunks.touch_all()
+            self.visible = set()
+        else:
+            for index in self.visible:
+                y, x = divmod(index, map_info.tile_width)
+                self.fov[y][x] = 0
+
+        calculate_fov(map_info, map_info.tile_array, self.fov, player, self.radius)
+        perf.count("fov updates")
+        visible = self._find_visible(player)
+        self._change_seen_incrementally(visible)
+        self.visible = visible
+        return self.fov
+
+    def _find_visible(self, player):
+        """
+        Returns flat index of tiles in FOV
+
+        Only the square of tiles within radius of player is checked
+        since no tile outside of it can be seen
+
+        Args:
+            player (Entity): Entity FOV was calculated from
+
+        Returns:
+            visible (set): flat index of tiles in FOV
+        """
+        map_info = self.map_info
+        visible = set()
+        x_start = max(0, player.x - self.radius)
+        x_end = min(map_info.tile_width, player.x + self.radius + 1)
+        for y in range(max(0, player.y - self.radius), min(map_info.tile_height, player.y + self.radius + 1)):
+            row = self.fov[y]
+            row_start = y * map_info.tile_width
+            x = row.find(1, x_start, x_end)
+            while x != -1:
+                visible.add(row_start + x)
+                x = row.find(1, x + 1, x_end)
+        return visible
+
+    def _change_seen_incrementally(self, visible):
+        """
+        Changes seen/seeing of tiles that went in or out of FOV
+
+        Args:
+            visible (set): flat index of tiles now in FOV
+        """
+        map_info = self.map_info
+        chunks = map_info.chunks
+        for index in self.visible - visible:
+            map_info.seeing[index] = 0
+            chunks.touch(index)
+        for index in visible - self.visible:
+            map_info.seeing[index] = 1
+            if not map_info.seen[index]:
+                map_info.seen[index] = 1
+                # Log newly seen tile so cached layers can draw it
+                map_info.seen_log.append(index)
+                chunks.see(index)
+            else:
+                chunks.touch(index)
+
+
+def _find_set_bytes(array):
+    """
+    Returns index of every byte of array with value 1
+
+    Args:
+        array (bytearray): array to search
+
+    Returns:
+        indices (List): index of every byte with value 1
+    """
+    indices = []
+    index = array.find(1)
+    while index != -1:
+        indices.append(index)
+        index = array.find(1, index + 1)
+    return indices
 
 
 def new_fov(map_data):
     """
     Makes new fov array
 
+    Each row is a bytearray so fov[y][x] works like a 2D list
+    while whole rows can be copied into the MapInfo arrays at once
+
     Args:
         map_data: Game with game data
 
     Returns:
         new_fov (2D array): new fov array
     """
-    new_fov = [[0 for x in range(0, map_data.tile_width)] for y in range(map_data.tile_height)]
+    new_fov = [bytearray(map_data.tile_width) for y in range(map_data.tile_height)]
     return new_fov
 
 
-def ray_casting(map_data, tile_array, fov, player):
+def full_fov(map_data):
+    """
+    Makes fov array where every tile is seen
+
+    Args:
+        map_data (MapInfo): Map info of map
+
+    Returns:
+        full_fov (2D array): fov array with every tile seen
+    """
+    full_fov = [bytearray(b'\x01' * map_data.tile_width) for y in range(map_data.tile_height)]
+    return full_fov
+
+
+def calculate_fov(map_data, tile_array, fov, player, radius=PLAYER_FOV):
+    """
+    Calculates which tiles are seen using the algorithm set by
+    FOV_ALGORITHM
+
+    Args:
+        map_data (MapInfo): Map info of map
+        tile_array (2D array): tile array of map
+        fov (2D array): fov array telling which tile is seen
+        player (Object): Entity to calculate FOV from
+        radius (int): How far entity can see
+    """
+    fov_algorithm_dict[FOV_ALGORITHM](map_data, tile_array, fov, player, radius)
+
+
+def ray_casting(map_data, tile_array, fov, player, radius=PLAYER_FOV):
     """
     Calculates which tiles are seen
 
@@ -27,7 +202,10 @@ def ray_casting(map_data, tile_array, fov, player):
         map_data (MapInfo): Game with game data
         tile_array (2D array): map_array with representation of map
         fov (2D array): fov array telling which tile is seen
+        radius (int): How far rays go
     """
+    tile_types = map_data.tile_types
+    perf.count("rays cast", len(range(0, RAYS + 1, STEP)))
     for a in range(0, RAYS + 1, STEP):
         ax = sintable[a]
         ay = costable[a]
@@ -35,49 +213,136 @@ def ray_casting(map_data, tile_array, fov, player):
         x = player.x
         y = player.y
 
-        for b in range(PLAYER_FOV):
+        for b in range(radius):
             x += ax
             y += ay
 
             if x < 0 or y < 0 or x > map_data.tile_width - 1 or y > map_data.tile_height - 1:
                 break
 
-            fov[int(round(y))][int(round(x))] = 1
+            tile_x = int(round(x))
+            tile_y = int(round(y))
+            fov[tile_y][tile_x] = 1
 
-            if tile_array[int(round(y))][int(round(x))].type == WALL:
+            if tile_types[tile_y * map_data.tile_width + tile_x] == WALL_CODE:
                 break
 
     fov[player.y][player.x] = 1
 
 
+def shadow_casting(map_data, tile_array, fov, player, radius=PLAYER_FOV):
+    """
+    Calculates which tiles are seen using symmetric shadowcasting
+
+    Each quadrant around the player is scanned row by row, moving away
+    from the player, and walls cast shadows that narrow the rows behind them.
+    Unlike ray casting no tile is missed at long range and a tile is seen
+    from the player if and only if the player is seen from the tile
+
+    Taken from:
+        https://www.albertford.com/shadowcasting/
+
+    Slopes are kept as integer numerator/denominator pairs so no float
+    rounding is needed
+
+    Args:
+        map_data (MapInfo): Map info of map
+        tile_array (2D array): tile array of map
+        fov (2D array): fov array telling which tile is seen
+        player (Object): Entity to calculate FOV from
+        radius (int): How far entity can see
+    """
+    fov[player.y][player.x] = 1
+    for transform in _QUADRANT_TRANSFORMS:
+        _scan_row(map_data, tile_array, fov, player.x, player.y, transform, radius,
+                  1, -1, 1, 1, 1)
+
+
+def _scan_row(map_data, tile_array, fov, origin_x, origin_y, transform, radius,
+              depth, start_num, start_den, end_num, end_den):
+    """
+    Helper function for shadow_casting. Marks the seen tiles in row at depth
+    between start slope and end slope and recursively scans rows behind it
+
+    Args:
+        map_data (MapInfo): Map info of map
+        tile_array (2D array): tile array of map
+        fov (2D array): fov array telling which tile is seen
+        origin_x (int): x coord FOV is calculated from
+        origin_y (int): y coord FOV is calculated from
+        transform ((int, int, int, int)): how much column and depth change
+            x and y by for the quadrant being scanned
+        radius (int): How far entity can see
+        depth (int): distance of row from origin
+        start_num (int): numerator of start slope
+        start_den (int): denominator of start slope
+        end_num (int): numerator of end slope
+        end_den (int): denominator of end slope
+    """
+    if depth > radius:
+        return
+
+    col_x, depth_x, col_y, depth_y = transform
+    # Round start slope ties up and end slope ties down
+    min_col = (2 * depth * start_num + start_den) // (2 * start_den)
+    max_col = -((end_den - 2 * depth * end_num) // (2 * end_den))
+    max_radius = radius * radius + radius
+
+    prev_is_wall = None
+    for col in range(min_col, max_col + 1):
+        x = origin_x + col * col_x + depth * depth_x
+        y = origin_y + col * col_y + depth * depth_y
+        in_map = 0 <= x < map_data.tile_width and 0 <= y < map_data.tile_height
+        # Treat outside of map as wall
+        is_wall = not in_map or map_data.tile_types[y * map_data.tile_width + x] == WALL_CODE
+
+        if in_map and col * col + depth * depth <= max_radius:
+            if is_wall or (col * start_den >= depth * start_num and col * end_den <= depth * end_num):
+                fov[y][x] = 1
+
+        if prev_is_wall and not is_wall:
+            start_num, start_den = 2 * col - 1, 2 * depth
+        elif prev_is_wall is False and is_wall:
+            _scan_row(map_data, tile_array, fov, origin_x, origin_y, transform, radius,
+                      depth + 1, start_num, start_den, 2 * col - 1, 2 * depth)
+        prev_is_wall = is_wall
+
+    if prev_is_wall is False:
+        _scan_row(map_data, tile_array, fov, origin_x, origin_y, transform, radius,
+                  depth + 1, start_num, start_den, end_num, end_den)
+
+
 def change_seen(map_data, tile_array, fov):
     """
     Changes tile's sprite depending on if it's unseen, seen or explored tiles
 
-    Taken from:
-        http://www.roguebasin.com/index.php?title=Raycasting_in_python
+    Works on the whole map at once by treating the fov and the MapInfo
+    seen/seeing arrays as big ints, so no per tile python loop is needed
+    except for tiles that are seen for the first time
 
     Args:
-        map_data (Game): Game with game data
+        map_data (MapInfo): Map info of map
         tile_array (2D array): tile array of map
         fov (2D array): fov array telling which tile is seen
     """
-    for y in range(0, map_data.tile_height):
-        for x in range(0, map_data.tile_width):
-            tile = tile_array[y][x]
-            # If tile is seen switch to in fov sprite
-            if fov[y][x] == 1:
-                tile.seeing = True
-                tile.seen = True
-                # Remove seen tile from unseen_tile
-                if (x, y) in map_data.unseen_tiles:
-                    map_data.unseen_tiles.remove((x, y))
-            # Tile is not seen
-            else:
-                tile = tile_array[y][x]
-                # If seen set seeing flag to false
-                if tile.seen:
-                    tile.seeing = False
+    fov_array = b''.join(fov)
+    size = len(fov_array)
+    fov_bits = int.from_bytes(fov_array, 'little')
+    seen_bits = int.from_bytes(map_data.seen, 'little')
+
+    # Tiles in fov are seeing, tiles not in fov are not
+    map_data.seeing[:] = fov_array
+    map_data.seen[:] = (seen_bits | fov_bits).to_bytes(size, 'little')
+
+    # Log newly seen tiles so cached layers can draw them
+    newly_seen = (fov_bits & ~seen_bits).to_bytes(size, 'little')
+    index = newly_seen.find(1)
+    while index != -1:
+        map_data.seen_log.append(index)
+        map_data.chunks.see(index)
+        index = newly_seen.find(1, index + 1)
+    # Tiles anywhere may have gone in or out of fov
+    map_data.chunks.touch_all()
 
 
 def check_if_in_fov(obj, fov):
@@ -93,6 +358,21 @@ def check_if_in_fov(obj, fov):
     return fov[y][x] == 1
 
 
+# How (column, depth) of a row maps to (x, y) for the north, south, east
+# and west quadrants as (col_x, depth_x, col_y, depth_y)
+_QUADRANT_TRANSFORMS = [
+    (1, 0, 0, -1),
+    (1, 0, 0, 1),
+    (0, 1, 1, 0),
+    (0, -1, 1, 0)
+]
+
+# Lookup table for FOV algorithms
+fov_algorithm_dict = {
+    "shadowcasting": shadow_casting,
+    "raycasting": ray_casting
+}
+
 sintable = [
     0.00000, 0.01745, 0.03490, 0.05234, 0.06976, 0.08716, 0.10453,
     0.12187, 0.13917, 0.15643, 0.17365, 0.19081, 0.20791, 0.22495, 0.24192,
@@ -1,4 +1,4 @@
-import pickle
+import random
 import sys
 from constant import *
 import config
@@ -6,11 +6,14 @@ import fov
 import gamemap
 import magic
 import pathfinding
+import perf
 from camera import Camera
 import draw
 import menu
 import buttonmanager
 import game_data
+import level_generator
+import save_file
 import entity_generator
 
 pygame.font.init()
@@ -33,10 +36,14 @@ class Game:
         while self.playing:
             config.CLOCK.tick(FPS)
             handle_events()
+            if abs(config.TURN_COUNT - config.AUTOSAVER.last_turn) >= AUTOSAVE_TURNS:
+                autosave()
             update_game()
             draw.draw_mouse()
             self.check_if_player_lost()
-            pygame.display.flip()
+            with perf.timer("flip"):
+                pygame.display.flip()
+            perf.end_frame()
 
     def check_if_player_lost(self):
         """
@@ -50,8 +57,12 @@ class Game:
 def handle_events():
     """
     Handle player input
+
+    Only polling events is timed as "events" stage, since handling them can
+    run whole frames (auto moving) or blocking menu loops
     """
-    events = pygame.event.get()
+    with perf.timer("events"):
+        events = pygame.event.get()
     for event in events:
         if event.type == pygame.QUIT:
             quit_game()
@@ -163,12 +174,15 @@ def _handle_keyboard_event(event):
 
     # Pickup/Drop Item
     elif event.key == pygame.K_t:
-        objects_at_player = map_items_at_coord(config.GAME_DATA.item_data, config.PLAYER.x, config.PLAYER.y)
+        objects_at_player = map_items_at_coord(config.PLAYER.x, config.PLAYER.y)
         for obj in objects_at_player:
             if obj.item:
                 obj.item.pick_up(config.PLAYER)
         update_creatures(config.GAME_DATA.creature_data, 0, 0)
 
+    elif event.key == pygame.K_F11:
+        perf.toggle()
+
     elif event.key == pygame.K_F12:
         _toggle_wallhack()
 
@@ -195,6 +209,7 @@ def _handle_keyboard_event(event):
         if config.MAP_INFO.tile_array[config.PLAYER.y][config.PLAYER.x].type == UPSTAIR:
             config.CURRENT_FLOOR -= 1
             config.GAME_DATA.transition_previous_level()
+            autosave()
 
     # Goes to next level
     elif event.key == pygame.K_2:
@@ -202,9 +217,10 @@ def _handle_keyboard_event(event):
                 config.MAP_INFO.tile_array[config.PLAYER.y][config.PLAYER.x].type == DOWNSTAIR:
             config.CURRENT_FLOOR += 1
             config.GAME_DATA.transition_next_level()
+            autosave()
 
     elif event.key == pygame.K_F2:
-        save_game()
+        autosave()
 
     elif event.key == pygame.K_F3:
         load_game()
@@ -221,7 +237,8 @@ def quit_game():
     """
     Saves game and closes
     """
-    save_game()
+    autosave()
+    config.AUTOSAVER.wait()
     pygame.quit()
     sys.exit()
 
@@ -273,11 +290,7 @@ def _toggle_camera():
         config.CLOCK.tick(FPS)
         config.CAMERA.update(free_camera)
 
-        if not config.WALL_HACK:
-            config.FOV = fov.new_fov(config.MAP_INFO)
-
-        fov.ray_casting(config.MAP_INFO, config.MAP_INFO.tile_array, config.FOV, config.PLAYER)
-        fov.change_seen(config.MAP_INFO, config.MAP_INFO.tile_array, config.FOV)
+        update_fov()
 
         draw.draw_game()
         draw.draw_at_camera_offset_without_image(free_camera)
@@ -326,20 +339,18 @@ def _check_if_enemy_in_fov(enemy_list):
     return False
 
 
-def map_items_at_coord(item_list, coord_x, coord_y):
+def map_items_at_coord(coord_x, coord_y):
     """
     Returns list of items at (coord_x, coord_y)
 
     Args:
-        item_list (list): List of items to check
         coord_x (int): x coord on map
         coord_y (int): y coord on map
 
     Returns:
         objects (List): list of items at (coord_x, coord_y)
     """
-    objects = [obj for obj in item_list if obj.x == coord_x and obj.y == coord_y]
-    return objects
+    return config.GAME_DATA.item_index.at(coord_x, coord_y)
 
 
 def _toggle_wallhack():
@@ -348,23 +359,19 @@ def _toggle_wallhack():
     else turn back to normal fov
     """
     config.WALL_HACK = not config.WALL_HACK
-    if config.WALL_HACK:
-        config.FOV = [[1 for x in range(0, config.MAP_INFO.tile_width)]
-                      for y in range(config.MAP_INFO.tile_height)]
+    update_fov()
 
 
 def update_creatures(creature_dict, dx, dy):
     """
-    Updates all creatures and increments turn count
+    Lets every awake creature take its turn and increments turn count
 
     Args:
         creature_dict (dict): Dictionary of player and enemy
         dx (int): x to move player by
         dy (int): y to move player by
     """
-    for team in creature_dict:
-        for entity in config.GAME_DATA.creature_data[team]:
-            entity.update(dx, dy)
+    config.TURN_SCHEDULER.run_turn(creature_dict, dx, dy)
     config.TURN_COUNT += 1
 
 
@@ -396,6 +403,47 @@ def populate_map():
     if config.CURRENT_FLOOR == NUM_OF_FLOOR:
         config.GAME_DATA.item_data.append(entity_generator.generate_win_item(config.MAP_INFO.map_tree))
 
+    config.GAME_DATA.rebuild_spatial_index()
+
+    start_next_level_generation()
+
+
+def start_next_level_generation():
+    """
+    Starts generating next floor in background if player is on the
+    deepest floor reached, from a seed picked now
+    """
+    if config.CURRENT_FLOOR < NUM_OF_FLOOR and not config.GAME_DATA.next_levels:
+        config.NEXT_LEVEL_GENERATOR.start(config.CURRENT_FLOOR + 1, random.getrandbits(32))
+
+
+def _load_pregenerated_level():
+    """
+    Swaps in current floor if it was generated in background
+
+    Returns:
+        True if level was loaded, False if it has to be generated
+    """
+    level = config.NEXT_LEVEL_GENERATOR.take(config.CURRENT_FLOOR)
+    if level is None:
+        return False
+
+    config.MAP_INFO = level.map_info
+    config.PATHFINDING = level.graph
+    # Scheduler keeps room graph since it was built for config.MAP_INFO
+    config.TURN_SCHEDULER.room_graph = level.room_graph
+    generate_camera()
+
+    config.PARTICLE_LIST = []
+    config.PLAYER.x, config.PLAYER.y = level.player_x, level.player_y
+    config.GAME_DATA.creature_data["enemy"] = level.enemy_list
+    config.GAME_DATA.item_data = level.item_list
+    config.GAME_DATA.creature_data["player"] = [config.PLAYER]
+    config.GAME_DATA.rebuild_spatial_index()
+
+    start_next_level_generation()
+    return True
+
 
 def _generate_new_map():
     """
@@ -416,8 +464,12 @@ def initialize_pathfinding():
 
 def new_level():
     """
-    Makes new map and entities
+    Makes new map and entities, using the level generated in
+    background if there is one
     """
+    if _load_pregenerated_level():
+        return
+
     _generate_new_map()
 
     generate_camera()
@@ -464,21 +516,33 @@ def new_game():
 
     populate_map()
 
+    config.AUTOSAVER.last_turn = config.TURN_COUNT
+
 
 def update_game():
     """
     Updates camera and fov
     """
     # Update what to lock camera on
-    config.CAMERA.update(config.PLAYER)
+    with perf.timer("camera"):
+        config.CAMERA.update(config.PLAYER)
 
-    if not config.WALL_HACK:
-        config.FOV = fov.new_fov(config.MAP_INFO)
+    with perf.timer("fov"):
+        update_fov()
 
-    fov.ray_casting(config.MAP_INFO, config.MAP_INFO.tile_array, config.FOV, config.PLAYER)
-    fov.change_seen(config.MAP_INFO, config.MAP_INFO.tile_array, config.FOV)
+    if HEADLESS:
+        # Nothing draws particles, so drop them instead of letting them pile up
+        config.PARTICLE_LIST.clear()
+    else:
+        draw.draw_game()
 
-    draw.draw_game()
+
+def update_fov():
+    """
+    Updates player fov. Fov is only recalculated if player moved,
+    map changed or wall hack was toggled since last update
+    """
+    config.FOV = config.FOV_MANAGER.update(config.MAP_INFO, config.PLAYER, config.WALL_HACK)
 
 
 def move_char_auto(path, ignore=False):
@@ -524,9 +588,12 @@ def move_char_auto(path, ignore=False):
             old_coord = coord
 
             update_game()
-            draw.draw_mouse()
-            config.CLOCK.tick(20)
-            pygame.display.flip()
+            if not HEADLESS:
+                draw.draw_mouse()
+                config.CLOCK.tick(20)
+                with perf.timer("flip"):
+                    pygame.display.flip()
+                perf.end_frame()
 
 
 def auto_path(graph):
@@ -540,7 +607,7 @@ def auto_path(graph):
     Args:
         graph (Graph): Graph with nodes representing the walkable tiles
     """
-    if len(config.MAP_INFO.unseen_tiles) < 75:
+    if config.MAP_INFO.chunks.unseen_count < 75:
         start, goal = gamemap.find_closest_unseen_tile_walking_distance()
     else:
         start, goal = gamemap.find_closest_unseen_tile()
@@ -567,29 +634,52 @@ def cast_magic(spell_to_cast, line):
     update_creatures(config.GAME_DATA.creature_data, 0, 0)
 
 
-def save_game():
+def save_game(path=SAVE_PATH):
     """
-    Saves game to data/save.txt
+    Saves game to path, data/save.txt by default
+
+    Args:
+        path (String): path of save file
+    """
+    save_file.save(path, config.CURRENT_FLOOR, config.TURN_COUNT,
+                   config.MAP_INFO, config.PLAYER, config.GAME_DATA)
+
+
+def autosave():
+    """
+    Takes snapshot of game and saves it to data/save.txt in background
     """
-    with open(SAVE_PATH, 'wb') as file:
-        pickle.dump([config.CURRENT_FLOOR, config.TURN_COUNT,
-                     config.MAP_INFO, config.PLAYER,
-                     config.GAME_DATA], file)
+    config.AUTOSAVER.save(save_file.snapshot(config.CURRENT_FLOOR, config.TURN_COUNT,
+                                             config.MAP_INFO, config.PLAYER, config.GAME_DATA),
+                          config.TURN_COUNT)
 
 
-def load_game():
+def load_game(path=SAVE_PATH):
     """
-    Loads game from data/save.txt
+    Loads game from path, data/save.txt by default. Floors
+    player isn't on are only decoded when player goes to them
 
     Initializes camera and pathfinding
+
+    Args:
+        path (String): path of save file
     """
-    with open(SAVE_PATH, 'rb') as file:
-        config.CURRENT_FLOOR, \
-        config.TURN_COUNT, \
-        config.MAP_INFO, \
-        config.PLAYER, \
-        config.GAME_DATA = pickle.load(file)
+    # Don't read save while it is still being written
+    config.AUTOSAVER.wait()
+
+    config.CURRENT_FLOOR, \
+    config.TURN_COUNT, \
+    config.MAP_INFO, \
+    config.PLAYER, \
+    config.GAME_DATA = save_file.load(path)
+
+    config.GAME_DATA.rebuild_spatial_index()
+    config.AUTOSAVER.last_turn = config.TURN_COUNT
 
     generate_camera()
 
     initialize_pathfinding()
+
+    # Background level of game played before load is thrown away
+    config.NEXT_LEVEL_GENERATOR = level_generator.LevelGenerator()
+    start_next_level_generation()
@@ -2,6 +2,9 @@ import collections
 from constant import *
 import config
 import game
+import message_log
+import save_file
+import spatial_index
 
 
 class GameData:
@@ -11,7 +14,10 @@ class GameData:
             "enemy": []
         }
         self.item_data = []
-        self.game_messages = []
+        # Spatial indexes of creatures and items on current level
+        self.creature_index = spatial_index.SpatialIndex()
+        self.item_index = spatial_index.SpatialIndex()
+        self.game_messages = message_log.MessageLog()
         self.previous_levels = collections.deque()
         self.next_levels = collections.deque()
 
@@ -26,7 +32,7 @@ class GameData:
                 self.item_data)
             self.next_levels.append(level_data)
 
-            x, y, map_info, enemy_list, item_group = self.previous_levels.popleft()
+            x, y, map_info, enemy_list, item_group = _unpacked(self.previous_levels.popleft())
 
             self._load_level_data(enemy_list, item_group, map_info, x, y)
 
@@ -44,7 +50,7 @@ class GameData:
             # Places upstair at where the player entered the map at
             config.MAP_INFO.tile_array[config.PLAYER.y][config.PLAYER.x].type = UPSTAIR
         else:
-            x, y, map_info, enemy_list, item_group = self.next_levels.popleft()
+            x, y, map_info, enemy_list, item_group = _unpacked(self.next_levels.popleft())
 
             self._load_level_data(enemy_list, item_group, map_info, x, y)
 
@@ -64,6 +70,31 @@ class GameData:
         self.creature_data["enemy"] = enemy_list
         self.item_data = item_group
         config.MAP_INFO = map_info
+        self.rebuild_spatial_index()
         game.generate_camera()
         game.initialize_pathfinding()
+        game.start_next_level_generation()
 
+    def rebuild_spatial_index(self):
+        """
+        Rebuilds spatial indexes from creatures and items on current level
+        """
+        self.creature_index.rebuild(
+            [entity for entity_list in self.creature_data.values() for entity in entity_list])
+        self.item_index.rebuild(self.item_data)
+
+
+def _unpacked(level_data):
+    """
+    Returns level data, decoding it first if it is a floor still packed from a save file
+
+    Args:
+        level_data (tuple or PackedLevel): level data of a floor
+
+    Returns:
+        level_data (tuple): player x, player y, map info, enemy list
+            and item list of floor
+    """
+    if isinstance(level_data, save_file.PackedLevel):
+        return level_data.unpack()
+    return level_data
@@ -1,7 +1,12 @@
 from constant import *
+import collections
 import config
+import perf
 from exceptions import *
 
+# Rendered text surfaces shared by every text path, least recently used first
+_text_cache = collections.OrderedDict()
+
 
 def add_game_message_to_print(ingame_message, message_color):
     """
@@ -14,27 +19,90 @@ def add_game_message_to_print(ingame_message, message_color):
     config.GAME_DATA.game_messages.append((ingame_message, message_color))
 
 
+def _cached_surface(key, make_surface):
+    """
+    Returns surface cached with key, making it with make_surface and
+    caching it if it isn't cached. Least recently used surface is dropped
+    once TEXT_CACHE_SIZE surfaces are cached
+
+    Args:
+        key (tuple): key of surface, has to include everything surface depends on
+        make_surface (function): function making surface
+
+    Returns:
+        surface (Surface): cached surface. Shared, so it shouldn't be drawn on
+    """
+    surface = _text_cache.get(key)
+    if surface is None:
+        surface = make_surface()
+        perf.count("text renders")
+        if len(_text_cache) >= TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+        _text_cache[key] = surface
+    else:
+        _text_cache.move_to_end(key)
+    return surface
+
+
+def _colour_key(colour):
+    """
+    Returns colour as hashable tuple, or None if colour is None
+    """
+    if colour is None:
+        return None
+    return tuple(colour)
+
+
+def render_text(font, text, text_color, text_bg_color=None):
+    """
+    Returns text rendered with font, only rendering it if it isn't cached
+
+    Args:
+        font (Font): font to render text with
+        text (string): text to render
+        text_color (color): color of text
+        text_bg_color (color): background color of text, transparent if None
+
+    Returns:
+        text_surface (Surface): rendered text. Shared, so it shouldn't be drawn on
+    """
+    return _cached_surface((font, text, _colour_key(text_color), _colour_key(text_bg_color)),
+                           lambda: font.render(text, False, text_color, text_bg_color))
+
+
+def render_freetype_text(font, text, text_color):
+    """
+    Returns text rendered with freetype font, only rendering it if it isn't cached
+
+    Args:
+        font (freetype.Font): font to render text with
+        text (string): text to render
+        text_color (color): color of text
+
+    Returns:
+        text_surface (Surface): rendered text. Shared, so it shouldn't be drawn on
+    """
+    return _cached_surface((font, text, _colour_key(text_color)),
+                           lambda: font.render(text, text_color)[0])
+
+
 def text_height_helper(font):
     """
     Helper to retrieve height of font rect
     """
-    font_object = font.render('a', False, (0, 0, 0))
+    font_object = render_text(font, 'a', (0, 0, 0))
     font_rect = font_object.get_rect()
     return font_rect.height
 
 
-def messages_to_draw(message_list):
+def messages_to_draw(message_log):
     """
-    Store most recent NUM_MESSAGES in message_list in to_draw
+    Returns most recent NUM_MESSAGES in message_log
 
     Args:
-        message_list (List): List of messages to draw
+        message_log (MessageLog): Log of messages to draw
     """
-    if len(message_list) <= NUM_MESSAGES:
-        to_draw = message_list
-    else:
-        to_draw = message_list[-NUM_MESSAGES:]
-    return to_draw
+    return message_log.recent(NUM_MESSAGES)
 
 
 def draw_text(display_surface, coord, text_color, text, text_bg_color=None, center=False):
@@ -58,6 +126,7 @@ def draw_text(display_surface, coord, text_color, text, text_bg_color=None, cent
         text_rect.topleft = coord
 
     display_surface.blit(text_surface, text_rect)
+    perf.count("blits")
 
 
 def _text_to_objects_helper(inc_text, inc_color, inc_bg_color):
@@ -69,16 +138,32 @@ def _text_to_objects_helper(inc_text, inc_color, inc_bg_color):
         inc_color (color): color of text
         inc_bg_color (color): background color of text
     """
-    if inc_bg_color:
-        text_surface = FONT_DEBUG_MESSAGE.render(
-            inc_text, False, inc_color, inc_bg_color)
-    else:
-        text_surface = FONT_DEBUG_MESSAGE.render(
-            inc_text, False, inc_color, None )
+    text_surface = render_text(FONT_DEBUG_MESSAGE, inc_text, inc_color, inc_bg_color or None)
     return text_surface, text_surface.get_rect()
 
-# Taken from https://stackoverflow.com/questions/32590131/pygame-blitting-text-with-an-escape-character-or-newline
 def multiLineSurface(string, font, rect, fontColour, BGColour, justification=0):
+    """
+    Returns cached word-wrapped text surface, see _multiLineSurface. The surface
+    is shared, so it shouldn't be drawn on
+    """
+    return _cached_surface(("multi line", font, string, tuple(rect.size), _colour_key(fontColour),
+                            _colour_key(BGColour), justification),
+                           lambda: _multiLineSurface(string, font, rect, fontColour, BGColour, justification))
+
+
+def multiLineSurfaceTransparentBG(string, font, rect, fontColour, textBGColor=None, BGColour=None, justification=0):
+    """
+    Returns cached word-wrapped text surface, see _multiLineSurfaceTransparentBG.
+    The surface is shared, so it shouldn't be drawn on
+    """
+    return _cached_surface(("multi line transparent", font, string, tuple(rect.size), _colour_key(fontColour),
+                            _colour_key(textBGColor), _colour_key(BGColour), justification),
+                           lambda: _multiLineSurfaceTransparentBG(string, font, rect, fontColour, textBGColor,
+                                                                  BGColour, justification))
+
+
+# Taken from https://stackoverflow.com/questions/32590131/pygame-blitting-text-with-an-escape-character-or-newline
+def _multiLineSurface(string, font, rect, fontColour, BGColour, justification=0):
     """Returns a surface containing the passed text string, reformatted
     to fit within the given rect, word-wrapping as necessary. The text
     will be anti-aliased.
@@ -147,7 +232,7 @@ def multiLineSurface(string, font, rect, fontColour, BGColour, justification=0):
 
 
 # Taken from https://stackoverflow.com/questions/32590131/pygame-blitting-text-with-an-escape-character-or-newline
-def multiLineSurfaceTransparentBG(string, font, rect, fontColour, textBGColor=None, BGColour=None, justification=0):
+def _multiLineSurfaceTransparentBG(string, font, rect, fontColour, textBGColor=None, BGColour=None, justification=0):
     """Returns a surface containing the passed text string, reformatted
     to fit within the given rect, word-wrapping as necessary. The text
     will be anti-aliased.
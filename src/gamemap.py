@@ -1,27 +1,83 @@
+import random
 import sys
+from array import array
 import config
+import map_chunks
 from map_generator import Tree
 from pathfinding import *
 
-pygame.init()
+
+# Tile types are stored in MapInfo.tile_types as the byte of their char
+WALL_CODE = ord(WALL)
 
 
 class Tile:
+    """
+    View of a single tile of a map. The tile's data is stored in
+    the MapInfo arrays, so Tiles are only made when needed
 
-    def __init__(self, x, y, type):
-        """
-        Class that holds information about tile
+    Attributes:
+        map_info (arg, MapInfo): map info tile is in
+        x (arg, int): x coord of tile
+        y (arg, int): y coord of tile
+    """
+    __slots__ = ('map_info', 'x', 'y')
 
-        Args:
-            x (int): x coord of tile
-            y (int): y coord of tile
-            type (string): the type of tile it is as a char
-        """
+    def __init__(self, map_info, x, y):
+        self.map_info = map_info
         self.x = x
         self.y = y
-        self.type = type
-        self.seeing = False
-        self.seen = False
+
+    @property
+    def index(self):
+        """
+        Returns:
+            Index of tile in the MapInfo arrays
+        """
+        return self.y * self.map_info.tile_width + self.x
+
+    @property
+    def type(self):
+        """
+        Returns:
+            The type of tile it is as a char
+        """
+        return chr(self.map_info.tile_types[self.index])
+
+    @type.setter
+    def type(self, tile_type):
+        # Tile may have stopped or started being a wall
+        was_unseen = self.map_info.chunks.is_unseen(self.index)
+        self.map_info.tile_types[self.index] = ord(tile_type)
+        self.map_info.revision += 1
+        self.map_info.chunks.change_tile(self.index, was_unseen)
+
+    @property
+    def seeing(self):
+        """
+        Returns:
+            True if tile is in player FOV
+        """
+        return bool(self.map_info.seeing[self.index])
+
+    @seeing.setter
+    def seeing(self, seeing):
+        self.map_info.seeing[self.index] = seeing
+        self.map_info.chunks.touch(self.index)
+
+    @property
+    def seen(self):
+        """
+        Returns:
+            True if tile has been seen
+        """
+        return bool(self.map_info.seen[self.index])
+
+    @seen.setter
+    def seen(self, seen):
+        was_unseen = self.map_info.chunks.is_unseen(self.index)
+        self.map_info.seen[self.index] = seen
+        self.map_info.chunks.change_tile(self.index, was_unseen)
 
     @property
     def image(self):
@@ -57,25 +113,110 @@ class Tile:
         return SPRITE_SIZE, SPRITE_SIZE
 
 
+class TileRow:
+    """
+    View of a row of tiles so tile_array[y][x] returns Tile at (x, y)
+
+    Attributes:
+        map_info (arg, MapInfo): map info row is in
+        y (arg, int): y coord of row
+    """
+    __slots__ = ('map_info', 'y')
+
+    def __init__(self, map_info, y):
+        self.map_info = map_info
+        self.y = y
+
+    def __len__(self):
+        return self.map_info.tile_width
+
+    def __getitem__(self, x):
+        if x < 0:
+            x += self.map_info.tile_width
+        if not 0 <= x < self.map_info.tile_width:
+            raise IndexError("Tile x coord out of range")
+        return Tile(self.map_info, x, self.y)
+
+    def __iter__(self):
+        for x in range(self.map_info.tile_width):
+            yield Tile(self.map_info, x, self.y)
+
+
+class LegacyTile:
+    """
+    Tile as pickled by saves made before tiles were views of the MapInfo
+    arrays, when every tile held its own type, seen and seeing. Only made
+    while loading those saves, which turn them into MapInfo arrays
+
+    Attributes:
+        x (int): x coord of tile
+        y (int): y coord of tile
+        type (char): the type of tile it is as a char
+        seen (bool): True if tile has been seen
+    """
+
+
+class TileArray:
+    """
+    View of MapInfo arrays as a 2D array of Tiles, for
+    code that works on single tiles
+
+    Attributes:
+        map_info (arg, MapInfo): map info to view
+    """
+    __slots__ = ('map_info',)
+
+    def __init__(self, map_info):
+        self.map_info = map_info
+
+    def __len__(self):
+        return self.map_info.tile_height
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.map_info.tile_height
+        if not 0 <= y < self.map_info.tile_height:
+            raise IndexError("Tile y coord out of range")
+        return TileRow(self.map_info, y)
+
+    def __iter__(self):
+        for y in range(self.map_info.tile_height):
+            yield TileRow(self.map_info, y)
+
+
 class MapInfo:
     """
     Load map data from map_array or generates map. Holds map arrays
 
+    Tiles are stored as flat arrays indexed by y * tile_width + x,
+    with 1 byte per tile in each array, so whole map passes can work
+    on whole arrays at once
+
     Args:
-        game (Game): game with all game data
+        map_width (int): # of tiles wide of generated map
+        map_height (int): # of tiles tall of generated map
+        floor (int): floor map is for, current floor if None
+        rng (Random): random number generator map is generated with
 
     Attribute:
         map_array (2D array): array with map representation
         self.map_tree (Tree): BSP tree of map
-        tile_array (2D array): array with tiles
+        tile_types (bytearray): type of every tile as the byte of its char
+        seen (bytearray): 1 if tile has been seen else 0
+        seeing (bytearray): 1 if tile is in player FOV else 0
         tile_width (int): # of tiles wide
         tile_height (int): # of tiles tall
         pixel_width (int): pixel_width of map in pixels
         pixel_height (int): pixel_height of map in pixels
-        unseen_tiles (set): set of unseen tiles coord tuple
+        chunks (MapChunks): chunks of map, with their unseen tile counts
+            and revisions
+        seen_log (array): flat index (y * tile_width + x) of every tile in the
+            order it was first seen. Used by renderers to only redraw newly seen tiles
+        revision (int): incremented every time a tile's type changes so
+            anything cached from tile types knows to recalculate
     """
 
-    def __init__(self):
+    def __init__(self, map_width=MAP_WIDTH, map_height=MAP_HEIGHT, floor=None, rng=random):
 
         if READ_FROM_FILE:
             # Holds the map representation (chars)
@@ -85,43 +226,149 @@ class MapInfo:
         # This is for generating random maps
         else:
             # Holds the map representation (chars)
-            map_array = [["1" for x in range(0, MAP_WIDTH)] for y in range(0, MAP_HEIGHT)]
-            self.map_tree = generate_map(map_array)
+            map_array = [["1" for x in range(0, map_width)] for y in range(0, map_height)]
+            self.map_tree = generate_map(map_array, floor, rng)
 
-        # Holds actual tiles
-        self.tile_array = make_tile_array(map_array)
+        self._init_tiles(len(map_array[0]), len(map_array), make_tile_array(map_array))
+        if self.map_tree is not None:
+            # Tiles are packed into tile_types, so generation array isn't needed
+            # anymore, like trees of loaded maps which never have one
+            self.map_tree.map_array = None
+
+    @classmethod
+    def from_arrays(cls, tile_width, tile_height, tile_types, seen, map_tree=None):
+        """
+        Makes MapInfo from already made arrays instead of generating map,
+        ie when loading a saved map
 
-        self.tile_width = len(self.tile_array[0])
-        self.tile_height = len(self.tile_array)
+        Args:
+            tile_width (int): # of tiles wide
+            tile_height (int): # of tiles tall
+            tile_types (bytearray): type of every tile as the byte of its char
+            seen (bytearray): 1 if tile has been seen else 0
+            map_tree (Tree): BSP tree of map
+
+        Returns:
+            map_info (MapInfo): map info holding arrays
+        """
+        map_info = cls.__new__(cls)
+        map_info.map_tree = map_tree
+        map_info._init_tiles(tile_width, tile_height, tile_types, seen)
+        return map_info
+
+    def _init_tiles(self, tile_width, tile_height, tile_types, seen=None):
+        """
+        Sets map size and tile arrays
+
+        Args:
+            tile_width (int): # of tiles wide
+            tile_height (int): # of tiles tall
+            tile_types (bytearray): type of every tile as the byte of its char
+            seen (bytearray): 1 if tile has been seen else 0, nothing seen if None
+        """
+        self.tile_width = tile_width
+        self.tile_height = tile_height
         self.pixel_width = self.tile_width * SPRITE_SIZE
         self.pixel_height = self.tile_height * SPRITE_SIZE
-        self.unseen_tiles = set()
 
-        for y in range(self.tile_height):
-            for x in range(self.tile_width):
-                if not self.tile_array[y][x].type == WALL:
-                    self.unseen_tiles.add((x, y))
+        # Holds actual tiles
+        self.tile_types = tile_types
+        self.seeing = bytearray(len(self.tile_types))
+        self.seen_log = array('I')
+
+        if seen is None:
+            self.seen = bytearray(len(self.tile_types))
+        else:
+            self.seen = seen
+            # Order tiles were first seen in is lost for loaded maps, which only matters to
+            # renderers that haven't drawn map yet anyway
+            index = seen.find(1)
+            while index != -1:
+                self.seen_log.append(index)
+                index = seen.find(1, index + 1)
+
+        self.chunks = map_chunks.MapChunks(self)
+        self.revision = 0
+
+    def __setstate__(self, state):
+        if "tile_array" not in state:
+            self.__dict__.update(state)
+            return
+        # Map from save made before tiles were stored in arrays, with a
+        # 2D array of LegacyTiles instead of tile_types and seen
+        tile_array = state["tile_array"]
+        tile_types = bytearray(''.join(tile.type for row in tile_array for tile in row), 'ascii')
+        seen = bytearray(1 if tile.seen else 0 for row in tile_array for tile in row)
+        self.map_tree = state["map_tree"]
+        self._init_tiles(len(tile_array[0]), len(tile_array), tile_types, seen)
+
+    @property
+    def tile_array(self):
+        """
+        Returns:
+            2D array view of tiles, ie tile_array[y][x] is Tile at (x, y)
+        """
+        return TileArray(self)
+
+    def is_wall(self, x, y):
+        """
+        Returns:
+            True if tile at (x, y) is a wall
+        """
+        return self.tile_types[y * self.tile_width + x] == WALL_CODE
+
+    def find_tiles_of_type(self, tile_type):
+        """
+        Finds every tile of tile_type
+
+        Args:
+            tile_type (char): Type of tile to find
+
+        Returns:
+            indices (List): flat index of every tile of tile_type
+        """
+        indices = []
+        code = ord(tile_type)
+        index = self.tile_types.find(code)
+        while index != -1:
+            indices.append(index)
+            index = self.tile_types.find(code, index + 1)
+        return indices
+
+    def find_tiles_not_of_type(self, tile_type):
+        """
+        Finds every tile that isn't tile_type
+
+        Args:
+            tile_type (char): Type of tile to not find
+
+        Returns:
+            indices (List): flat index of every tile not of tile_type
+        """
+        # Mark tiles of tile_type with 0 and everything else with 1
+        table = bytearray(b'\x01' * 256)
+        table[ord(tile_type)] = 0
+        mask = self.tile_types.translate(table)
+        indices = []
+        index = mask.find(1)
+        while index != -1:
+            indices.append(index)
+            index = mask.find(1, index + 1)
+        return indices
 
 
 def make_tile_array(map_array):
     """
-    Converts array filled with characters to Tiles and returns
-    array filled with Tiles
+    Converts array filled with characters to flat array of
+    tile types and returns it
 
     Args:
         map_array ([char[char]]): map to draw as background
-        tile_dict (dictionary): dictionary containing all tile sprites
 
     Returns:
-        tile_array (2D array): array with tiles
+        tile_types (bytearray): type of every tile as the byte of its char
     """
-    tile_array = []
-    for col, tiles in enumerate(map_array):
-        tile_array_row = []
-        for row, tile in enumerate(tiles):
-            tile_array_row.append(Tile(row, col, tile))
-        tile_array.append(tile_array_row)
-    return tile_array
+    return bytearray(''.join(''.join(row) for row in map_array), 'ascii')
 
 
 def load_map():
@@ -141,22 +388,26 @@ def load_map():
     return map_array
 
 
-def generate_map(map_array):
+def generate_map(map_array, floor=None, rng=random):
     """
     Generates random map and prints resulting map into console. Also draws map to surface
 
     Args:
         map_array (2D array): array with map representation
+        floor (int): floor map is for, current floor if None
+        rng (Random): random number generator map is generated with
 
     Returns:
         tree (Tree): BSP tree of map
     """
-    tree = Tree(map_array)
+    if floor is None:
+        floor = config.CURRENT_FLOOR
+    tree = Tree(map_array, rng=rng)
     tree.build_bsp()
     tree.build_rooms()
     tree.build_path()
     # tree.print_map()
-    if config.CURRENT_FLOOR < NUM_OF_FLOOR:
+    if floor < NUM_OF_FLOOR:
         tree.place_downstair()
     # print("")
     return tree
@@ -173,17 +424,10 @@ def find_closest_unseen_tile():
         p_coord ((int, int)): player's coordinate (start)
         closest_unseen_tile ((int, int)): closest unseen tile (goal)
     """
-    closest_unseen_tile = None
-    closest_distance = sys.maxsize
     p_coord = (config.PLAYER.x, config.PLAYER.y)
     # Find the closest (by literal distance, not
     # how many steps it would take) unseen tile
-    for tile in config.MAP_INFO.unseen_tiles:
-        dist = distance(p_coord, tile)
-        if closest_distance > dist:
-            closest_distance = dist
-            closest_unseen_tile = tile
-    return p_coord, closest_unseen_tile
+    return p_coord, config.MAP_INFO.chunks.closest_unseen_tile(p_coord)
 
 
 # TODO: could optimize this since it is already finding visited and so can
@@ -205,7 +449,7 @@ def find_closest_unseen_tile_walking_distance():
     closest_distance = sys.maxsize
     p_coord = (config.PLAYER.x, config.PLAYER.y)
     # Find the closest unseen tile
-    for tile in config.MAP_INFO.unseen_tiles:
+    for tile in config.MAP_INFO.chunks.unseen_tiles():
         visited = config.PATHFINDING.bfs(p_coord, tile)
         if visited:
             walking_distance = len(visited)
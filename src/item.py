@@ -3,14 +3,7 @@ from constant import *
 import config
 import game_text
 import entity_generator
-import json
-
-
-with open(os.path.join(DATA_PATH, 'item.json')) as f:
-    item_data = json.load(f)
-
-with open(os.path.join(DATA_PATH, 'equipment.json')) as f1:
-    equipment_data = json.load(f1)
+import json_data
 
 
 class EquipmentStat:
@@ -131,6 +124,7 @@ class Item:
         """
         Loads item's use data from item.json
         """
+        item_data = json_data.load('item.json')
         if self.name in item_data.keys():
             dict = item_data[self.name]
             args = tuple(dict.values())
@@ -144,6 +138,7 @@ class Item:
         Returns:
             equipment (EquipmentStat): Item's equipment stats
         """
+        equipment_data = json_data.load('equipment.json')
         if self.name in equipment_data.keys():
             data = equipment_data[self.name]
             equipment = EquipmentStat(data["strength_bonus"],
@@ -173,6 +168,7 @@ class Item:
                 entity.container.inventory.append(self.owner)
 
                 config.GAME_DATA.item_data.remove(self.owner)
+                config.GAME_DATA.item_index.remove(self.owner)
 
                 self.current_container = entity.container
 
@@ -191,6 +187,7 @@ class Item:
         self.current_container = None
         self.owner.x = entity.x
         self.owner.y = entity.y
+        config.GAME_DATA.item_index.add(self.owner)
         game_text.add_game_message_to_print(self.name + " Item Dropped", WHITE)
 
     def use_item(self):
@@ -219,7 +216,7 @@ class Item:
         Returns:
             description (String): Description of item/equipment
         """
-        description = item_data[self.name]["desc"] + "\n"
+        description = json_data.load('item.json')[self.name]["desc"] + "\n"
         if self.equip_stat:
             description += self.equip_stat.equipment_description()
 
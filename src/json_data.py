@@ -0,0 +1,20 @@
+import functools
+import json
+import os
+from constant import *
+
+
+@functools.lru_cache(maxsize=None)
+def load(file_name):
+    """
+    Loads JSON file from data folder the first time it is asked for,
+    so data files aren't read while the game starts
+
+    Args:
+        file_name (String): name of file in data folder, ie 'creature.json'
+
+    Returns:
+        data (dictionary): data in file
+    """
+    with open(os.path.join(DATA_PATH, file_name)) as file:
+        return json.load(file)
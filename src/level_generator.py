@@ -0,0 +1,137 @@
+import random
+import threading
+from constant import *
+import entity_generator
+import gamemap
+import pathfinding
+import room_graph
+
+
+class Level:
+    """
+    Fully built level that hasn't been visited yet
+
+    Attributes:
+        floor (arg, int): floor level is for
+        map_info (arg, MapInfo): map info of level
+        graph (arg, Graph): pathfinding graph of map_info
+        room_graph (arg, RoomGraph): room graph of map_info
+        player_x (arg, int): x coord player spawns at
+        player_y (arg, int): y coord player spawns at
+        enemy_list (arg, List): list of enemies on level
+        item_list (arg, List): list of items on level
+    """
+
+    def __init__(self, floor, map_info, graph, room_graph, player_x, player_y, enemy_list, item_list):
+        self.floor = floor
+        self.map_info = map_info
+        self.graph = graph
+        self.room_graph = room_graph
+        self.player_x = player_x
+        self.player_y = player_y
+        self.enemy_list = enemy_list
+        self.item_list = item_list
+
+
+def generate_level(floor, seed):
+    """
+    Generates map, pathfinding graph, room graph and entities of floor
+
+    Only uses its own random number generator seeded with seed, so it
+    doesn't touch game state and the same seed always makes the same level
+
+    Args:
+        floor (int): floor to generate
+        seed (int): seed of random number generator
+
+    Returns:
+        level (Level): generated level
+    """
+    rng = random.Random(seed)
+    map_info = gamemap.MapInfo(floor=floor, rng=rng)
+
+    graph = pathfinding.Graph()
+    graph.make_graph(map_info)
+    graph.neighbour()
+
+    level_room_graph = room_graph.RoomGraph(map_info)
+
+    tree = map_info.map_tree
+    player_x, player_y = entity_generator.generate_player_spawn(tree, rng)
+    enemy_list = entity_generator.generate_enemies(tree, (player_x, player_y), floor, rng)
+    item_list = entity_generator.generate_items(tree, rng)
+    if floor == NUM_OF_FLOOR:
+        item_list.append(entity_generator.generate_win_item(tree, rng))
+
+    return Level(floor, map_info, graph, level_room_graph, player_x, player_y, enemy_list, item_list)
+
+
+class LevelGenerator:
+    """
+    Generates the next floor on a background thread while current floor is played,
+    so going down stairs only has to swap in the finished level
+
+    Attributes:
+        floor (int): floor being generated, None if nothing is
+        seed (int): seed floor is generated with
+        level (Level): generated level, None until generation is done
+        thread (Thread): thread generating level
+    """
+
+    def __init__(self):
+        self.floor = None
+        self.seed = None
+        self.level = None
+        self.thread = None
+
+    def start(self, floor, seed):
+        """
+        Starts generating floor with seed. Does nothing if floor is
+        already being generated
+
+        Args:
+            floor (int): floor to generate
+            seed (int): seed to generate floor with
+        """
+        if floor == self.floor:
+            return
+        self.floor = floor
+        self.seed = seed
+        self.level = None
+        self.thread = threading.Thread(target=self._generate, args=(floor, seed), daemon=True)
+        self.thread.start()
+
+    def _generate(self, floor, seed):
+        """
+        Generates floor on generator thread
+        """
+        try:
+            level = generate_level(floor, seed)
+        except Exception as error:
+            # Level is made the normal way when taken instead
+            print("Failed to generate floor {} in background: {}".format(floor, error))
+            return
+        if floor == self.floor:
+            self.level = level
+
+    def take(self, floor):
+        """
+        Waits for floor to finish generating and returns it. Generator
+        is reset, so next floor can be started
+
+        Args:
+            floor (int): floor wanted
+
+        Returns:
+            level (Level): generated level, None if floor wasn't being
+                generated or generation failed
+        """
+        if floor != self.floor:
+            return None
+        self.thread.join()
+        level = self.level
+        self.floor = None
+        self.seed = None
+        self.level = None
+        self.thread = None
+        return level
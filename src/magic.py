@@ -1,5 +1,3 @@
-import json
-import os
 import game
 import draw
 import game_text
@@ -8,10 +6,7 @@ import config
 import pygame
 import particle
 import ai
-
-
-with open(os.path.join(DATA_PATH, 'magic.json')) as file:
-    data = json.load(file)
+import json_data
 
 
 def diagonal_distance(start, end):
@@ -169,6 +164,7 @@ def spell_description(spell_name):
     Returns:
         description (String): Description of spell
     """
+    data = json_data.load('magic.json')
     description = data[spell_name]["desc"] + "\n" + \
                  "cost:" + str(data[spell_name]["cost"]) + "\n" + \
                  "base damage:" + str(data[spell_name]["damage"])
@@ -184,6 +180,7 @@ def cast_fireball(caster, line):
         caster (Object): Creature that casted fireball
         line (List): List of coordinates for fireball to follow
     """
+    data = json_data.load('magic.json')
     base_damage = data["fireball"]["damage"]
     mp_cost = data["fireball"]["cost"]
 
@@ -196,24 +193,35 @@ def cast_fireball(caster, line):
     if caster.creature.stat.mp - mp_cost >= 0:
         caster.creature.stat.mp -= mp_cost
         # get list of tiles from start to end
-        enemies = []
-        for team, entity in config.GAME_DATA.creature_data.items():
-            if team != caster.creature.team:
-                enemies += entity
         creature_hit = False
         for (x, y) in line:
             if creature_hit:
                 break
             # damage first enemy in list of tile
-            for enemy in enemies:
-                if (enemy.x, enemy.y) == (x, y):
-                    caster.creature.attack(enemy, damage)
-                    creature_hit = True
-                    break
+            for enemy in _enemies_at(caster, x, y):
+                caster.creature.attack(enemy, damage)
+                creature_hit = True
+                break
 
             _update_spell(particle_group)
 
 
+def _enemies_at(caster, x, y):
+    """
+    Returns creatures at (x, y) that aren't on caster's team
+
+    Args:
+        caster (Object): Creature that casted spell
+        x (int): x coord of tile
+        y (int): y coord of tile
+
+    Returns:
+        enemies (List): List of enemies of caster at (x, y)
+    """
+    return [entity for entity in config.GAME_DATA.creature_index.at(x, y)
+            if entity.creature.team != caster.creature.team]
+
+
 def _update_spell(particle_group):
     """
     Updates the spell casted
@@ -222,6 +230,8 @@ def _update_spell(particle_group):
         particle_group (List): List of particles
     """
     game.update_game()
+    if HEADLESS:
+        return
     for magic in particle_group:
         draw.draw_at_camera_offset_with_image(magic)
         magic.update()
@@ -238,6 +248,7 @@ def cast_lightning(caster, line):
         caster (Object): Creature that casted lightning
         line (List): List of coordinates for lightning to follow
     """
+    data = json_data.load('magic.json')
     base_damage = data["lightning"]["damage"]
     mp_cost = data["lightning"]["cost"]
 
@@ -250,14 +261,9 @@ def cast_lightning(caster, line):
     if caster.creature.stat.mp - mp_cost >= 0:
         caster.creature.stat.mp -= mp_cost
         # get list of tiles from start to end
-        enemies = []
-        for team, entity in config.GAME_DATA.creature_data.items():
-            if team != caster.creature.team:
-                enemies += entity
         for (x, y) in line:
-            for enemy in enemies:
-                if (enemy.x, enemy.y) == (x, y):
-                    caster.creature.attack(enemy, damage)
+            for enemy in _enemies_at(caster, x, y):
+                caster.creature.attack(enemy, damage)
 
             _update_spell(particle_group)
 
@@ -270,6 +276,7 @@ def cast_confusion(caster, line):
         caster (Object): Creature that casted confusion
         line (List): List of coordinates for confusion to follow
     """
+    data = json_data.load('magic.json')
     base_damage = data["confusion"]["damage"]
     mp_cost = data["confusion"]["cost"]
 
@@ -283,26 +290,21 @@ def cast_confusion(caster, line):
     if caster.creature.stat.mp - mp_cost >= 0:
         caster.creature.stat.mp -= mp_cost
         # get list of tiles from start to end
-        enemies = []
-        for team, entity in config.GAME_DATA.creature_data.items():
-            if team != caster.creature.team:
-                enemies += entity
         creature_hit = False
         for (x, y) in line:
             if creature_hit:
                 break
             # hit first enemy in list of tile
-            for enemy in enemies:
-                if (enemy.x, enemy.y) == (x, y):
-                    # TODO: could change constructor to take in owner for
-                    #       confuseai if decide that creatures are only confused
-                    #       from magic
-                    confuseAI = ai.ConfuseAI(enemy.ai, turn_count)
-                    confuseAI.owner = enemy
-                    enemy.ai = confuseAI
-                    creature_hit = True
-                    game_text.add_game_message_to_print(enemy.object_name + " is confused!", BLUE)
-                    break
+            for enemy in _enemies_at(caster, x, y):
+                # TODO: could change constructor to take in owner for
+                #       confuseai if decide that creatures are only confused
+                #       from magic
+                confuseAI = ai.ConfuseAI(enemy.ai, turn_count)
+                confuseAI.owner = enemy
+                enemy.ai = confuseAI
+                creature_hit = True
+                game_text.add_game_message_to_print(enemy.object_name + " is confused!", BLUE)
+                break
 
             _update_spell(particle_group)
 
@@ -1,3 +1,10 @@
+import sys
+import startup
+
+# Has to be turned on before game modules are imported to time them
+if "--startup-report" in sys.argv:
+    startup.enable()
+
 import pstats, io
 import cProfile
 import pygame
@@ -24,14 +31,15 @@ def profile(fnc):
 
 @profile
 def start():
-    # Pygame screen
-    pygame.init()
+    # Pygame screen, pygame is initialized by config
     pygame.display.set_caption("Treasure Quest")
     pygame.display.set_icon(config.SPRITE.entity_dict["sword"])
 
     # Repeat keys when held down
     pygame.key.set_repeat(350, 75)
 
+    startup.report()
+
     menu.main_menu()
 
 start()
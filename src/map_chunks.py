@@ -0,0 +1,235 @@
+import sys
+from array import array
+from constant import *
+import pathfinding
+
+# Translation table mapping tile type bytes to 0 for walls and 1 for anything else
+_NOT_WALL = bytes(0 if code == ord(WALL) else 1 for code in range(256))
+
+
+class MapChunks:
+    """
+    Splits a map into chunks of MAP_CHUNK_SIZE x MAP_CHUNK_SIZE tiles and
+    keeps track of every chunk, so big maps can be searched, redrawn and
+    saved a chunk at a time instead of a tile at a time
+
+    Every chunk has a revision, incremented whenever a tile in it changes
+    type, seen or seeing. Anything made from a chunk keeps the revision it
+    was made with and only remakes the chunks whose revision changed.
+    Every chunk also has a save revision, only incremented when a tile in
+    it changes type or seen, since seeing isn't saved.
+    Every chunk also counts its unseen tiles, so chunks with nothing left
+    to explore are skipped without looking at their tiles
+
+    Args:
+        map_info (MapInfo): map info of map, with tile_types and seen set
+
+    Attributes:
+        map_info (arg, MapInfo): map info of map
+        width (int): # of chunks wide
+        height (int): # of chunks tall
+        revisions (array): revision of every chunk by chunk index (chunk_y * width + chunk_x)
+        save_revisions (array): save revision of every chunk by chunk index
+        unseen (array): # of unseen tiles that aren't walls of every chunk by chunk index
+        unseen_count (int): # of unseen tiles that aren't walls on map
+    """
+
+    def __init__(self, map_info):
+        self.map_info = map_info
+        self.width = -(-map_info.tile_width // MAP_CHUNK_SIZE)
+        self.height = -(-map_info.tile_height // MAP_CHUNK_SIZE)
+        self.revisions = array('I', [0]) * (self.width * self.height)
+        self.save_revisions = array('I', [0]) * (self.width * self.height)
+        self.unseen = array('I', [0]) * (self.width * self.height)
+        self.unseen_count = 0
+        self.count_unseen()
+
+    def __len__(self):
+        return self.width * self.height
+
+    def chunk_of(self, index):
+        """
+        Returns chunk index of chunk tile is in
+
+        Args:
+            index (int): flat index of tile (y * tile_width + x)
+        """
+        y, x = divmod(index, self.map_info.tile_width)
+        return (y // MAP_CHUNK_SIZE) * self.width + x // MAP_CHUNK_SIZE
+
+    def tile_range(self, chunk):
+        """
+        Returns tiles in chunk
+
+        Args:
+            chunk (int): chunk index of chunk
+
+        Returns:
+            x_start (int): x coord of leftmost tile in chunk
+            y_start (int): y coord of top tile in chunk
+            x_end (int): x coord after rightmost tile in chunk
+            y_end (int): y coord after bottom tile in chunk
+        """
+        return chunk_tile_range(chunk, MAP_CHUNK_SIZE, self.map_info.tile_width, self.map_info.tile_height)
+
+    def touch(self, index):
+        """
+        Marks chunk tile is in as changed, ie when tile changes seeing
+
+        Args:
+            index (int): flat index of tile that changed
+        """
+        self.revisions[self.chunk_of(index)] += 1
+
+    def touch_all(self):
+        """
+        Marks every chunk as changed, ie after a whole map pass of seeing.
+        Save revisions aren't changed
+        """
+        self.revisions = array('I', (revision + 1 for revision in self.revisions))
+
+    def is_unseen(self, index):
+        """
+        Returns True if tile is unseen and isn't a wall, ie counted in unseen counts
+
+        Args:
+            index (int): flat index of tile
+        """
+        return not self.map_info.seen[index] and self.map_info.tile_types[index] != ord(WALL)
+
+    def change_tile(self, index, was_unseen):
+        """
+        Marks chunk of a tile whose type or seen just changed as changed
+        and needing to be saved again, and puts the tile on or takes it off
+        unseen counts if it started or stopped counting
+
+        Args:
+            index (int): flat index of tile that changed
+            was_unseen (Boolean): is_unseen of tile before it changed
+        """
+        chunk = self.chunk_of(index)
+        self.revisions[chunk] += 1
+        self.save_revisions[chunk] += 1
+        change = self.is_unseen(index) - was_unseen
+        self.unseen[chunk] += change
+        self.unseen_count += change
+
+    def see(self, index):
+        """
+        Marks chunk of a tile that was just seen as changed and needing to be
+        saved again and takes the tile off unseen counts if it isn't a wall
+
+        Args:
+            index (int): flat index of tile that was just seen
+        """
+        chunk = self.chunk_of(index)
+        self.revisions[chunk] += 1
+        self.save_revisions[chunk] += 1
+        if self.map_info.tile_types[index] != ord(WALL):
+            self.unseen[chunk] -= 1
+            self.unseen_count -= 1
+
+    def count_unseen(self, chunk=None):
+        """
+        Counts unseen tiles of chunk from the map arrays
+
+        Args:
+            chunk (int): chunk index of chunk to count, every chunk if None
+        """
+        map_info = self.map_info
+        tile_width = map_info.tile_width
+        chunks = range(len(self)) if chunk is None else (chunk,)
+        # Rows of the chunks, so only they have to be masked
+        start = self.tile_range(chunks[0])[1] * tile_width
+        end = self.tile_range(chunks[-1])[3] * tile_width
+        # 1 for tiles that aren't walls and haven't been seen
+        unseen_bits = int.from_bytes(map_info.tile_types[start:end].translate(_NOT_WALL), 'little') \
+            & ~int.from_bytes(map_info.seen[start:end], 'little')
+        unseen = unseen_bits.to_bytes(end - start, 'little')
+        for chunk in chunks:
+            x_start, y_start, x_end, y_end = self.tile_range(chunk)
+            count = sum(unseen.count(1, y * tile_width + x_start - start, y * tile_width + x_end - start)
+                        for y in range(y_start, y_end))
+            self.unseen_count += count - self.unseen[chunk]
+            self.unseen[chunk] = count
+
+    def unseen_tiles(self, chunk=None):
+        """
+        Yields coord of every unseen tile that isn't a wall, only looking
+        in chunks that have unseen tiles
+
+        Args:
+            chunk (int): chunk index of chunk to look in, every chunk if None
+
+        Yields:
+            coord ((int, int)): coord of unseen tile
+        """
+        map_info = self.map_info
+        wall_code = ord(WALL)
+        chunks = range(len(self)) if chunk is None else (chunk,)
+        for chunk in chunks:
+            if not self.unseen[chunk]:
+                continue
+            x_start, y_start, x_end, y_end = self.tile_range(chunk)
+            for y in range(y_start, y_end):
+                row_start = y * map_info.tile_width
+                for x in range(x_start, x_end):
+                    if not map_info.seen[row_start + x] and map_info.tile_types[row_start + x] != wall_code:
+                        yield x, y
+
+    def closest_unseen_tile(self, coord):
+        """
+        Returns unseen tile that isn't a wall closest to coord by distance
+
+        Chunks are looked in from closest to furthest, stopping once no
+        tile in the next chunk could be closer than the closest found
+
+        Args:
+            coord ((int, int)): coord to find closest unseen tile to
+
+        Returns:
+            closest_unseen_tile ((int, int)): closest unseen tile, None if
+                every tile has been seen
+        """
+        x, y = coord
+        candidates = []
+        for chunk in range(len(self)):
+            if self.unseen[chunk]:
+                x_start, y_start, x_end, y_end = self.tile_range(chunk)
+                nearest = (min(max(x, x_start), x_end - 1), min(max(y, y_start), y_end - 1))
+                candidates.append((pathfinding.distance(coord, nearest), chunk))
+        candidates.sort()
+
+        closest_unseen_tile = None
+        closest_distance = sys.maxsize
+        for chunk_distance, chunk in candidates:
+            if chunk_distance >= closest_distance:
+                break
+            for tile in self.unseen_tiles(chunk):
+                dist = pathfinding.distance(coord, tile)
+                if closest_distance > dist:
+                    closest_distance = dist
+                    closest_unseen_tile = tile
+        return closest_unseen_tile
+
+
+def chunk_tile_range(chunk, chunk_size, tile_width, tile_height):
+    """
+    Returns tiles in chunk of a map split into chunks of chunk_size x chunk_size tiles
+
+    Args:
+        chunk (int): chunk index of chunk
+        chunk_size (int): width/height in tiles of chunks
+        tile_width (int): # of tiles wide of map
+        tile_height (int): # of tiles tall of map
+
+    Returns:
+        x_start (int): x coord of leftmost tile in chunk
+        y_start (int): y coord of top tile in chunk
+        x_end (int): x coord after rightmost tile in chunk
+        y_end (int): y coord after bottom tile in chunk
+    """
+    chunk_y, chunk_x = divmod(chunk, -(-tile_width // chunk_size))
+    x_start = chunk_x * chunk_size
+    y_start = chunk_y * chunk_size
+    return x_start, y_start, min(x_start + chunk_size, tile_width), min(y_start + chunk_size, tile_height)
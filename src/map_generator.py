@@ -200,11 +200,12 @@ class Tree:
         sub_dungeon_height (int, arg): the min height of each sub dungeon
         dist_from_sister_node_min (int, arg): min distance a room should be from it's sister room or edge
         dist_from_sister_node_max (int, arg): max distance a room should be from it's sister room or edge
+        rng (arg, Random): random number generator map is generated with
     """
 
     def __init__(self, map_array, sub_dungeon_width=SUB_DUNGEON_WIDTH, sub_dungeon_height=SUB_DUNGEON_HEIGHT,
                  dist_from_sister_node_min=DIST_FROM_SISTER_NODE_MIN,
-                 dist_from_sister_node_max=DIST_FROM_SISTER_NODE_MAX):
+                 dist_from_sister_node_max=DIST_FROM_SISTER_NODE_MAX, rng=random):
         y_len = len(map_array)
         x_len = len(map_array[0])
         self.root = Node((0, 0), (x_len - 1, y_len - 1))
@@ -213,6 +214,47 @@ class Tree:
         self.sub_dungeon_height = sub_dungeon_height
         self.dist_from_sister_node_min = dist_from_sister_node_min
         self.dist_from_sister_node_max = dist_from_sister_node_max
+        self.rng = rng
+
+    def __getstate__(self):
+        # random module can't be pickled, so it is used again when loaded
+        state = self.__dict__.copy()
+        if state["rng"] is random:
+            state["rng"] = None
+        return state
+
+    def __setstate__(self, state):
+        if state.get("rng") is None:
+            state["rng"] = random
+        self.__dict__.update(state)
+
+    @classmethod
+    def from_rooms(cls, tile_width, tile_height, rooms, paths):
+        """
+        Makes tree of an already built map that only holds its rooms and paths,
+        ie when loading a saved map
+
+        Args:
+            tile_width (int): # of tiles wide of map
+            tile_height (int): # of tiles tall of map
+            rooms (List): coords (x1, y1, x2, y2) of every room
+            paths (List): coords (x1, y1, x2, y2) of every path
+
+        Returns:
+            tree (Tree): tree with rooms and paths in root
+        """
+        tree = cls.__new__(cls)
+        tree.__setstate__({
+            "root": Node((0, 0), (tile_width - 1, tile_height - 1)),
+            "map_array": None,
+            "sub_dungeon_width": SUB_DUNGEON_WIDTH,
+            "sub_dungeon_height": SUB_DUNGEON_HEIGHT,
+            "dist_from_sister_node_min": DIST_FROM_SISTER_NODE_MIN,
+            "dist_from_sister_node_max": DIST_FROM_SISTER_NODE_MAX,
+        })
+        tree.root.child_room_list = [Room((x1, y1), (x2, y2)) for x1, y1, x2, y2 in rooms]
+        tree.root.path_list = [Room((x1, y1), (x2, y2)) for x1, y1, x2, y2 in paths]
+        return tree
 
     def build_bsp(self):
         """
@@ -245,7 +287,7 @@ class Tree:
         elif node.down_right_x - node.up_left_x < 2 * self.sub_dungeon_width:
             self._split_horizontal(node)
         else:
-            hor = random.randint(0, 1)
+            hor = self.rng.randint(0, 1)
             if hor == 0:
                 self._split_horizontal(node)
             else:
@@ -258,7 +300,7 @@ class Tree:
         Args:
             node (Node): node to split horizontally
         """
-        split_y = random.randint(node.up_left_y + self.sub_dungeon_height,
+        split_y = self.rng.randint(node.up_left_y + self.sub_dungeon_height,
                                  node.down_right_y - self.sub_dungeon_height)
 
         node.left_child = Node((node.up_left_x, node.up_left_y), (node.down_right_x, split_y))
@@ -275,7 +317,7 @@ class Tree:
         Args:
             node (Node): node to split vertically
         """
-        split_x = random.randint(node.up_left_x + self.sub_dungeon_width, node.down_right_x - self.sub_dungeon_width)
+        split_x = self.rng.randint(node.up_left_x + self.sub_dungeon_width, node.down_right_x - self.sub_dungeon_width)
 
         node.left_child = Node((node.up_left_x, node.up_left_y), (split_x, node.down_right_y))
         node.right_child = Node((split_x, node.up_left_y), (node.down_right_x, node.down_right_y))
@@ -332,10 +374,10 @@ class Tree:
         Args:
             node (Node): node to make room in
         """
-        ul_x = random.randint(self.dist_from_sister_node_min, self.dist_from_sister_node_max)
-        ul_y = random.randint(self.dist_from_sister_node_min, self.dist_from_sister_node_max)
-        lr_x = random.randint(self.dist_from_sister_node_min, self.dist_from_sister_node_max)
-        lr_y = random.randint(self.dist_from_sister_node_min, self.dist_from_sister_node_max)
+        ul_x = self.rng.randint(self.dist_from_sister_node_min, self.dist_from_sister_node_max)
+        ul_y = self.rng.randint(self.dist_from_sister_node_min, self.dist_from_sister_node_max)
+        lr_x = self.rng.randint(self.dist_from_sister_node_min, self.dist_from_sister_node_max)
+        lr_y = self.rng.randint(self.dist_from_sister_node_min, self.dist_from_sister_node_max)
 
         up_left = (node.up_left_x + ul_x, node.up_left_y + ul_y)
         down_right = (node.down_right_x - lr_x, node.down_right_y - lr_y)
@@ -417,7 +459,7 @@ class Tree:
         #       it isn't 
         path_min_y, path_max_y = find_common_y_between_rooms(left_room, right_room)
 
-        path_y = random.randint(path_min_y, path_max_y)
+        path_y = self.rng.randint(path_min_y, path_max_y)
 
         path_ul = (left_room.down_right_x + 1, path_y)
         path_lr = (right_room.up_left_x - 1, path_y)
@@ -457,7 +499,7 @@ class Tree:
         #       it isn't 
         path_min_x, path_max_x = find_common_x_between_rooms(left_room, right_room)
 
-        path_x = random.randint(path_min_x, path_max_x)
+        path_x = self.rng.randint(path_min_x, path_max_x)
 
         path_ul = (path_x, left_room.down_right_y + 1)
         path_lr = (path_x, right_room.up_left_y - 1)
@@ -737,10 +779,10 @@ class Tree:
         """
         Randomly places downstairs in one of the rooms
         """
-        room = random.choice(self.root.child_room_list)
+        room = self.rng.choice(self.root.child_room_list)
         x1, y1, x2, y2 = room.coords
-        x = random.randint(x1, x2)
-        y = random.randint(y1, y2)
+        x = self.rng.randint(x1, x2)
+        y = self.rng.randint(y1, y2)
         self.map_array[y][x] = DOWNSTAIR
 
     def print_tree(self):
@@ -787,7 +829,7 @@ class Tree:
         Args:
             node (Node): node to make room in
         """
-        ran = random.randint(0, 1)
+        ran = self.rng.randint(0, 1)
         if ran == 0:
             up_left = node.left_child.room.up_left
             down_right = node.left_child.room.down_right
@@ -806,7 +848,7 @@ class Tree:
         Args:
             node (Node): node to make room in
         """
-        room = random.choice(node.child_room_list)
+        room = self.rng.choice(node.child_room_list)
 
         new_room = room
         node.room = new_room
@@ -895,7 +937,7 @@ class Tree:
             path_min_x (int): minimun x coordinate that the path must be
             path_max_x (int): maximum x coordinate that the path must be
         """
-        path_x = random.randint(path_min_x, path_max_x)
+        path_x = self.rng.randint(path_min_x, path_max_x)
 
         path_ul = (path_x, node.left_child.room.down_right_y + 1)
         path_lr = (path_x, node.right_child.room.up_left_y - 1)
@@ -911,7 +953,7 @@ class Tree:
             path_min_y (int): minimun y coordinate that the path must be
             path_max_y (int): maximum y coordinate that the path must be
         """
-        path_y = random.randint(path_min_y, path_max_y)
+        path_y = self.rng.randint(path_min_y, path_max_y)
 
         path_ul = (node.left_child.room.down_right_x + 1, path_y)
         path_lr = (node.right_child.room.up_left_x - 1, path_y)
@@ -930,15 +972,15 @@ class Tree:
         right_child_up_x, right_child_up_y, right_child_down_x, right_child_down_y = right_child.room.coords
 
         # x coord of path connecting the left room
-        left_x = random.randint(left_child_up_x, left_child_down_x)
+        left_x = self.rng.randint(left_child_up_x, left_child_down_x)
         # x coord of path connecting the right room
-        right_x = random.randint(right_child_up_x, right_child_down_x)
+        right_x = self.rng.randint(right_child_up_x, right_child_down_x)
 
         diff_y = right_child_up_y - left_child_down_y
 
         # make sure that the path has atleast one square sticking straigh 
         # out from children before zigzagging
-        left_y = random.randint(2, diff_y - 2)
+        left_y = self.rng.randint(2, diff_y - 2)
         right_y = diff_y - left_y
 
         low = min(left_x, right_x)
@@ -971,15 +1013,15 @@ class Tree:
         right_child_up_x, right_child_up_y, right_child_down_x, right_child_down_y = right_child.room.coords
 
         # y coord of path connecting the left room
-        left_y = random.randint(left_child_up_y, left_child_down_y)
+        left_y = self.rng.randint(left_child_up_y, left_child_down_y)
         # y coord of path connecting the right room
-        right_y = random.randint(right_child_up_y, right_child_down_y)
+        right_y = self.rng.randint(right_child_up_y, right_child_down_y)
 
         diff_x = right_child_up_x - left_child_down_x
 
         # make sure that the path has atleast one square sticking straigh 
         # out from children before zigzagging
-        left_x = random.randint(2, diff_x - 2)
+        left_x = self.rng.randint(2, diff_x - 2)
         right_x = diff_x - left_x
 
         low = min(left_y, right_y)
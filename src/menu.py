@@ -7,6 +7,7 @@ import config
 import draw
 import game
 import game_text
+import perf
 import magic
 import buttonmanager
 
@@ -438,26 +439,111 @@ def _draw_stat(player, surface, character_icon):
     surface.blit(character_icon, (0, 0))
 
 
+class InventoryScreens:
+    """
+    Inventory and equipment screens of inventory menu, kept between frames
+    and only rebuilt when player's inventory or equipment changes
+
+    Attributes:
+        key (tuple): player, inventory and equipment the screens were built for
+        equipment (ButtonManager): equipment screen
+        inventory (GridButtonManager): inventory screen
+    """
+
+    def __init__(self):
+        self.key = None
+        self.equipment = None
+        self.inventory = None
+
+    def update(self):
+        """
+        Rebuilds screens if player's inventory or equipment changed
+
+        Returns:
+            True if screens were rebuilt
+        """
+        key = _inventory_key(config.PLAYER)
+        if key == self.key:
+            return False
+        self.key = key
+        self.equipment = _load_equipment_screen()
+        self.inventory = _load_inventory_screen()
+        return True
+
+    def draw(self, surface):
+        """
+        Draws both screens
+
+        Args:
+            surface (Surface): Surface to draw on
+        """
+        self.equipment.draw_buttons(surface)
+        self.inventory.draw_buttons(surface)
+
+
+# Screens of inventory menu, kept so reopening menu doesn't rebuild them
+_inventory_screens = InventoryScreens()
+
+
+def _inventory_key(player):
+    """
+    Returns key that changes whenever anything shown on inventory
+    or equipment screens changes
+
+    Args:
+        player (Entity): player whose inventory is shown
+
+    Returns:
+        key (tuple): player, inventory items and equipped items
+    """
+    # Entities themselves are kept in key rather than their ids, so a freed
+    # entity's id can't be reused by a new one and match a stale key
+    inventory_key = tuple((item_entity, bool(item_entity.item.equip_stat and
+                                             item_entity.item.equip_stat.equipped))
+                          for item_entity in player.container.inventory)
+    equipment_key = tuple(player.creature.equip_slot.values())
+    return player, inventory_key, equipment_key
+
+
 def inventory_menu():
     """
     create screens for inventory + equipment menus
+
+    Game underneath and both screens are drawn into a cached frame, which is
+    only redrawn after input, while particles are moving, when inventory or
+    equipment changed or a message was added, so other frames only blit it and
+    the hover description. Frame is redrawn every frame while performance HUD
+    is on, so its timings keep updating
     """
     menu_closed = False
     menu_width, menu_height = config.CAMERA.camera_width / 2, config.CAMERA.camera_height
     menu_surface = pygame.Surface((menu_width, menu_height - SPRITE_SIZE))
     menu_surface.fill(INVENTORY_BEIGE)
 
+    screens = _inventory_screens
+    frame = None
+    # True if frame was drawn with particles, which keep moving until they are gone
+    particles_drawn = False
+    # Number of messages ever added when frame was drawn
+    messages_drawn = 0
+
     while not menu_closed:
         events_list = pygame.event.get()
-        game.update_game()
 
-        config.SURFACE_MAIN.blit(menu_surface, (menu_width, 0))
-
-        equipment = _load_equipment_screen()
-        equipment.draw_buttons(config.SURFACE_MAIN)
+        screens_changed = screens.update()
+        messages_changed = config.GAME_DATA.game_messages.total != messages_drawn
+        if frame is None or screens_changed or particles_drawn or messages_changed or perf.ENABLED:
+            particles_drawn = bool(config.PARTICLE_LIST)
+            messages_drawn = config.GAME_DATA.game_messages.total
+            game.update_game()
+            config.SURFACE_MAIN.blit(menu_surface, (menu_width, 0))
+            screens.draw(config.SURFACE_MAIN)
+            frame = config.SURFACE_MAIN.copy()
+        else:
+            config.SURFACE_MAIN.blit(frame, (0, 0))
 
-        inventory = _load_inventory_screen()
-        inventory.draw_buttons(config.SURFACE_MAIN)
+        equipment = screens.equipment
+        inventory = screens.inventory
 
         draw.draw_mouse()
 
@@ -476,6 +562,10 @@ def inventory_menu():
                 pygame.quit()
                 sys.exit()
 
+            if event.type == pygame.MOUSEBUTTONDOWN or event.type == pygame.KEYDOWN:
+                # Input can change game underneath, ie messages or minimap
+                frame = None
+
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     inventory_button = config.BUTTON_PANEL.check_if_specific_button_pressed(
@@ -0,0 +1,200 @@
+import collections
+import itertools
+import json
+import os
+import uuid
+from constant import *
+
+# Bytes read at a time when reading log file from the end
+_READ_BLOCK_SIZE = 8192
+
+
+class MessageLog:
+    """
+    Log of game messages keeping only the newest messages in memory
+
+    Messages pushed out of memory are appended to a log file on disk, which
+    is rotated to path + ".1" once it is bigger than MESSAGE_LOG_MAX_BYTES,
+    so memory, save size and disk use stay the same however long the game is.
+    Every message is flushed as it is written, so a crash only loses messages
+    still in memory. Log file is read from the end, a block at a time, so
+    scrolling back only reads as far back as is shown.
+
+    Every log made or loaded is a new session, with its own id written on
+    every line it appends, so logs of earlier sessions (ie before a load or
+    new game) are kept in the file but not shown in this one's scrollback,
+    since a loaded save or new game isn't the game that wrote them
+
+    Args:
+        size (int): max number of messages kept in memory
+        path (String): path of log file
+
+    Attributes:
+        messages (deque): newest (message, colour) tuples, oldest first
+        path (arg, String): path of log file
+        total (int): number of messages ever added
+        session (String): id of this session of the log, written on every line it appends
+        file (File): log file opened for appending, None until a message is pushed out
+    """
+
+    def __init__(self, size=MESSAGE_LOG_SIZE, path=MESSAGE_LOG_PATH):
+        self.messages = collections.deque(maxlen=size)
+        self.path = path
+        self.total = 0
+        self.session = uuid.uuid4().hex
+        self.file = None
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def __getstate__(self):
+        # Only messages in memory are saved, file belongs to this session
+        return {"messages": list(self.messages), "size": self.messages.maxlen,
+                "path": self.path, "total": self.total}
+
+    def __setstate__(self, state):
+        self.messages = collections.deque(state["messages"], maxlen=state["size"])
+        self.path = state["path"]
+        self.total = state["total"]
+        self.session = uuid.uuid4().hex
+        self.file = None
+
+    @classmethod
+    def from_list(cls, message_list):
+        """
+        Makes log from list of messages, ie from saves made before
+        messages were kept in a log
+
+        Args:
+            message_list (List): (message, colour) tuples, oldest first
+
+        Returns:
+            message_log (MessageLog): log with newest messages of message_list
+        """
+        message_log = cls()
+        for message in message_list:
+            message_log.append(message)
+        return message_log
+
+    def append(self, message):
+        """
+        Adds message, writing oldest message to log file if memory is full
+
+        Args:
+            message (tuple): (message, colour) to add
+        """
+        if len(self.messages) == self.messages.maxlen:
+            self._write(self.messages[0])
+        self.messages.append(message)
+        self.total += 1
+
+    def recent(self, count):
+        """
+        Returns newest count messages in memory
+
+        Args:
+            count (int): number of messages to return
+
+        Returns:
+            messages (List): newest (message, colour) tuples, oldest first
+        """
+        count = min(count, len(self.messages))
+        recent = list(itertools.islice(reversed(self.messages), count))
+        recent.reverse()
+        return recent
+
+    def scrollback(self, offset, count):
+        """
+        Returns count messages ending offset messages before newest message,
+        reading messages from log file if they are no longer in memory
+
+        Args:
+            offset (int): number of newest messages to skip
+            count (int): number of messages to return
+
+        Returns:
+            messages (List): (message, colour) tuples, oldest first. Shorter
+                than count if history runs out
+        """
+        window = list(itertools.islice(self.history(), offset, offset + count))
+        window.reverse()
+        return window
+
+    def history(self):
+        """
+        Yields every message still kept, newest first. Log files are only
+        read once messages in memory run out, and only back to where this
+        session started writing
+
+        Yields:
+            message (tuple): (message, colour)
+        """
+        yield from reversed(self.messages)
+        if self.file is None:
+            return
+        for path in (self.path, self.path + ".1"):
+            for line in _reversed_lines(path):
+                record = json.loads(line)
+                if record[0] != self.session:
+                    # Line of another session
+                    continue
+                if len(record) == 1:
+                    # Start of this session
+                    return
+                yield record[1], tuple(record[2])
+
+    def _write(self, message):
+        """
+        Appends message to log file, rotating it if it is too big. A
+        session start line is written before first message
+
+        Args:
+            message (tuple): (message, colour) to write
+        """
+        if self.file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.file = open(self.path, 'a')
+            self.file.write(json.dumps([self.session]) + "\n")
+        elif self.file.tell() >= MESSAGE_LOG_MAX_BYTES:
+            self.file.close()
+            os.replace(self.path, self.path + ".1")
+            self.file = open(self.path, 'a')
+
+        text, colour = message
+        self.file.write(json.dumps([self.session, text, list(colour)]) + "\n")
+        self.file.flush()
+
+
+def _reversed_lines(path):
+    """
+    Yields lines of file from last to first, reading file
+    from the end a block at a time
+
+    Args:
+        path (String): path of file, nothing is yielded if it doesn't exist
+
+    Yields:
+        line (bytes): line without its newline
+    """
+    try:
+        file = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    with file:
+        position = file.seek(0, os.SEEK_END)
+        # Start of line cut off by start of last block read
+        partial = b""
+        while position > 0:
+            read_size = min(_READ_BLOCK_SIZE, position)
+            position -= read_size
+            file.seek(position)
+            lines = (file.read(read_size) + partial).split(b"\n")
+            partial = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line
+        if partial:
+            yield partial
@@ -1,80 +1,113 @@
 from constant import *
 import config
-import gamemap
+import perf
 
 
-def _draw_unseen_tile_generated_map(unseen_tile_list, scale_factor_x, scale_factor_y):
+class MinimapLayer:
     """
-    Draws unseen tiles as black
-
-    Args:
-        unseen_tile_list (list): unseen tile list to draw on minimap
-        scale_factor_x (int): what to scale x by
-        scale_factor_y (int): what to scale y by
-    """
-    for tile in unseen_tile_list:
-        tile_x, tile_y = tile
-        pygame.draw.rect(config.SURFACE_MAIN, BLACK,
-                         ((tile_x * SPRITE_SIZE / scale_factor_x),
-                          (tile_y * SPRITE_SIZE / scale_factor_y),
-                          # + 2 is to make black cover everything since
-                          # add +1 twice for player and room
-                          (SPRITE_SIZE / scale_factor_x + 2),
-                          (SPRITE_SIZE / scale_factor_y + 2)))
+    Cached minimap of a level with one pixel per tile
 
-
-def _draw_minimap_rooms_generated_map(room_list, scale_factor_x, scale_factor_y):
-    """
-    Draws rooms (and paths since paths are considered rooms)
-    onto minimap as white
+    Seen floor is white, seen stairs are brown and walls and unseen
+    tiles are black. Pixels are only drawn when tiles are first seen,
+    found from map_info.seen_log, so the layer costs nothing on turns
+    where nothing new is seen
 
     Args:
-        room_list (list): Room of list to draw on minimap
-        scale_factor_x (int): what to scale x by
-        scale_factor_y (int): what to sclae y by
-    """
-    for room in room_list:
-        pygame.draw.rect(config.SURFACE_MAIN, WHITE,
-                         ((room.up_left_x * SPRITE_SIZE / scale_factor_x),
-                          (room.up_left_y * SPRITE_SIZE / scale_factor_y),
-                          # + 1 is to make paths directly touch room
-                          # without making too big of difference in size
-                          (room.width * SPRITE_SIZE / scale_factor_x + 1),
-                          (room.height * SPRITE_SIZE / scale_factor_y + 1)))
-
-
-def _draw_minimap_walls_generated_map(map_info, scale_factor_x, scale_factor_y):
-    """
-    Draws wall onto minimap as black
+        map_info (MapInfo): map info of level the layer is for
+
+    Attributes:
+        map_info (arg, MapInfo): map info of level the layer is for
+        revision (int): map_info.revision the layer was drawn with
+        surface (Surface): minimap with one pixel per tile
+        seen_count (int): number of tiles in map_info.seen_log already drawn
+        frame (Surface): surface with dynamic overlay on top, redrawn every frame
+        scaled (Surface): frame scaled to minimap size, remade if minimap size changes
+    """
+
+    def __init__(self, map_info):
+        self.map_info = map_info
+        self.revision = map_info.revision
+        self.surface = pygame.Surface((map_info.tile_width, map_info.tile_height))
+        self.surface.fill(BLACK)
+        self.seen_count = 0
+        self.frame = self.surface.copy()
+        self.scaled = None
+
+    def update(self):
+        """
+        Draws tiles seen since last update onto surface
+        """
+        seen_log = self.map_info.seen_log
+        tile_width = self.map_info.tile_width
+        tile_types = self.map_info.tile_types
+        for index in seen_log[self.seen_count:]:
+            colour = _TILE_COLOURS.get(tile_types[index], WHITE)
+            if colour:
+                y, x = divmod(index, tile_width)
+                self.surface.fill(colour, (x, y, 1, 1))
+        self.seen_count = len(seen_log)
+
+    def draw(self, surface, width, height):
+        """
+        Draws layer with seen items, enemies in FOV and player on top,
+        scaled to width x height onto topleft of surface
+
+        Args:
+            surface (Surface): Surface to draw on
+            width (int): width of minimap in pixels
+            height (int): height of minimap in pixels
+        """
+        self.frame.blit(self.surface, (0, 0))
+        _draw_minimap_items(self.frame, self.map_info, config.GAME_DATA.item_data)
+        _draw_minimap_enemies_in_fov(self.frame, config.GAME_DATA.creature_data["enemy"])
+        _draw_minimap_player(self.frame, config.PLAYER)
+
+        if self.scaled is None or self.scaled.get_size() != (width, height):
+            self.scaled = pygame.Surface((width, height))
+        pygame.transform.scale(self.frame, (width, height), self.scaled)
+        surface.blit(self.scaled, (0, 0))
+        perf.count("blits")
+
+
+# Colour of tiles on minimap once seen. Tiles not in here are white,
+# tiles with colour None (walls) stay black
+_TILE_COLOURS = {
+    ord(WALL): None,
+    ord(UPSTAIR): BROWN,
+    ord(DOWNSTAIR): BROWN,
+}
+
+# Minimap layer of current level
+_minimap_layer = None
+
+
+def _get_minimap_layer(map_info):
+    """
+    Returns up to date minimap layer of map_info, remaking it on
+    level change or when a tile changed type
 
     Args:
-        map_info ():
-        scale_factor_x (int): what to scale x by
-        scale_factor_y (int): what to sca;e y by
+        map_info (MapInfo): Map info of level to draw
+
+    Returns:
+        minimap_layer (MinimapLayer): minimap layer of map_info
     """
-    pygame.draw.rect(config.SURFACE_MAIN, BLACK,
-                     (0, 0,
-                      map_info.pixel_width / scale_factor_x,
-                      map_info.pixel_height / scale_factor_y))
+    global _minimap_layer
+    if _minimap_layer is None or _minimap_layer.map_info is not map_info \
+            or _minimap_layer.revision != map_info.revision:
+        _minimap_layer = MinimapLayer(map_info)
+    _minimap_layer.update()
+    return _minimap_layer
 
 
-def _draw_minimap_stairs_generated_map(tile_array, scale_factor_x, scale_factor_y):
+def _draw_minimap():
     """
-    Draws stairs onto minimap as brown if stairs are seen
-
-    Args:
-        tile_array (2D array): 2D array representing map
-        scale_factor_x (int): what to scale x by
-        scale_factor_y (int): what to scale y by
+    Draws minimap of current level on topleft of screen at
+    half the camera size
     """
-    for col in tile_array:
-        for tile in col:
-            if (tile.type == UPSTAIR or tile.type == DOWNSTAIR) and tile.seen:
-                pygame.draw.rect(config.SURFACE_MAIN, BROWN,
-                                 (tile.x * SPRITE_SIZE / scale_factor_x,
-                                  tile.y * SPRITE_SIZE / scale_factor_y,
-                                  SPRITE_SIZE / scale_factor_x,
-                                  SPRITE_SIZE / scale_factor_y))
+    minimap_width = int(config.CAMERA.camera_width / 2)
+    minimap_height = int(config.CAMERA.camera_height / 2)
+    _get_minimap_layer(config.MAP_INFO).draw(config.SURFACE_MAIN, minimap_width, minimap_height)
 
 
 def draw_minimap_generated_map():
@@ -82,28 +115,8 @@ def draw_minimap_generated_map():
     Draws minimap on topleft of screen. This is a
     representation of the actual map. This is for
     procedurally generated maps
-
     """
-    minimap_width, minimap_height = config.CAMERA.camera_width / 2, config.CAMERA.camera_height / 2
-
-    map_data = config.MAP_INFO
-
-    scale_factor_width = minimap_width / map_data.tile_width
-    scale_factor_height = minimap_height / map_data.tile_height
-    scale_factor_x = SPRITE_SIZE / scale_factor_width
-    scale_factor_y = SPRITE_SIZE / scale_factor_height
-
-    _draw_minimap_walls_generated_map(map_data, scale_factor_x, scale_factor_y)
-    _draw_minimap_rooms_generated_map(
-        config.MAP_INFO.map_tree.root.child_room_list
-        + config.MAP_INFO.map_tree.root.path_list,
-        scale_factor_x,
-        scale_factor_y)
-    _draw_unseen_tile_generated_map(config.MAP_INFO.unseen_tiles, scale_factor_x, scale_factor_y)
-    _draw_minimap_stairs_generated_map(config.MAP_INFO.tile_array, scale_factor_x, scale_factor_y)
-    _draw_minimap_items_both_map(config.GAME_DATA.item_data, scale_factor_x, scale_factor_y)
-    _draw_minimap_enemies_in_fov_both_map(config.GAME_DATA.creature_data["enemy"], scale_factor_x, scale_factor_y)
-    _draw_minimap_player_both_map(config.PLAYER, scale_factor_x, scale_factor_y)
+    _draw_minimap()
 
 
 def draw_minimap_loaded_map():
@@ -111,116 +124,45 @@ def draw_minimap_loaded_map():
     Draws minimap on topleft of screen. This is a
     representation of the actual map. This is for maps
     loaded from text files
-
-    Arg:
-        game (Game): game to load minimap to
     """
-    minimap_width, minimap_height = config.CAMERA.camera_width / 2, config.CAMERA.camera_height / 2
-    map_data = config.MAP_INFO
-    scale_factor_width = minimap_width / map_data.tile_width
-    scale_factor_height = minimap_height / map_data.tile_height
-    scale_factor_x = SPRITE_SIZE / scale_factor_width
-    scale_factor_y = SPRITE_SIZE / scale_factor_height
-
-    _draw_minimap_floor_and_walls_loaded_map(config.MAP_INFO, scale_factor_x, scale_factor_y)
-    _draw_minimap_items_both_map(config.GAME_DATA.item_data, scale_factor_x, scale_factor_y)
-    _draw_minimap_enemies_in_fov_both_map(config.GAME_DATA.creature_data["enemy"], scale_factor_x, scale_factor_y)
-    _draw_minimap_player_both_map(config.PLAYER, scale_factor_x, scale_factor_y)
+    _draw_minimap()
 
 
-def _draw_minimap_player_both_map(player, scale_factor_x, scale_factor_y):
+def _draw_minimap_player(frame, player):
     """
-    Draws player onto minimap as red
-
-    This is for map loaded from .txt files
+    Draws player onto minimap as blue
 
     Args:
+        frame (Surface): unscaled minimap to draw on
         player (Entity): player to draw on minimap
-        scale_factor_x (int): what to scale x by
-        scale_factor_y (int): what to sclae y by
-    """
-    pygame.draw.rect(config.SURFACE_MAIN, BLUE,
-                     (player.rect[0] // scale_factor_x,
-                      player.rect[1] // scale_factor_y,
-                      # + 1 is to make player directly touch walls
-                      # without making too big of difference in size
-                      player.size[0] // scale_factor_x + 1,
-                      player.size[1] // scale_factor_y + 1))
-
-
-def _draw_minimap_floor_and_walls_loaded_map(map_data, scale_factor_x, scale_factor_y):
     """
-    Draws floor and walls as black
+    frame.fill(BLUE, (player.x, player.y, 1, 1))
 
-    This is for map loaded from .txt files
 
-    Args:
-        map_data (MapInfo): Holds map information
-        scale_factor_x (int): How much to scale x by
-        scale_factor_y (int): How mucg to scale y by
-    """
-    for y in range(map_data.tile_height):
-        for x in range(map_data.tile_width):
-            tile = config.MAP_INFO.tile_array[y][x].type
-            if tile == WALL:
-                pygame.draw.rect(config.SURFACE_MAIN, BLACK,
-                                 (tile.rect[0] / scale_factor_x, tile.rect[1] / scale_factor_y,
-                                  tile.size[0] / scale_factor_x + 1, tile.size[1] / scale_factor_y + 1))
-            elif tile == FLOOR:
-                if tile.seen:
-                    pygame.draw.rect(config.SURFACE_MAIN, WHITE,
-                                     (tile.rect[0] / scale_factor_x,
-                                      tile.rect[1] / scale_factor_y,
-                                      tile.size[0] / scale_factor_x + 1,
-                                      tile.size[1] / scale_factor_y + 1))
-                else:
-                    pygame.draw.rect(config.SURFACE_MAIN, BLACK,
-                                     (tile.rect[0] / scale_factor_x,
-                                      tile.rect[1] / scale_factor_y,
-                                      tile.size[0] / scale_factor_x + 1,
-                                      tile.size[1] / scale_factor_y + 1))
-
-
-def _draw_minimap_items_both_map(item_list, scale_factor_x, scale_factor_y):
+def _draw_minimap_items(frame, map_info, item_list):
     """
     Draws seen items on minimap as green
 
     In this case seen items mean the tile it is on is seen
-    This is used for both minimaps
 
     Args:
+        frame (Surface): unscaled minimap to draw on
+        map_info (MapInfo): Holds map information
         item_list (list): List of items to draw on minimap
-        scale_factor_x (int): How much to scale x by
-        scale_factor_y (int): How mucg to scale y by
     """
     for item in item_list:
-        if config.MAP_INFO.tile_array[item.y][item.x].seen:
-            pygame.draw.rect(config.SURFACE_MAIN, GREEN,
-                             ((item.rect[0] / scale_factor_x),
-                              (item.rect[1] / scale_factor_y),
-                              # + 1 is to make items directly touch walls
-                              # without making too big of difference in size
-                              (item.size[0] / scale_factor_x + 1),
-                              (item.size[1] / scale_factor_y + 1)))
+        if map_info.seen[item.y * map_info.tile_width + item.x]:
+            frame.fill(GREEN, (item.x, item.y, 1, 1))
 
 
-def _draw_minimap_enemies_in_fov_both_map(enemy_list, scale_factor_x, scale_factor_y):
+def _draw_minimap_enemies_in_fov(frame, enemy_list):
     """
     Draws enemies in fov on minimap as red
 
-    This is used for both minimaps
-
     Args:
+        frame (Surface): unscaled minimap to draw on
         enemy_list (list): List of enemies to draw on minimap
-        scale_factor_x (int): How much to scale x by
-        scale_factor_y (int): How mucg to scale y by
     """
     for enemy in enemy_list:
         if config.FOV[enemy.y][enemy.x]:
-            pygame.draw.rect(config.SURFACE_MAIN, RED,
-                             ((enemy.rect[0] / scale_factor_x),
-                              (enemy.rect[1] / scale_factor_y),
-                              # + 1 is to make items directly touch walls
-                              # without making too big of difference in size
-                              (enemy.size[0] / scale_factor_x + 1),
-                              (enemy.size[1] / scale_factor_y + 1)))
+            frame.fill(RED, (enemy.x, enemy.y, 1, 1))
@@ -1,8 +1,10 @@
 import pygame
 import pygame.freetype
 from constant import *
+import game_text
 
-pygame.init()
+# Only freetype is needed for damage numbers, pygame itself is initialized by config
+pygame.freetype.init()
 dirname = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resource')
 font_path_name = os.path.join(dirname, 'fonts/FFF_Tusj.ttf')
 myfont = pygame.freetype.Font(font_path_name, 20)
@@ -84,7 +86,8 @@ class NumberParticle(Particle):
         self.v_y = -5 / SPRITE_SIZE
         self.max_x = self.x + SPRITE_SIZE
         self.max_y = self.y
-        self.image, self.rect = myfont.render(str(damage), colour)
+        self.image = game_text.render_freetype_text(myfont, str(damage), colour)
+        self.rect = self.image.get_rect()
         self.rect.topleft = (self.x * SPRITE_SIZE, self.y * SPRITE_SIZE)
 
     def update(self):
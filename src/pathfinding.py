@@ -1,74 +1,124 @@
+from array import array
 from constant import *
-import queue
-from dataclasses import dataclass, field
-from typing import Any
+import collections
+import heapq
+import perf
 
 
-class Node:
-    """
-    Node of a graph
-
-    Attributes:
-        x (arg, int): x coord of node
-        y (arg, int): y coord of node
-        edge (dictionary): dictionary with neighbours as keys
-                            and their edge weights as values
-    """
-
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.edges = {}
+# Offsets of the 8 neighbours of a tile. Bit i of a neighbour mask
+# is set if the neighbour at _NEIGHBOUR_OFFSETS[i] can be walked on
+_NEIGHBOUR_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1),
+                      (-1, -1), (1, -1), (-1, 1), (1, 1))
 
-
-@dataclass(order=True)
-class PrioritizedItem:
-    priority: int
-    item: Any = field(compare=False)
+# Distance of nodes that can't reach a goal in DijkstraMap.distances
+UNREACHABLE = 2 ** 31 - 1
 
 
 class Graph:
     """
     Graph representing map
 
+    Edges aren't stored. A tile's neighbours are found from its neighbour
+    mask, which is turned into flat index offsets by a table with an entry
+    for every possible mask. Searches work on the flat index (y * width + x)
+    of nodes and only turn them back into coords for visited
+
     Atrributes:
-        nodes (dictionary): dictionary with node coord as key and 
-                            node object as value
-        walls (dictionary): dictionary with wall coord as key and
-                            value of wall as value
+        width (int): # of tiles wide of map
+        height (int): # of tiles high of map
+        passable (bytearray): 1 for tiles that can be walked on, 0 for walls, by flat index
+        costs (array): cost of moving onto tile by flat index, 0 for walls. Byte
+            array if every cost fits in a byte
+        masks (bytearray): neighbour mask of every tile by flat index, bit i
+            set if neighbour at _NEIGHBOUR_OFFSETS[i] can be walked on
+        mask_offsets (List): tuple of flat index offsets of the neighbours
+            in every neighbour mask, by mask
     """
 
     def __init__(self):
-        self.nodes = {}
-        self.walls = {}
+        self.width = 0
+        self.height = 0
+        self.passable = bytearray()
+        self.costs = array('I')
+        self.masks = bytearray()
+        self.mask_offsets = []
 
     def make_graph(self, map_info):
         """
-        Makes graph corresponding to map
-
-        Makes a node if corresponding point on map isn't wall
+        Makes passability bitmap and costs of map
 
         Args:
             map_info (MapInfo): arg that holds map info
         """
-        for y in range(map_info.tile_height):
-            for x in range(map_info.tile_width):
-                if not map_info.tile_array[y][x].type == WALL:
-                    self.nodes[(x, y)] = (Node(x, y))
-                else:
-                    self.walls[(x, y)] = map_info.tile_array[y][x].type
+        self.width = map_info.tile_width
+        self.height = map_info.tile_height
+        wall_code = ord(WALL)
+        passable_table = bytes(0 if code == wall_code else 1 for code in range(256))
+        self.passable = bytearray(map_info.tile_types.translate(passable_table))
+        cost_table = [DEFAULT_MOVEMENT_COST] * 256
+        for tile_type, cost in MOVEMENT_COST.items():
+            cost_table[ord(tile_type)] = cost
+        cost_table[wall_code] = 0
+        if max(cost_table) < 256:
+            # Costs fit in a byte, so they are looked up a whole map at a time
+            self.costs = array('B', map_info.tile_types.translate(bytes(cost_table)))
+        else:
+            self.costs = array('I', map(cost_table.__getitem__, map_info.tile_types))
 
     def neighbour(self):
         """
-        Adds edges to all nodes with edge weight of 1
+        Makes neighbour mask of every tile and offset table of every mask
+
+        Masks are made one direction at a time for the whole map, by
+        treating passable as one big int with a byte per tile and shifting
+        it onto the neighbours in that direction
+        """
+        width = self.width
+        size = len(self.passable)
+        full = (1 << (size * 8)) - 1
+        passable = int.from_bytes(self.passable, 'little')
+        # Tiles that have a neighbour on their left/right, so rows don't wrap
+        has_left = int.from_bytes(bytes([0] + [1] * (width - 1)) * self.height, 'little')
+        has_right = int.from_bytes(bytes([1] * (width - 1) + [0]) * self.height, 'little')
+
+        masks = 0
+        for bit, (dx, dy) in enumerate(_NEIGHBOUR_OFFSETS):
+            offset = dy * width + dx
+            if offset > 0:
+                neighbours = passable >> (offset * 8)
+            else:
+                neighbours = (passable << (-offset * 8)) & full
+            neighbours &= passable
+            if dx < 0:
+                neighbours &= has_left
+            elif dx > 0:
+                neighbours &= has_right
+            masks |= neighbours << bit
+        self.masks = bytearray(masks.to_bytes(size, 'little'))
+
+        index_offsets = [dy * width + dx for dx, dy in _NEIGHBOUR_OFFSETS]
+        self.mask_offsets = [tuple(offset for bit, offset in enumerate(index_offsets) if mask & (1 << bit))
+                             for mask in range(256)]
+
+    def is_passable(self, coord):
         """
-        dirs = [[-1, 0], [1, 0], [0, -1], [0, 1],
-                [-1, -1], [1, -1], [-1, 1], [1, 1]]
-        for node in self.nodes.values():
-            for dir in dirs:
-                neighbour = (node.x + dir[0], node.y + dir[1])
-                if (neighbour in self.nodes):
-                    node.edges[neighbour] = 1
+        Returns True if coord is on map and can be walked on
+
+        Args:
+            coord ((int, int)): coord to check
+        """
+        x, y = coord
+        return 0 <= x < self.width and 0 <= y < self.height and self.passable[y * self.width + x] == 1
+
+    def passable_coords(self):
+        """
+        Returns coords of every tile that can be walked on
+
+        Returns:
+            coords (List): List of coords
+        """
+        width = self.width
+        return [(index % width, index // width) for index, passable in enumerate(self.passable) if passable]
 
     def bfs(self, start, goal):
         """
@@ -85,33 +135,38 @@ class Graph:
             visited (dictionary): dictionary of path of nodes
                 to goal and the previous node
         """
-        if (goal not in self.nodes):
+        if not self.is_passable(goal):
             return
-        visiting = queue.Queue()
-        visiting.put(self.nodes[start])
-        visited = {}
-        visited[start] = None
+        masks = self.masks
+        mask_offsets = self.mask_offsets
+        start_index = start[1] * self.width + start[0]
+        goal_index = goal[1] * self.width + goal[0]
+        visiting = collections.deque([start_index])
+        came_from = {start_index: None}
 
-        while not visiting.empty():
-            node = visiting.get()
+        while visiting:
+            index = visiting.popleft()
 
-            if (node.x, node.y) == goal:
+            if index == goal_index:
                 break
 
-            for next in node.edges:
-                if next not in visited:
-                    visiting.put(self.nodes[next])
-                    visited[next] = (node.x, node.y)
+            for offset in mask_offsets[masks[index]]:
+                next = index + offset
+                if next not in came_from:
+                    visiting.append(next)
+                    came_from[next] = index
 
-        return visited
+        perf.count("nodes expanded", len(came_from) - len(visiting))
+        return self._to_visited(came_from)
 
     def dijkstra(self, start, goal):
         """
         Dijkstra's shortest path traversal of graph. 
         Start at start and end at goal
 
-        Visited is dictionary of nodes and previous node
+        Came from is dictionary of nodes and previous node
         Current Cost is dictionary of lowest cost to a node
+        Closed is set of nodes whose lowest cost is final
 
         Args:
             start ((int, int)): start coord of dijkstra's shorest path
@@ -121,36 +176,48 @@ class Graph:
             visited (dictionary): dictionary of path of nodes
                 to goal and the previous node
         """
-        if (goal not in self.nodes):
+        if not self.is_passable(goal):
             return
-        visiting = queue.PriorityQueue()
-        visiting.put(PrioritizedItem(0, self.nodes[start]))
-        visited = {}
-        current_cost = {}
-        visited[start] = None
-        current_cost[start] = 0
-
-        while not visiting.empty():
-            node = visiting.get().item
-
-            if (node.x, node.y) == goal:
+        masks = self.masks
+        mask_offsets = self.mask_offsets
+        costs = self.costs
+        start_index = start[1] * self.width + start[0]
+        goal_index = goal[1] * self.width + goal[0]
+        visiting = [(0, start_index)]
+        came_from = {start_index: None}
+        current_cost = {start_index: 0}
+        closed = set()
+
+        while visiting:
+            cost, index = heapq.heappop(visiting)
+
+            if index == goal_index:
                 break
-
-            for next in node.edges:
-                new_cost = current_cost[(node.x, node.y)] + node.edges[next]
+            # Skip outdated entries of nodes already expanded with lower cost
+            if index in closed:
+                continue
+            closed.add(index)
+
+            for offset in mask_offsets[masks[index]]:
+                next = index + offset
+                if next in closed:
+                    continue
+                new_cost = cost + costs[next]
                 if next not in current_cost or new_cost < current_cost[next]:
                     current_cost[next] = new_cost
-                    visiting.put(PrioritizedItem(new_cost, self.nodes[next]))
-                    visited[next] = (node.x, node.y)
+                    heapq.heappush(visiting, (new_cost, next))
+                    came_from[next] = index
 
-        return visited
+        perf.count("nodes expanded", len(closed))
+        return self._to_visited(came_from)
 
     def a_star(self, start, goal):
         """
         A* search of graph. Start at start and end at goal
 
-        Visited is dictionary of nodes and previous node
+        Came from is dictionary of nodes and previous node
         Current Cost is dictionary of lowest cost to a node
+        Closed is set of nodes whose lowest cost is final
 
         Args:
             start ((int, int)): start coord of A* 
@@ -160,28 +227,62 @@ class Graph:
             visited (dictionary): dictionary of path of nodes
                 to goal and the previous node
         """
-        if (goal not in self.nodes):
+        if not self.is_passable(goal):
             return
-        visiting = queue.PriorityQueue()
-        visiting.put(PrioritizedItem(0, self.nodes[start]))
-        visited = {}
-        current_cost = {}
-        visited[start] = None
-        current_cost[start] = 0
-
-        while not visiting.empty():
-            node = visiting.get().item
-
-            if (node.x, node.y) == goal:
+        masks = self.masks
+        mask_offsets = self.mask_offsets
+        width = self.width
+        costs = self.costs
+        start_index = start[1] * width + start[0]
+        goal_index = goal[1] * width + goal[0]
+        visiting = [(0, start_index)]
+        came_from = {start_index: None}
+        current_cost = {start_index: 0}
+        closed = set()
+
+        while visiting:
+            _, index = heapq.heappop(visiting)
+
+            if index == goal_index:
                 break
-
-            for next in node.edges:
-                new_cost = current_cost[(node.x, node.y)] + node.edges[next]
+            # Skip outdated entries of nodes already expanded with lower cost
+            if index in closed:
+                continue
+            closed.add(index)
+
+            cost = current_cost[index]
+            for offset in mask_offsets[masks[index]]:
+                next = index + offset
+                if next in closed:
+                    continue
+                new_cost = cost + costs[next]
                 if next not in current_cost or new_cost < current_cost[next]:
                     current_cost[next] = new_cost
-                    visiting.put(PrioritizedItem(new_cost + distance(next, goal), self.nodes[next]))
-                    visited[next] = (node.x, node.y)
+                    heuristic = distance((next % width, next // width), goal)
+                    heapq.heappush(visiting, (new_cost + heuristic, next))
+                    came_from[next] = index
+
+        perf.count("nodes expanded", len(closed))
+        return self._to_visited(came_from)
 
+    def _to_visited(self, came_from):
+        """
+        Turns flat index came from dictionary into coord visited dictionary
+
+        Args:
+            came_from (dictionary): dictionary of node flat index
+                and previous node flat index
+
+        Returns:
+            visited (dictionary): dictionary of node coord and previous node coord
+        """
+        width = self.width
+        visited = {}
+        for index, previous in came_from.items():
+            if previous is None:
+                visited[(index % width, index // width)] = None
+            else:
+                visited[(index % width, index // width)] = (previous % width, previous // width)
         return visited
 
     def find_path(self, start, goal, visited):
@@ -208,6 +309,147 @@ class Graph:
         return path
 
 
+class DijkstraMap:
+    """
+    Distance field holding the lowest cost of getting from every node
+    to the closest goal. Once made, any number of creatures can find their
+    next step to the goals in O(1) instead of each doing their own search
+
+    Args:
+        graph (Graph): graph to make distance field on
+        sources (dictionary): dictionary with node flat index as key and
+            starting cost as value. Usually goals with cost 0
+
+    Attributes:
+        graph (arg, Graph): graph distance field is on
+        distances (array): lowest cost to a goal of every node by flat
+            index, UNREACHABLE for nodes that can't reach a goal
+    """
+
+    def __init__(self, graph, sources):
+        self.graph = graph
+        self.distances = self._scan(sources)
+
+    @classmethod
+    def from_goals(cls, graph, goals):
+        """
+        Makes Dijkstra map leading to goals
+
+        Args:
+            graph (Graph): graph to make distance field on
+            goals (List): List of goal coords
+
+        Returns:
+            dijkstra_map (DijkstraMap): Dijkstra map leading to goals
+        """
+        sources = {y * graph.width + x: 0 for x, y in goals if graph.is_passable((x, y))}
+        return cls(graph, sources)
+
+    def flee_map(self, coefficient=FLEE_COEFFICIENT):
+        """
+        Makes Dijkstra map leading away from goals
+
+        Every distance is multiplied by a negative coefficient, rounded and
+        then rescanned, so following it leads away from goals but towards
+        places that are furthest away overall, instead of into corners
+
+        Args:
+            coefficient (float): Negative number to multiply distances by.
+                Lower means creatures care more about getting far away than
+                about not being cornered
+
+        Returns:
+            dijkstra_map (DijkstraMap): Dijkstra map leading away from goals
+        """
+        sources = {index: round(cost * coefficient)
+                   for index, cost in enumerate(self.distances) if cost != UNREACHABLE}
+        return DijkstraMap(self.graph, sources)
+
+    def _scan(self, sources):
+        """
+        Multi-source Dijkstra from every source with its starting cost
+
+        Args:
+            sources (dictionary): dictionary with node flat index as key and
+                starting cost as value
+
+        Returns:
+            distances (array): lowest cost to a goal of every node by flat
+                index, UNREACHABLE for nodes that can't reach a goal
+        """
+        masks = self.graph.masks
+        mask_offsets = self.graph.mask_offsets
+        costs = self.graph.costs
+        distances = array('i', [UNREACHABLE]) * len(costs)
+        for index, cost in sources.items():
+            distances[index] = cost
+        visiting = [(cost, index) for index, cost in sources.items()]
+        heapq.heapify(visiting)
+        closed = bytearray(len(costs))
+        expanded = 0
+
+        while visiting:
+            cost, index = heapq.heappop(visiting)
+            if closed[index]:
+                continue
+            closed[index] = 1
+            expanded += 1
+
+            # Edge weight is cost of moving onto index, so cost from
+            # next to goal goes through index's weight
+            weight = costs[index]
+            for offset in mask_offsets[masks[index]]:
+                next = index + offset
+                if closed[next]:
+                    continue
+                new_cost = cost + weight
+                if new_cost < distances[next]:
+                    distances[next] = new_cost
+                    heapq.heappush(visiting, (new_cost, next))
+
+        perf.count("nodes expanded", expanded)
+        return distances
+
+    def distance(self, coord):
+        """
+        Returns cost of getting from coord to closest goal,
+        or None if goal can't be reached from coord
+
+        Args:
+            coord ((int, int)): coord to get cost of
+        """
+        cost = self.distances[coord[1] * self.graph.width + coord[0]]
+        return None if cost == UNREACHABLE else cost
+
+    def next_step(self, coord):
+        """
+        Returns neighbour of coord that is the next step to the
+        closest goal, or None if no neighbour is closer than coord
+
+        Args:
+            coord ((int, int)): coord to step from
+
+        Returns:
+            step ((int, int)): coord of next step
+        """
+        width = self.graph.width
+        index = coord[1] * width + coord[0]
+        distances = self.distances
+        best_cost = distances[index]
+        if best_cost == UNREACHABLE:
+            return None
+        best = None
+        for offset in self.graph.mask_offsets[self.graph.masks[index]]:
+            next = index + offset
+            cost = distances[next]
+            if cost < best_cost:
+                best_cost = cost
+                best = next
+        if best is None:
+            return None
+        return best % width, best // width
+
+
 def distance(coord1, coord2):
     """
     Returns distance between nodes using diagonal distance
@@ -0,0 +1,150 @@
+import time
+import collections
+from constant import *
+
+# True if performance HUD is on. Timers and counters do nothing while False
+ENABLED = False
+
+# Stages of a frame shown on HUD in order
+STAGES = ["events", "camera", "fov", "tiles", "entities", "particles", "ui", "flip"]
+
+# Times and counts of frame being timed
+_frame_times = collections.defaultdict(float)
+_frame_counts = collections.defaultdict(int)
+# (times, counts) of last PERF_HUD_FRAMES frames
+_history = collections.deque(maxlen=PERF_HUD_FRAMES)
+# Stage timers currently running, innermost last
+_open_timers = []
+
+
+class _StageTimer:
+    """
+    Context manager adding time spent in it to stage's frame time
+
+    Stages are exclusive: while a stage is timed inside another, the
+    enclosing stage is paused, so no time is counted twice
+
+    Attributes:
+        stage (arg, String): stage being timed
+        start (float): time stage started or was last resumed
+    """
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        now = time.perf_counter()
+        if _open_timers:
+            enclosing = _open_timers[-1]
+            _frame_times[enclosing.stage] += now - enclosing.start
+        _open_timers.append(self)
+        self.start = now
+
+    def __exit__(self, *exc_info):
+        now = time.perf_counter()
+        _frame_times[self.stage] += now - self.start
+        _open_timers.pop()
+        if _open_timers:
+            _open_timers[-1].start = now
+
+
+class _NullTimer:
+    """
+    Context manager that does nothing, used while HUD is off
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+_stage_timers = {stage: _StageTimer(stage) for stage in STAGES}
+
+
+def toggle():
+    """
+    Turns performance HUD on or off. Old timings are thrown away
+    """
+    global ENABLED
+    ENABLED = not ENABLED
+    _frame_times.clear()
+    _frame_counts.clear()
+    _history.clear()
+
+
+def timer(stage):
+    """
+    Returns context manager timing stage, ie
+
+        with perf.timer("fov"):
+            ...
+
+    Args:
+        stage (String): stage in STAGES to time
+
+    Returns:
+        timer: context manager timing stage, or one doing nothing if HUD is off
+    """
+    if ENABLED:
+        return _stage_timers[stage]
+    return _NULL_TIMER
+
+
+def count(counter, amount=1):
+    """
+    Adds amount to counter for this frame
+
+    Args:
+        counter (String): name of counter
+        amount (int): amount to add
+    """
+    if ENABLED:
+        _frame_counts[counter] += amount
+
+
+def end_frame():
+    """
+    Ends frame, saving its times and counts to history
+
+    Must not be called while a stage is being timed, else that stage's
+    time would spill into the next frame
+    """
+    if ENABLED:
+        _history.append((dict(_frame_times), dict(_frame_counts)))
+        _frame_times.clear()
+        _frame_counts.clear()
+
+
+def stage_stats():
+    """
+    Returns rolling average and worst time of every stage
+
+    Returns:
+        stats (List): List of (stage, average ms, worst ms)
+    """
+    stats = []
+    for stage in STAGES:
+        times = [frame_times.get(stage, 0.0) for frame_times, _ in _history] or [0.0]
+        stats.append((stage, sum(times) / len(times) * 1000, max(times) * 1000))
+    return stats
+
+
+def counter_stats():
+    """
+    Returns rolling average per frame and last frame's value of every counter
+
+    Returns:
+        stats (List): List of (counter, average, last frame's value)
+    """
+    counters = sorted(set(counter for _, frame_counts in _history for counter in frame_counts))
+    stats = []
+    for counter in counters:
+        counts = [frame_counts.get(counter, 0) for _, frame_counts in _history]
+        stats.append((counter, sum(counts) / len(counts), counts[-1]))
+    return stats
@@ -0,0 +1,102 @@
+from array import array
+import random
+
+
+class RoomGraph:
+    """
+    Graph of the rooms and paths of a generated level, with an edge
+    between every two rooms/paths that have tiles next to each other.
+    Used to move enemies far from the player room to room instead of
+    tile to tile
+
+    Args:
+        map_info (MapInfo): map info of level, has to have a map_tree
+
+    Attributes:
+        map_info (arg, MapInfo): map info of level
+        regions (List): every room then every path of level
+        region_of (array): index in regions of every tile (y * tile_width + x),
+            -1 if tile isn't in any room or path. Tiles where a path crosses a
+            room are in the room
+        neighbours (List): list of region indices next to every region
+    """
+
+    def __init__(self, map_info):
+        self.map_info = map_info
+        root = map_info.map_tree.root
+        self.regions = root.child_room_list + root.path_list
+        tile_width = map_info.tile_width
+        self.region_of = array('i', [-1]) * (tile_width * map_info.tile_height)
+        # Filled a row at a time from last region to first, so tiles in
+        # more than one region end up in the first one (the room)
+        for region_index in range(len(self.regions) - 1, -1, -1):
+            region = self.regions[region_index]
+            row = array('i', [region_index]) * (region.down_right_x - region.up_left_x + 1)
+            for y in range(region.up_left_y, region.down_right_y + 1):
+                row_start = y * tile_width + region.up_left_x
+                self.region_of[row_start:row_start + len(row)] = row
+        self.neighbours = self._find_neighbours()
+
+    def _find_neighbours(self):
+        """
+        Returns regions next to every region, found from rooms/paths whose
+        rectangles overlap or share an edge
+
+        Regions are swept in order of left x, so each region is only compared
+        with regions that start before its right edge ends
+
+        Returns:
+            neighbours (List): list of region indices next to every region
+        """
+        regions = self.regions
+        neighbour_sets = [set() for _ in regions]
+        order = sorted(range(len(regions)), key=lambda index: regions[index].up_left_x)
+        for position, index in enumerate(order):
+            region = regions[index]
+            for other_position in range(position + 1, len(order)):
+                other_index = order[other_position]
+                other = regions[other_index]
+                if other.up_left_x > region.down_right_x + 1:
+                    break
+                if other.up_left_y > region.down_right_y + 1 or region.up_left_y > other.down_right_y + 1:
+                    continue
+                overlap_x = other.up_left_x <= region.down_right_x and region.up_left_x <= other.down_right_x
+                overlap_y = other.up_left_y <= region.down_right_y and region.up_left_y <= other.down_right_y
+                # Rectangles only touching at a corner aren't next to each other
+                if overlap_x or overlap_y:
+                    neighbour_sets[index].add(other_index)
+                    neighbour_sets[other_index].add(index)
+        return [sorted(neighbour_set) for neighbour_set in neighbour_sets]
+
+    def region_at(self, x, y):
+        """
+        Returns index of region (x, y) is in, -1 if it isn't in any
+
+        Args:
+            x (int): x coord on map
+            y (int): y coord on map
+
+        Returns:
+            region (int): index of region in regions
+        """
+        return self.region_of[y * self.map_info.tile_width + x]
+
+    def random_neighbour_tile(self, x, y, rng=random):
+        """
+        Returns random tile in random region next to region (x, y) is in,
+        None if (x, y) isn't in a region or it has no neighbours
+
+        Args:
+            x (int): x coord on map
+            y (int): y coord on map
+            rng (Random): random number generator to use
+
+        Returns:
+            tile ((int, int)): coord of tile
+        """
+        region = self.region_at(x, y)
+        if region == -1 or not self.neighbours[region]:
+            return None
+        next_region = self.regions[rng.choice(self.neighbours[region])]
+        return (rng.randint(next_region.up_left_x, next_region.down_right_x),
+                rng.randint(next_region.up_left_y, next_region.down_right_y))
@@ -0,0 +1,558 @@
+"""
+Reads and writes save files
+
+A save file is SAVE_MAGIC, the format version and the length of a JSON
+header, then the header, then sections. The header is an index of where
+each section is:
+
+    {"game": [offset, length, compressed],
+     "current": [offset, length, compressed],
+     "previous_levels": [[offset, length, compressed], ...],
+     "next_levels": [[offset, length, compressed], ...]}
+
+with offsets counted from the end of the header. The game section holds
+the floor, turn count, player and messages. Every other section is one
+floor, stored as its map packed a chunk at a time and compact records of
+its enemies and items. Each map chunk is compressed on its own and kept
+between saves, so only chunks that changed since the last save are packed
+again. Only the current floor is decoded when loading, other floors stay
+packed until the player goes to them.
+
+Saves made before this format are pickled lists, which are still loaded.
+"""
+import array
+import collections
+import json
+import os
+import pickle
+import struct
+import weakref
+import zlib
+from constant import *
+import ai
+import creature
+import entity
+import game_data
+import gamemap
+import item
+import map_chunks
+import map_generator
+import message_log
+
+# Version and header length after SAVE_MAGIC
+_HEADER = struct.Struct("<HI")
+
+# Fields of CreatureStat saved for every enemy
+_STAT_FIELDS = ("level", "max_hp", "max_mp", "hp", "mp", "exp", "strength", "defense", "wizardry")
+
+# Lookup table for ai classes saved by name
+_ai_dict = {
+    "ChaseAI": ai.ChaseAI,
+    "Ai_test": ai.Ai_test,
+}
+
+# Translation tables between seen bytes (0 or 1) and binary digits
+_BYTES_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_DIGITS_TO_BYTES = bytes.maketrans(b"01", b"\x00\x01")
+
+# PackedChunks of every map saved or loaded, by map info
+_packed_chunks = weakref.WeakKeyDictionary()
+
+
+class PackedLevel:
+    """
+    Floor from a save file that hasn't been decoded yet. Kept in
+    GameData.previous_levels/next_levels in place of level data until
+    the player goes to the floor
+
+    Attributes:
+        data (arg, bytes): section holding the floor
+        compressed (arg, Boolean): True if data is compressed
+    """
+
+    def __init__(self, data, compressed):
+        self.data = data
+        self.compressed = compressed
+
+    def unpack(self):
+        """
+        Decodes floor
+
+        Returns:
+            level_data (tuple): player x, player y, map info, enemy list
+                and item list of floor
+        """
+        return _unpack_level(_decode(self.data, self.compressed))
+
+
+class PackedChunks:
+    """
+    Map of a floor packed a chunk at a time, kept between saves so chunks
+    whose save revision didn't change since they were packed aren't packed again
+
+    Args:
+        map_info (MapInfo): map info of floor
+        chunks (List): chunks of map_info already packed, ie when map was
+            loaded. Every chunk is packed on first update if None
+
+    Attributes:
+        map_info (arg, MapInfo): map info of floor
+        revisions (array): save revision of every chunk when it was packed, None until packed
+        chunks (List): packed chunk by chunk index
+    """
+
+    def __init__(self, map_info, chunks=None):
+        self.map_info = map_info
+        self.revisions = None
+        self.chunks = chunks
+        if chunks is not None:
+            self.revisions = array.array('I', map_info.chunks.save_revisions)
+
+    def update(self):
+        """
+        Packs chunks whose save revision changed since they were last packed
+
+        Returns:
+            chunks (List): packed chunk by chunk index
+        """
+        revisions = self.map_info.chunks.save_revisions
+        if self.revisions is None:
+            self.chunks = [_pack_chunk(self.map_info, chunk) for chunk in range(len(revisions))]
+        elif self.revisions != revisions:
+            for chunk, revision in enumerate(revisions):
+                if revision != self.revisions[chunk]:
+                    self.chunks[chunk] = _pack_chunk(self.map_info, chunk)
+        self.revisions = array.array('I', revisions)
+        return list(self.chunks)
+
+
+def save(path, current_floor, turn_count, map_info, player, data):
+    """
+    Writes game to path
+
+    Args:
+        path (String): path of save file
+        current_floor (int): floor player is on
+        turn_count (int): # of turns taken
+        map_info (MapInfo): map info of current floor
+        player (Entity): player
+        data (GameData): game data
+    """
+    write(path, snapshot(current_floor, turn_count, map_info, player, data))
+
+
+def snapshot(current_floor, turn_count, map_info, player, data):
+    """
+    Copies game into data that doesn't change when game goes on, so it
+    can be written by write on another thread
+
+    Only packs floors, compressing map chunks that changed since last
+    save, and pickles player, leaving the rest of compressing and
+    writing to write
+
+    Args:
+        current_floor (int): floor player is on
+        turn_count (int): # of turns taken
+        map_info (MapInfo): map info of current floor
+        player (Entity): player
+        data (GameData): game data
+
+    Returns:
+        snapshot (dictionary): game sections to pass to write
+    """
+    def pack(level_data):
+        # Floors that were never decoded are already packed
+        if isinstance(level_data, PackedLevel):
+            return level_data
+        return _pack_level(*level_data)
+
+    return {
+        "game": pickle.dumps({
+            "current_floor": current_floor,
+            "turn_count": turn_count,
+            "player": player,
+            "game_messages": data.game_messages,
+        }, pickle.HIGHEST_PROTOCOL),
+        "current": _pack_level(player.x, player.y, map_info,
+                               data.creature_data["enemy"], data.item_data),
+        "previous_levels": [pack(level_data) for level_data in data.previous_levels],
+        "next_levels": [pack(level_data) for level_data in data.next_levels],
+    }
+
+
+def write(path, game_snapshot):
+    """
+    Writes snapshot to path. File is written to a temporary file first and
+    then renamed to path, so a save failing part way leaves old save as it was
+
+    Args:
+        path (String): path of save file
+        game_snapshot (dictionary): snapshot made by snapshot
+    """
+    sections = []
+
+    def add_section(section, compressed):
+        offset = sum(map(len, sections))
+        sections.append(section)
+        return [offset, len(section), compressed]
+
+    def add_level(level):
+        if isinstance(level, PackedLevel):
+            return add_section(level.data, level.compressed)
+        # Map chunks are already compressed and enemy and item records are small
+        return add_section(pickle.dumps(level, pickle.HIGHEST_PROTOCOL), False)
+
+    header = {
+        "game": add_section(_compress(game_snapshot["game"]), SAVE_COMPRESSION),
+        "current": add_level(game_snapshot["current"]),
+        "previous_levels": [add_level(level) for level in game_snapshot["previous_levels"]],
+        "next_levels": [add_level(level) for level in game_snapshot["next_levels"]],
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(SAVE_MAGIC)
+        file.write(_HEADER.pack(SAVE_VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        for section in sections:
+            file.write(section)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def load(path):
+    """
+    Reads game from path
+
+    Args:
+        path (String): path of save file
+
+    Returns:
+        current_floor (int): floor player is on
+        turn_count (int): # of turns taken
+        map_info (MapInfo): map info of current floor
+        player (Entity): player
+        data (GameData): game data, with floors player isn't on still packed
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(SAVE_MAGIC)) != SAVE_MAGIC:
+            # Save from before versioned saves
+            file.seek(0)
+            current_floor, turn_count, map_info, player, legacy_data = _LegacyUnpickler(file).load()
+            # Old GameData is missing attributes added since, so its data is moved to a new one
+            data = game_data.GameData()
+            data.game_messages = _message_log(legacy_data.game_messages)
+            data.creature_data = legacy_data.creature_data
+            data.item_data = legacy_data.item_data
+            data.previous_levels = collections.deque(legacy_data.previous_levels)
+            data.next_levels = collections.deque(legacy_data.next_levels)
+            return current_floor, turn_count, map_info, player, data
+
+        version, header_length = _HEADER.unpack(file.read(_HEADER.size))
+        if version > SAVE_VERSION:
+            raise ValueError("Save file version {} is newer than {}".format(version, SAVE_VERSION))
+        header = json.loads(file.read(header_length).decode("utf-8"))
+        body = file.read()
+
+    def section(offset, length, compressed):
+        return body[offset:offset + length], compressed
+
+    game = _decode(*section(*header["game"]))
+    player = game["player"]
+
+    x, y, map_info, enemy_list, item_list = _unpack_level(_decode(*section(*header["current"])))
+    player.x, player.y = x, y
+
+    data = game_data.GameData()
+    data.game_messages = _message_log(game["game_messages"])
+    data.creature_data["player"] = [player]
+    data.creature_data["enemy"] = enemy_list
+    data.item_data = item_list
+    data.previous_levels = collections.deque(
+        PackedLevel(*section(*level)) for level in header["previous_levels"])
+    data.next_levels = collections.deque(
+        PackedLevel(*section(*level)) for level in header["next_levels"])
+
+    return game["current_floor"], game["turn_count"], map_info, player, data
+
+
+def _encode(obj):
+    """
+    Pickles obj, compressing it if SAVE_COMPRESSION is True
+
+    Returns:
+        section (bytes): encoded obj
+    """
+    return _compress(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+
+def _compress(section):
+    """
+    Returns:
+        section (bytes): section compressed if SAVE_COMPRESSION is True
+    """
+    if SAVE_COMPRESSION:
+        section = zlib.compress(section)
+    return section
+
+
+def _decode(section, compressed):
+    """
+    Decodes section made by _encode
+
+    Returns:
+        obj: decoded object
+    """
+    if compressed:
+        section = zlib.decompress(section)
+    return pickle.loads(section)
+
+
+class _LegacyUnpickler(pickle.Unpickler):
+    """
+    Unpickler for saves made before versioned saves, loading their
+    Tiles as LegacyTiles so MapInfo can turn them into arrays
+    """
+
+    def find_class(self, module, name):
+        if module == "gamemap" and name == "Tile":
+            return gamemap.LegacyTile
+        return super().find_class(module, name)
+
+
+def _message_log(game_messages):
+    """
+    Returns game messages as MessageLog, since saves made before
+    messages were kept in a log have a list of messages
+
+    Args:
+        game_messages (MessageLog or List): saved game messages
+
+    Returns:
+        message_log (MessageLog): game messages
+    """
+    if isinstance(game_messages, message_log.MessageLog):
+        return game_messages
+    return message_log.MessageLog.from_list(game_messages)
+
+
+def _pack_level(x, y, map_info, enemy_list, item_list):
+    """
+    Packs floor into plain data
+
+    Args:
+        x (int): player's x position on floor
+        y (int): player's y position on floor
+        map_info (MapInfo): map info of floor
+        enemy_list (List): list of enemies on floor
+        item_list (List): list of items on floor
+
+    Returns:
+        level (dictionary): packed floor
+    """
+    tree = map_info.map_tree
+    packed_chunks = _packed_chunks.get(map_info)
+    if packed_chunks is None:
+        packed_chunks = _packed_chunks[map_info] = PackedChunks(map_info)
+    return {
+        "player": (x, y),
+        "tile_width": map_info.tile_width,
+        "tile_height": map_info.tile_height,
+        "chunk_size": MAP_CHUNK_SIZE,
+        "compressed": SAVE_COMPRESSION,
+        "chunks": packed_chunks.update(),
+        "rooms": [room.coords for room in tree.root.child_room_list] if tree else None,
+        "paths": [path.coords for path in tree.root.path_list] if tree else None,
+        "enemies": [_pack_enemy(enemy) for enemy in enemy_list],
+        "items": [_pack_item(item_entity) for item_entity in item_list],
+    }
+
+
+def _unpack_level(level):
+    """
+    Makes floor from level packed by _pack_level
+
+    Args:
+        level (dictionary): packed floor
+
+    Returns:
+        level_data (tuple): player x, player y, map info, enemy list
+            and item list of floor
+    """
+    tile_width, tile_height = level["tile_width"], level["tile_height"]
+    tree = None
+    if level["rooms"] is not None:
+        tree = map_generator.Tree.from_rooms(tile_width, tile_height, level["rooms"], level["paths"])
+    if "chunks" in level:
+        tile_types, seen = _unpack_chunks(level)
+    else:
+        # Saves from before maps were saved a chunk at a time
+        tile_types = bytearray(level["tile_types"])
+        seen = _unpack_bits(level["seen"], len(tile_types))
+    map_info = gamemap.MapInfo.from_arrays(tile_width, tile_height, tile_types, seen, tree)
+    if level.get("chunk_size") == MAP_CHUNK_SIZE and level["compressed"] == SAVE_COMPRESSION:
+        # Chunks are packed the same way they would be now, so they don't have to be packed again
+        _packed_chunks[map_info] = PackedChunks(map_info, list(level["chunks"]))
+
+    x, y = level["player"]
+    enemy_list = [_unpack_enemy(record) for record in level["enemies"]]
+    item_list = [_unpack_item(record) for record in level["items"]]
+    return x, y, map_info, enemy_list, item_list
+
+
+def _pack_chunk(map_info, chunk):
+    """
+    Packs tile types and seen of chunk
+
+    Args:
+        map_info (MapInfo): map info chunk is in
+        chunk (int): chunk index of chunk
+
+    Returns:
+        packed_chunk (bytes): tile types of chunk row by row followed by
+            its seen packed into bits, compressed if SAVE_COMPRESSION is True
+    """
+    x_start, y_start, x_end, y_end = map_info.chunks.tile_range(chunk)
+    rows = [(y * map_info.tile_width + x_start, y * map_info.tile_width + x_end) for y in range(y_start, y_end)]
+    tile_types = b"".join(map_info.tile_types[start:end] for start, end in rows)
+    seen = b"".join(map_info.seen[start:end] for start, end in rows)
+    return _compress(tile_types + _pack_bits(seen))
+
+
+def _unpack_chunks(level):
+    """
+    Unpacks map of level packed a chunk at a time by _pack_chunk
+
+    Args:
+        level (dictionary): packed floor
+
+    Returns:
+        tile_types (bytearray): type of every tile as the byte of its char
+        seen (bytearray): 1 if tile has been seen else 0
+    """
+    tile_width, tile_height = level["tile_width"], level["tile_height"]
+    tile_types = bytearray(tile_width * tile_height)
+    seen = bytearray(tile_width * tile_height)
+    for chunk, packed_chunk in enumerate(level["chunks"]):
+        if level["compressed"]:
+            packed_chunk = zlib.decompress(packed_chunk)
+        x_start, y_start, x_end, y_end = map_chunks.chunk_tile_range(chunk, level["chunk_size"],
+                                                                     tile_width, tile_height)
+        chunk_width = x_end - x_start
+        size = chunk_width * (y_end - y_start)
+        chunk_seen = _unpack_bits(packed_chunk[size:], size)
+        for row, y in enumerate(range(y_start, y_end)):
+            start = y * tile_width + x_start
+            tile_types[start:start + chunk_width] = packed_chunk[row * chunk_width:(row + 1) * chunk_width]
+            seen[start:start + chunk_width] = chunk_seen[row * chunk_width:(row + 1) * chunk_width]
+    return tile_types, seen
+
+
+def _pack_enemy(enemy):
+    """
+    Returns:
+        record (tuple): enemy as plain data
+    """
+    creature_com = enemy.creature
+    return (enemy.object_name, enemy.x, enemy.y,
+            creature_com.name_instance, creature_com.killable, creature_com.team,
+            tuple(getattr(creature_com.stat, field) for field in _STAT_FIELDS),
+            _pack_ai(enemy.ai))
+
+
+def _unpack_enemy(record):
+    """
+    Returns:
+        enemy (Entity): enemy made from record made by _pack_enemy
+    """
+    object_name, x, y, name_instance, killable, team, stats, ai_record = record
+    creature_com = creature.Creature(name_instance, killable, team, level=stats[0])
+    for field, value in zip(_STAT_FIELDS, stats):
+        setattr(creature_com.stat, field, value)
+
+    ai_com = _unpack_ai(ai_record)
+    enemy = entity.Entity(x, y, object_name, creature=creature_com, ai=ai_com)
+    # Ai a confused enemy goes back to is owned by enemy too
+    while isinstance(ai_com, ai.ConfuseAI):
+        ai_com = ai_com.old_ai
+        ai_com.owner = enemy
+    return enemy
+
+
+def _pack_ai(ai_com):
+    """
+    Returns:
+        record (tuple): ai as plain data, None if there is no ai
+    """
+    if ai_com is None:
+        return None
+    if isinstance(ai_com, ai.ConfuseAI):
+        return "ConfuseAI", ai_com.turn_count, _pack_ai(ai_com.old_ai)
+    return type(ai_com).__name__,
+
+
+def _unpack_ai(record):
+    """
+    Returns:
+        ai: ai made from record made by _pack_ai, without owner
+    """
+    if record is None:
+        return None
+    if record[0] == "ConfuseAI":
+        return ai.ConfuseAI(_unpack_ai(record[2]), record[1])
+    return _ai_dict[record[0]]()
+
+
+def _pack_item(item_entity):
+    """
+    Returns:
+        record (tuple): item on floor as plain data
+    """
+    item_com = item_entity.item
+    return (item_entity.object_name, item_entity.x, item_entity.y,
+            item_com.name, item_com.weight, item_com.volume)
+
+
+def _unpack_item(record):
+    """
+    Returns:
+        item (Entity): item made from record made by _pack_item
+    """
+    object_name, x, y, name, weight, volume = record
+    return entity.Entity(x, y, object_name, item=item.Item(name, weight, volume))
+
+
+def _pack_bits(array):
+    """
+    Packs array of 0 and 1 bytes into 1 bit per byte
+
+    Args:
+        array (bytearray): array of 0 and 1 bytes
+
+    Returns:
+        bits (bytes): packed array
+    """
+    if not array:
+        return b""
+    # Reversed so byte i of array is bit i of the number
+    number = int(bytes(array).translate(_BYTES_TO_DIGITS)[::-1], 2)
+    return number.to_bytes((len(array) + 7) // 8, 'little')
+
+
+def _unpack_bits(bits, size):
+    """
+    Unpacks bits packed by _pack_bits
+
+    Args:
+        bits (bytes): packed array
+        size (int): # of bytes in array
+
+    Returns:
+        array (bytearray): array of 0 and 1 bytes
+    """
+    if not size:
+        return bytearray()
+    digits = format(int.from_bytes(bits, 'little'), '0{}b'.format(size)).encode('ascii')
+    return bytearray(digits[::-1].translate(_DIGITS_TO_BYTES))
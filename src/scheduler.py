@@ -0,0 +1,239 @@
+import heapq
+import itertools
+from constant import *
+import config
+import perf
+import room_graph
+
+
+class TurnScheduler:
+    """
+    Schedules creature turns in a heap by the time they next act
+
+    Every creature acts once per TURN_TIME. Creatures acting at the same
+    time act in the order they were scheduled, so the player acts first and
+    enemies act in the order of the enemy list. Enemies far from the player,
+    or out of sight in unexplored tiles, sleep until the player comes near or
+    a noise wakes them. Sleeping enemies don't run their AI, they only move
+    to a neighbouring room or path every COARSE_TURNS turns, so a turn costs
+    about as much however many enemies are far away
+
+    Creatures removed with remove, ie when they die, are skipped when their
+    heap entry comes up, so creatures can die while a turn runs
+
+    Attributes:
+        enemy_list (List): enemy list of level scheduler was made for
+        player_list (List): player list of level scheduler was made for
+        time (int): time current turn started at
+        heap (List): (time to act, order, entity) of every creature. Sleeping
+            creatures are in it for their next room to room move
+        room_graph (RoomGraph): room graph of level, None if level wasn't generated
+        order (count): counter telling which of creatures acting at same time acts first
+        scheduled (dictionary): dictionary with entity as key and order
+            of its heap entry as value. Heap entries not in it are stale
+        sleeping (dictionary): dictionary with sleeping entity as key and
+            turn count it fell asleep at as value
+        alert (dictionary): dictionary with entity woken by noise as key and
+            time it can fall asleep again as value
+    """
+
+    def __init__(self):
+        self.enemy_list = None
+        self.player_list = None
+        self.time = 0
+        self.heap = []
+        self.room_graph = None
+        self.order = itertools.count()
+        self.scheduled = {}
+        self.sleeping = {}
+        self.alert = {}
+
+    def rebuild(self, creature_dict):
+        """
+        Schedules every creature of creature_dict to act this turn, except
+        enemies that should be sleeping
+
+        Args:
+            creature_dict (dict): Dictionary of player and enemy
+        """
+        self.enemy_list = creature_dict["enemy"]
+        self.player_list = creature_dict["player"]
+        self.heap = []
+        self.scheduled = {}
+        self.sleeping = {}
+        self.alert = {}
+        if config.MAP_INFO.map_tree is None:
+            self.room_graph = None
+        elif self.room_graph is None or self.room_graph.map_info is not config.MAP_INFO:
+            self.room_graph = room_graph.RoomGraph(config.MAP_INFO)
+        for team in creature_dict:
+            for entity in creature_dict[team]:
+                if self._should_sleep(entity):
+                    self.sleeping[entity] = config.TURN_COUNT
+                    # Spread room to room moves over turns
+                    self._schedule(entity, self.time + TURN_TIME * (1 + len(self.sleeping) % COARSE_TURNS))
+                else:
+                    self._schedule(entity, self.time)
+
+    def remove(self, entity):
+        """
+        Stops scheduling entity, ie when it dies
+
+        Args:
+            entity (Entity): Entity to stop scheduling
+        """
+        self.scheduled.pop(entity, None)
+        self.sleeping.pop(entity, None)
+        self.alert.pop(entity, None)
+
+    def run_turn(self, creature_dict, dx, dy):
+        """
+        Runs one turn, letting every awake creature act once
+
+        Args:
+            creature_dict (dict): Dictionary of player and enemy
+            dx (int): x to move player by
+            dy (int): y to move player by
+        """
+        if self.enemy_list is not creature_dict["enemy"] or self.player_list is not creature_dict["player"]:
+            # Level changed
+            self.rebuild(creature_dict)
+
+        self._wake_near(config.PLAYER.x, config.PLAYER.y, ENEMY_SLEEP_DISTANCE, noise=False)
+
+        end_time = self.time + TURN_TIME
+        acted = 0
+        moved = 0
+        while self.heap and self.heap[0][0] < end_time:
+            act_time, order, entity = heapq.heappop(self.heap)
+            if self.scheduled.get(entity) != order:
+                continue
+            if entity in self.sleeping:
+                self._move_to_neighbouring_room(entity)
+                moved += 1
+                if self._should_sleep(entity):
+                    self._schedule(entity, act_time + COARSE_TURNS * TURN_TIME)
+                else:
+                    # Came near player, so it runs its AI from next turn
+                    self._wake(entity, end_time)
+                continue
+            entity.update(dx, dy)
+            acted += 1
+            if self.scheduled.get(entity) != order:
+                # Removed during its own turn
+                continue
+            if entity not in self.alert and self._should_sleep(entity):
+                self.sleeping[entity] = config.TURN_COUNT
+                self._schedule(entity, act_time + COARSE_TURNS * TURN_TIME)
+            else:
+                self._schedule(entity, act_time + TURN_TIME)
+        self.time = end_time
+        for entity in [entity for entity, alert_time in self.alert.items() if alert_time <= self.time]:
+            del self.alert[entity]
+        perf.count("actors", acted)
+        perf.count("room moves", moved)
+
+    def make_noise(self, x, y, radius):
+        """
+        Wakes sleeping creatures within radius of (x, y), keeping them
+        awake for NOISE_AWAKE_TURNS turns
+
+        Args:
+            x (int): x coord of noise
+            y (int): y coord of noise
+            radius (int): how far noise is heard
+        """
+        self._wake_near(x, y, radius, noise=True)
+
+    def _wake_near(self, x, y, radius, noise):
+        """
+        Wakes sleeping creatures within radius of (x, y). Creatures woken
+        without noise are only woken if they shouldn't be sleeping anymore
+
+        Args:
+            x (int): x coord to wake creatures around
+            y (int): y coord to wake creatures around
+            radius (int): how far from (x, y) creatures are woken
+            noise (Boolean): True if creatures are woken by noise
+        """
+        if not self.sleeping:
+            return
+        for entity in config.GAME_DATA.creature_index.in_rect(x - radius, y - radius, x + radius + 1, y + radius + 1):
+            if entity in self.sleeping and (noise or not self._should_sleep(entity)):
+                # Noise is made mid turn, so creatures woken by it may have
+                # already acted this turn before falling asleep
+                self._wake(entity, self.time + TURN_TIME if noise else self.time)
+            if noise and entity in self.scheduled:
+                self.alert[entity] = self.time + NOISE_AWAKE_TURNS * TURN_TIME
+
+    def _wake(self, entity, act_time):
+        """
+        Schedules sleeping entity to act at act_time, regenerating what it
+        would have while sleeping
+
+        Args:
+            entity (Entity): Entity to wake
+            act_time (int): time entity acts at
+        """
+        slept_turn = self.sleeping.pop(entity)
+        # Entity regenerates itself when it acts, so this turn's regen
+        # isn't caught up if it still acts this turn
+        last_turn = config.TURN_COUNT - 1 if act_time < self.time + TURN_TIME else config.TURN_COUNT
+        regen = last_turn // REGEN_TIME - slept_turn // REGEN_TIME
+        if regen > 0 and entity.creature.stat:
+            entity.creature.stat.heal_hp(regen)
+            entity.creature.stat.heal_mp(regen)
+        self._schedule(entity, act_time)
+
+    def _move_to_neighbouring_room(self, entity):
+        """
+        Moves sleeping entity to random tile of a random room or path next
+        to the one it is in. Entity stays where it is if tile is a wall,
+        taken or in player FOV, so enemies never appear in view
+
+        Args:
+            entity (Entity): sleeping Entity to move
+        """
+        if self.room_graph is None:
+            return
+        tile = self.room_graph.random_neighbour_tile(entity.x, entity.y)
+        if tile is None:
+            return
+        x, y = tile
+        map_info = config.MAP_INFO
+        if map_info.is_wall(x, y) or map_info.seeing[y * map_info.tile_width + x] \
+                or config.GAME_DATA.creature_index.at(x, y):
+            return
+        entity.x = x
+        entity.y = y
+
+    def _schedule(self, entity, act_time):
+        """
+        Adds entity to heap to act at act_time
+
+        Args:
+            entity (Entity): Entity to schedule
+            act_time (int): time entity acts at
+        """
+        order = next(self.order)
+        self.scheduled[entity] = order
+        heapq.heappush(self.heap, (act_time, order, entity))
+
+    def _should_sleep(self, entity):
+        """
+        Returns True if entity is an enemy far from player, or out of
+        player's FOV range on a tile player hasn't seen
+
+        Args:
+            entity (Entity): Entity to check
+
+        Returns:
+            True if entity should be sleeping
+        """
+        if not entity.ai:
+            return False
+        distance = max(abs(entity.x - config.PLAYER.x), abs(entity.y - config.PLAYER.y))
+        if distance > ENEMY_SLEEP_DISTANCE:
+            return True
+        map_info = config.MAP_INFO
+        return distance > PLAYER_FOV and not map_info.seen[entity.y * map_info.tile_width + entity.x]
@@ -0,0 +1,191 @@
+"""
+Programmatic API to play the game without a display or player input
+
+Turns on headless mode, so thousands of turns can be simulated a second
+for load and regression testing. Can also be run to play random turns:
+
+    python src/simulation.py --turns 10000 --seed 1
+"""
+import argparse
+import os
+import random
+import time
+
+# Has to be set before constant is imported
+os.environ.setdefault("ROGUELIKE_HEADLESS", "1")
+
+from constant import *
+import config
+import game
+import magic
+
+
+class Simulation:
+    """
+    Game driven by method calls instead of pygame events.
+    Every action takes a turn like the matching key press
+
+    Args:
+        seed (int): seed for random, None for a random game
+
+    Attributes:
+        seed (arg, int): seed game was made with
+    """
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        random.seed(seed)
+        game.new_game()
+        game.update_game()
+
+    @property
+    def player(self):
+        """
+        Returns:
+            Player entity
+        """
+        return config.PLAYER
+
+    @property
+    def turn_count(self):
+        """
+        Returns:
+            # of turns taken
+        """
+        return config.TURN_COUNT
+
+    @property
+    def floor(self):
+        """
+        Returns:
+            Floor player is on
+        """
+        return config.CURRENT_FLOOR
+
+    @property
+    def player_dead(self):
+        """
+        Returns:
+            True if player hp <= 0
+        """
+        return config.PLAYER.creature.stat.hp <= 0
+
+    def move(self, dx, dy):
+        """
+        Moves player by (dx, dy), attacking if an enemy is there
+
+        Args:
+            dx (int): int to change player's x coord, -1, 0 or 1
+            dy (int): int to change player's y coord, -1, 0 or 1
+        """
+        game.update_creatures(config.GAME_DATA.creature_data, dx, dy)
+        game.update_game()
+
+    def wait(self):
+        """
+        Player does nothing for a turn
+        """
+        self.move(0, 0)
+
+    def pick_up(self):
+        """
+        Picks up every item at player's position
+        """
+        for obj in game.map_items_at_coord(config.PLAYER.x, config.PLAYER.y):
+            if obj.item:
+                obj.item.pick_up(config.PLAYER)
+        self.wait()
+
+    def cast(self, spell_name, target):
+        """
+        Casts spell at target, like clicking target in magic menu
+
+        Args:
+            spell_name (String): Name of spell in magic.spell_use_dict
+            target ((int, int)): coord spell is aimed at
+
+        Returns:
+            True if spell was cast, False if target isn't in player FOV
+        """
+        line = magic.line(config.PLAYER.position, target, config.MAP_INFO.tile_array, config.FOV)
+        if not line:
+            return False
+        game.cast_magic(magic.spell_use_dict[spell_name], line)
+        game.update_game()
+        return True
+
+    def descend(self):
+        """
+        Goes to next floor if player is on downstairs
+
+        Returns:
+            True if player went to next floor
+        """
+        if config.CURRENT_FLOOR < NUM_OF_FLOOR and \
+                config.MAP_INFO.tile_array[config.PLAYER.y][config.PLAYER.x].type == DOWNSTAIR:
+            config.CURRENT_FLOOR += 1
+            config.GAME_DATA.transition_next_level()
+            game.update_game()
+            return True
+        return False
+
+    def ascend(self):
+        """
+        Goes to previous floor if player is on upstairs
+
+        Returns:
+            True if player went to previous floor
+        """
+        if config.MAP_INFO.tile_array[config.PLAYER.y][config.PLAYER.x].type == UPSTAIR:
+            config.CURRENT_FLOOR -= 1
+            config.GAME_DATA.transition_previous_level()
+            game.update_game()
+            return True
+        return False
+
+    def auto_explore(self):
+        """
+        Walks player towards closest unseen tile, like pressing auto move
+        """
+        game.auto_path(config.PATHFINDING)
+
+
+def run_random_turns(simulation, turns):
+    """
+    Plays turns random moves, going down stairs when on them and
+    starting a new game when player dies
+
+    Args:
+        simulation (Simulation): simulation to play
+        turns (int): # of turns to play
+
+    Returns:
+        games (int): # of games played
+    """
+    dirs = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1), (0, 0)]
+    games = 1
+    for _ in range(turns):
+        if simulation.player_dead:
+            simulation = Simulation(random.randrange(2 ** 32))
+            games += 1
+        if not simulation.descend():
+            simulation.move(*random.choice(dirs))
+    return games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate random turns without a display")
+    parser.add_argument("--turns", type=int, default=1000, help="number of turns to simulate")
+    parser.add_argument("--seed", type=int, default=None, help="seed of simulated game")
+    args = parser.parse_args()
+
+    simulation = Simulation(args.seed)
+    start = time.perf_counter()
+    games = run_random_turns(simulation, args.turns)
+    seconds = time.perf_counter() - start
+    print("{} turns in {:.2f}s ({:.0f} turns/s, {} games)".format(
+        args.turns, seconds, args.turns / seconds, games))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+class SpatialIndex:
+    """
+    Index of entities on a level by the tile they are on
+
+    Entities in the index keep it up to date themselves, since setting
+    an Entity's x or y moves it in its spatial_index
+
+    Attributes:
+        tiles (dictionary): dictionary with tile coord as key and
+            list of entities on tile as value
+    """
+
+    def __init__(self):
+        self.tiles = {}
+
+    def __len__(self):
+        return sum(len(entities) for entities in self.tiles.values())
+
+    def rebuild(self, entities):
+        """
+        Empties index and adds every entity in entities
+
+        Args:
+            entities (List): List of entities to index
+        """
+        for entity_list in self.tiles.values():
+            for entity in entity_list:
+                entity.spatial_index = None
+        self.tiles = {}
+        for entity in entities:
+            self.add(entity)
+
+    def add(self, entity):
+        """
+        Adds entity to index at its position
+
+        Args:
+            entity (Entity): Entity to add
+        """
+        if entity.spatial_index is not None:
+            entity.spatial_index.remove(entity)
+        self.tiles.setdefault((entity.x, entity.y), []).append(entity)
+        entity.spatial_index = self
+
+    def remove(self, entity):
+        """
+        Removes entity from index
+
+        Args:
+            entity (Entity): Entity to remove
+        """
+        coord = (entity.x, entity.y)
+        entity_list = self.tiles[coord]
+        entity_list.remove(entity)
+        if not entity_list:
+            del self.tiles[coord]
+        entity.spatial_index = None
+
+    def move(self, entity, x, y):
+        """
+        Moves entity from its current position to (x, y) in index.
+        Only called by Entity before its position changes
+
+        Args:
+            entity (Entity): Entity that is moving
+            x (int): x coord entity is moving to
+            y (int): y coord entity is moving to
+        """
+        coord = (entity.x, entity.y)
+        entity_list = self.tiles[coord]
+        entity_list.remove(entity)
+        if not entity_list:
+            del self.tiles[coord]
+        self.tiles.setdefault((x, y), []).append(entity)
+
+    def at(self, x, y):
+        """
+        Returns list of entities at (x, y)
+
+        Args:
+            x (int): x coord on map
+            y (int): y coord on map
+
+        Returns:
+            entities (List): List of entities at (x, y)
+        """
+        return list(self.tiles.get((x, y), ()))
+
+    def in_rect(self, x_start, y_start, x_end, y_end):
+        """
+        Returns list of entities with x_start <= x < x_end
+        and y_start <= y < y_end
+
+        Only looks at the tiles in rect or the tiles with
+        entities on them, whichever is fewer
+
+        Args:
+            x_start (int): left most x coord
+            y_start (int): top most y coord
+            x_end (int): x coord after right most x coord
+            y_end (int): y coord after bottom most y coord
+
+        Returns:
+            entities (List): List of entities in rect
+        """
+        entities = []
+        if (x_end - x_start) * (y_end - y_start) <= len(self.tiles):
+            for y in range(y_start, y_end):
+                for x in range(x_start, x_end):
+                    entity_list = self.tiles.get((x, y))
+                    if entity_list:
+                        entities += entity_list
+        else:
+            for (x, y), entity_list in self.tiles.items():
+                if x_start <= x < x_end and y_start <= y < y_end:
+                    entities += entity_list
+        return entities
+
+    def in_radius(self, x, y, radius):
+        """
+        Returns list of entities within radius tiles of (x, y),
+        counting diagonal steps as 1 tile
+
+        Args:
+            x (int): x coord of center
+            y (int): y coord of center
+            radius (int): max # of tiles away from center
+
+        Returns:
+            entities (List): List of entities within radius
+        """
+        return self.in_rect(x - radius, y - radius, x + radius + 1, y + radius + 1)
@@ -1,4 +1,7 @@
 from constant import *
+import functools
+import hashlib
+import json
 import os
 
 # Image path
@@ -96,13 +99,32 @@ def load_anim(pathname, start_num, end_num, convert_alpha=True):
         start_num (int): image file name start #
         end_num (int): image file name end #
     """
+    pathnames = anim_pathnames(pathname, start_num, end_num)
     sprite_anim = []
-    sprite_anim.append(load_image(pathname, convert_alpha=convert_alpha))
+    sprite_anim.append(load_image(pathnames[0], convert_alpha=convert_alpha))
+    for tmp in pathnames[1:]:
+        sprite_anim.append(load_image(tmp))
+    return sprite_anim
+
+
+def anim_pathnames(pathname, start_num, end_num):
+    """
+    Returns image path names of every sprite in animation
+
+    Args:
+        pathname (string): image path name
+        start_num (int): image file name start #
+        end_num (int): image file name end #
+
+    Returns:
+        pathnames (List): image path names from start_num to end_num
+    """
+    pathnames = [pathname]
     tmp = pathname
     for i in range(start_num, end_num):
         tmp = tmp.replace(str(i), str(i + 1))
-        sprite_anim.append(load_image(tmp))
-    return sprite_anim
+        pathnames.append(tmp)
+    return pathnames
 
 
 def seen_sprite(image):
@@ -130,6 +152,23 @@ def flip_anim(anim_array):
     return flip_anim
 
 
+@functools.lru_cache(maxsize=SCALED_SPRITE_CACHE_SIZE)
+def scale_image(image, size):
+    """
+    Returns image scaled to size. Scaled images are cached, least
+    recently used first to go, so the same sprite scaled to the same
+    size is only scaled once
+
+    Args:
+        image (Surface): image to scale
+        size (tuple): width, height to scale image to
+
+    Returns:
+        scaled_image (Surface): image scaled to size. Shared, so it shouldn't be drawn on
+    """
+    return pygame.transform.scale(image, size)
+
+
 def scale_for_minimap(obj, scale_factor_x, scale_factor_y):
     """
     Scales obj image by scale_factor x and y
@@ -139,36 +178,241 @@ def scale_for_minimap(obj, scale_factor_x, scale_factor_y):
         scale_factor_x (int): what to scale x by
         scale_factor_y (int): what to scale y by
     """
-    obj_img = pygame.transform.scale(obj.image,
-                                     (int(obj.size[0] / scale_factor_x),
-                                      int(obj.size[1] / scale_factor_y)))
+    obj_img = scale_image(obj.image,
+                          (int(obj.size[0] / scale_factor_x),
+                           int(obj.size[1] / scale_factor_y)))
     obj_img_rect = obj_img.get_rect()
     obj_img_rect.topleft = (int(obj.rect[0] / scale_factor_x),
                             int(obj.rect[1] // scale_factor_y))
     return obj_img, obj_img_rect
 
 
+class SpriteAtlas:
+    """
+    Cache of sprites made from images in resource folder. Sprites are packed
+    into one atlas image on disk, so later launches load one image and cut
+    sprites out of it instead of loading, scaling and flipping every image
+
+    A sprite is made again if it isn't in the atlas or an image it is made
+    from changed since. If any sprite was made, save packs every sprite
+    used into a new atlas
+
+    Args:
+        cache_path (String): folder atlas is cached in
+
+    Attributes:
+        cache_path (arg, String): folder atlas is cached in
+        index_path (String): path of atlas index
+        index (dictionary): atlas image name and rect and source image
+            mtimes of every sprite in atlas by key
+        atlas (Surface): atlas image, None until a sprite is cut out of it
+        sprites (dictionary): every sprite used by key
+        sources (dictionary): source image mtimes of every sprite used by key
+        dirty (Boolean): True if a sprite had to be made
+    """
+
+    def __init__(self, cache_path=SPRITE_CACHE_PATH):
+        self.cache_path = cache_path
+        self.index_path = os.path.join(cache_path, "atlas_{}.json".format(SPRITE_SIZE))
+        self.index = self._load_index()
+        self.atlas = None
+        self.sprites = {}
+        self.sources = {}
+        self.dirty = False
+
+    def image(self, name, sprite_size=(SPRITE_SIZE, SPRITE_SIZE)):
+        """
+        Returns image loaded like load_image
+
+        Args:
+            name (string): Pathname of image
+            sprite_size ((int, int)): Size of resulting image
+        """
+        key = "{}@{}x{}".format(name, *sprite_size)
+        return self._sprite(key, [name], lambda: load_image(name, sprite_size=sprite_size))
+
+    def seen_image(self, name):
+        """
+        Returns seen image of image loaded like load_image
+
+        Args:
+            name (string): Pathname of image
+        """
+        return self._sprite("seen:" + name, [name], lambda: seen_sprite(self.image(name)))
+
+    def flipped_image(self, name):
+        """
+        Returns image loaded like load_image flipped to face the other way
+
+        Args:
+            name (string): Pathname of image
+        """
+        return self._sprite("flip:" + name, [name],
+                            lambda: pygame.transform.flip(self.image(name), True, False))
+
+    def anim(self, pathname, start_num, end_num):
+        """
+        Returns list of sprites of animation, like load_anim
+        """
+        return [self.image(name) for name in anim_pathnames(pathname, start_num, end_num)]
+
+    def flipped_anim(self, pathname, start_num, end_num):
+        """
+        Returns list of sprites of animation facing the other way, like flip_anim
+        """
+        return [self.flipped_image(name) for name in anim_pathnames(pathname, start_num, end_num)]
+
+    def _sprite(self, key, names, make_sprite):
+        """
+        Returns sprite with key, cutting it out of atlas if it is
+        there and up to date, else making it
+
+        Args:
+            key (String): key of sprite
+            names (List): pathnames of images sprite is made from
+            make_sprite (fn pointer): function making sprite
+
+        Returns:
+            sprite (Surface): sprite with key
+        """
+        if key in self.sprites:
+            return self.sprites[key]
+
+        sources = {name: _mtime(name) for name in names}
+        entry = self.index["sprites"].get(key)
+        sprite = None
+        if entry is not None and entry["sources"] == sources and self._load_atlas():
+            sprite = self.atlas.subsurface(pygame.Rect(entry["rect"]))
+        if sprite is None:
+            sprite = make_sprite()
+            self.dirty = True
+
+        self.sprites[key] = sprite
+        self.sources[key] = sources
+        return sprite
+
+    def _load_index(self):
+        """
+        Returns index of cached atlas, or an empty index if there isn't
+        one for this SPRITE_SIZE and SPRITE_ATLAS_VERSION
+        """
+        try:
+            with open(self.index_path) as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            index = {}
+        if index.get("version") != SPRITE_ATLAS_VERSION or index.get("sprite_size") != SPRITE_SIZE:
+            index = {"sprites": {}}
+        return index
+
+    def _load_atlas(self):
+        """
+        Loads atlas image if it isn't already
+
+        Returns:
+            True if atlas is loaded
+        """
+        if self.atlas is None:
+            try:
+                self.atlas = pygame.image.load(os.path.join(self.cache_path, self.index["image"])).convert_alpha()
+            except (pygame.error, OSError):
+                # Nothing can be cut out of a missing atlas
+                self.index = {"sprites": {}}
+                return False
+        return True
+
+    def save(self):
+        """
+        Packs every sprite used into a new atlas and writes it and its
+        index to cache_path, if any sprite had to be made
+        """
+        if not self.dirty:
+            return
+
+        # Sprites are placed left to right in rows, tallest first
+        keys = sorted(self.sprites, key=lambda key: (-self.sprites[key].get_height(), key))
+        width = max([SPRITE_ATLAS_WIDTH] + [sprite.get_width() for sprite in self.sprites.values()])
+        x = y = row_height = 0
+        sprites = {}
+        for key in keys:
+            sprite_width, sprite_height = self.sprites[key].get_size()
+            if x + sprite_width > width:
+                x = 0
+                y += row_height
+                row_height = 0
+            sprites[key] = {"rect": [x, y, sprite_width, sprite_height], "sources": self.sources[key]}
+            x += sprite_width
+            row_height = max(row_height, sprite_height)
+
+        atlas = pygame.Surface((width, y + row_height), pygame.SRCALPHA)
+        atlas.fill((0, 0, 0, 0))
+        for key, entry in sprites.items():
+            # Adding to a clear surface copies pixels exactly, alpha included
+            atlas.blit(self.sprites[key], entry["rect"][:2], special_flags=pygame.BLEND_RGBA_ADD)
+
+        # Atlas name changes with its contents, so an index is never paired with the wrong atlas
+        digest = hashlib.sha1(json.dumps(sprites, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        image_name = "atlas_{}_{}.png".format(SPRITE_SIZE, digest)
+        index = {"version": SPRITE_ATLAS_VERSION, "sprite_size": SPRITE_SIZE,
+                 "image": image_name, "sprites": sprites}
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+            image_path = os.path.join(self.cache_path, image_name)
+            pygame.image.save(atlas, image_path + ".tmp.png")
+            os.replace(image_path + ".tmp.png", image_path)
+            with open(self.index_path + ".tmp", 'w') as file:
+                json.dump(index, file)
+            os.replace(self.index_path + ".tmp", self.index_path)
+            old_image_name = self.index.get("image")
+            if old_image_name and old_image_name != image_name:
+                os.remove(os.path.join(self.cache_path, old_image_name))
+        except (pygame.error, OSError) as error:
+            print("Cannot cache sprites:", error)
+        self.index = index
+        self.dirty = False
+
+
+def _mtime(name):
+    """
+    Returns modified time of image in resource folder in ns, None if it doesn't exist
+
+    Args:
+        name (string): Pathname of image
+    """
+    try:
+        return os.stat(os.path.join(RESOURCE_PATH, name)).st_mtime_ns
+    except OSError:
+        return None
+
+
 class GameSprites:
     """
     Class that holds all the sprite images
+
+    Args:
+        atlas (SpriteAtlas): atlas to get sprites from, the one in
+            SPRITE_CACHE_PATH if None
     """
 
-    def __init__(self):
+    def __init__(self, atlas=None):
+        if atlas is None:
+            atlas = SpriteAtlas()
+
         #  Environment
-        self.wall_image = load_image(WALL_1)
-        self.seen_wall_image = seen_sprite(self.wall_image)
+        self.wall_image = atlas.image(WALL_1)
+        self.seen_wall_image = atlas.seen_image(WALL_1)
 
-        self.floor_image_1 = load_image(FLOOR_1)
-        self.seen_floor_image_1 = seen_sprite(self.floor_image_1)
+        self.floor_image_1 = atlas.image(FLOOR_1)
+        self.seen_floor_image_1 = atlas.seen_image(FLOOR_1)
 
-        self.floor_image_2 = load_image(FLOOR_2)
-        self.seen_floor_image_2 = seen_sprite(self.floor_image_2)
+        self.floor_image_2 = atlas.image(FLOOR_2)
+        self.seen_floor_image_2 = atlas.seen_image(FLOOR_2)
 
-        self.upstair = load_image(STAIR_UP)
-        self.seen_upstair = seen_sprite(self.upstair)
+        self.upstair = atlas.image(STAIR_UP)
+        self.seen_upstair = atlas.seen_image(STAIR_UP)
 
-        self.downstair = load_image(STAIR_DOWN)
-        self.seen_downstair = seen_sprite(self.downstair)
+        self.downstair = atlas.image(STAIR_DOWN)
+        self.seen_downstair = atlas.seen_image(STAIR_DOWN)
 
         self.unseen_tile = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE))
         self.unseen_tile.fill(BLACK)
@@ -182,83 +426,83 @@ class GameSprites:
         self.unfocused_window.set_alpha(5)
 
         # Creatures
-        self.slime_anim = load_anim(SLIME, 0, 5)
-        self.slime_run_anim = load_anim(SLIME_RUN, 0, 5)
+        self.slime_anim = atlas.anim(SLIME, 0, 5)
+        self.slime_run_anim = atlas.anim(SLIME_RUN, 0, 5)
 
-        self.goblin_anim = load_anim(GOBLIN, 0, 5)
-        self.goblin_run_anim = load_anim(GOBLIN_RUN, 0, 5)
+        self.goblin_anim = atlas.anim(GOBLIN, 0, 5)
+        self.goblin_run_anim = atlas.anim(GOBLIN_RUN, 0, 5)
 
-        self.skeleton_anim = load_anim(SKELETON, 0, 3)
-        self.skeleton_run_anim = load_anim(SKELETON_RUN, 0, 3)
+        self.skeleton_anim = atlas.anim(SKELETON, 0, 3)
+        self.skeleton_run_anim = atlas.anim(SKELETON_RUN, 0, 3)
 
         # Knight
-        self.knight_anim = load_anim(KNIGHT, 0, 5)
-        self.knight_run_anim = load_anim(KNIGHT_RUN, 0, 5)
+        self.knight_anim = atlas.anim(KNIGHT, 0, 5)
+        self.knight_run_anim = atlas.anim(KNIGHT_RUN, 0, 5)
 
-        self.wizard_anim = load_anim(WIZARD, 0, 3)
-        self.wizard_run_anim = load_anim(WIZARD_RUN, 0, 3)
+        self.wizard_anim = atlas.anim(WIZARD, 0, 3)
+        self.wizard_run_anim = atlas.anim(WIZARD_RUN, 0, 3)
 
         # UI
-        self.empty_inventory_slot = load_image(EMPTY_INVENTORY_SLOT)
-        self.inventory_button = load_image(INVENTORY)
-        self.equip_screen = load_image(EQUIP_SCREEN, None, (TILE_WIDTH // 2 * SPRITE_SIZE, TILE_HEIGHT // 2 * SPRITE_SIZE))
-        self.minimap_button = load_image(MINIMAP_BUTTON)
-        self.map_button = load_image(MAP_BUTTON)
+        self.empty_inventory_slot = atlas.image(EMPTY_INVENTORY_SLOT)
+        self.inventory_button = atlas.image(INVENTORY)
+        self.equip_screen = atlas.image(EQUIP_SCREEN, (TILE_WIDTH // 2 * SPRITE_SIZE, TILE_HEIGHT // 2 * SPRITE_SIZE))
+        self.minimap_button = atlas.image(MINIMAP_BUTTON)
+        self.map_button = atlas.image(MAP_BUTTON)
 
         # Sprite dicts
         self.magic = {
-            "fireball": load_image(FIREBALL),
-            "lightning": load_image(LIGHTNING),
-            "confusion": load_image(CONFUSION)
+            "fireball": atlas.image(FIREBALL),
+            "lightning": atlas.image(LIGHTNING),
+            "confusion": atlas.image(CONFUSION)
         }
 
         self.entity_dict = {
             # Creatures
             "slime": {
                 "idle_right": self.slime_anim,
-                "idle_left": flip_anim(self.slime_anim),
+                "idle_left": atlas.flipped_anim(SLIME, 0, 5),
                 "run_right": self.slime_run_anim,
-                "run_left": flip_anim(self.slime_run_anim)
+                "run_left": atlas.flipped_anim(SLIME_RUN, 0, 5)
             },
             "goblin": {
                 "idle_right": self.goblin_anim,
-                "idle_left": flip_anim(self.goblin_anim),
+                "idle_left": atlas.flipped_anim(GOBLIN, 0, 5),
                 "run_right": self.goblin_run_anim,
-                "run_left": flip_anim(self.goblin_run_anim)
+                "run_left": atlas.flipped_anim(GOBLIN_RUN, 0, 5)
             },
             "skeleton": {
                 "idle_right": self.skeleton_anim,
-                "idle_left": flip_anim(self.skeleton_anim),
+                "idle_left": atlas.flipped_anim(SKELETON, 0, 3),
                 "run_right": self.skeleton_run_anim,
-                "run_left": flip_anim(self.skeleton_run_anim)
+                "run_left": atlas.flipped_anim(SKELETON_RUN, 0, 3)
             },
             # Knight
             "knight": {
                 "idle_right": self.knight_anim,
-                "idle_left": flip_anim(self.knight_anim),
+                "idle_left": atlas.flipped_anim(KNIGHT, 0, 5),
                 "run_right": self.knight_run_anim,
-                "run_left": flip_anim(self.knight_run_anim)
+                "run_left": atlas.flipped_anim(KNIGHT_RUN, 0, 5)
             },
 
             "wizard": {
                 "idle_right": self.wizard_anim,
-                "idle_left": flip_anim(self.wizard_anim),
+                "idle_left": atlas.flipped_anim(WIZARD, 0, 3),
                 "run_right": self.wizard_run_anim,
-                "run_left": flip_anim(self.wizard_run_anim)
+                "run_left": atlas.flipped_anim(WIZARD_RUN, 0, 3)
             },
 
             # Items
-            "sword": load_image(SWORD),
-            "shield": load_image(SHIELD),
-            "armor": load_image(ARMOR),
-            "chest": load_image(CHEST),
+            "sword": atlas.image(SWORD),
+            "shield": atlas.image(SHIELD),
+            "armor": atlas.image(ARMOR),
+            "chest": atlas.image(CHEST),
 
             # Consumables
-            "red potion": load_image(RED_POTION),
-            "blue potion": load_image(BLUE_POTION),
-            "teleport scroll": load_image(TELEPORT_SCROLL),
+            "red potion": atlas.image(RED_POTION),
+            "blue potion": atlas.image(BLUE_POTION),
+            "teleport scroll": atlas.image(TELEPORT_SCROLL),
 
-            "camera": load_image(CAMERA)
+            "camera": atlas.image(CAMERA)
         }
 
         self.tile_dict = {
@@ -290,4 +534,6 @@ class GameSprites:
             "unseen": self.unseen_tile,
 
             "select": self.select_tile,
-        }
\ No newline at end of file
+        }
+
+        atlas.save()
@@ -0,0 +1,151 @@
+"""
+Startup time report
+
+Times importing every game module and the initialization steps wrapped
+in stage, and prints them once the main menu is about to show:
+
+    python src/main.py --startup-report
+"""
+import os
+import sys
+import time
+
+# True if startup is being timed. Stages do nothing while False
+ENABLED = False
+
+# Folder game modules are in. Only imports of modules in it are timed
+_SOURCE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# Time enable was called
+_start = 0.0
+# Module name: [self seconds, total seconds] in order modules finished importing
+_import_times = {}
+# List of (stage, seconds) in order stages finished
+_stage_times = []
+# Total seconds of each module being imported, to take nested imports out of self time
+_import_stack = []
+
+
+class _TimedLoader:
+    """
+    Loader timing the module loader it wraps
+
+    Attributes:
+        loader (arg, Loader): loader of module
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        _import_stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            nested = _import_stack.pop()
+            if _import_stack:
+                _import_stack[-1] += total
+            _import_times[module.__name__] = [total - nested, total]
+
+
+class _ImportTimer:
+    """
+    Meta path finder wrapping the loader of every game module in a _TimedLoader
+    """
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.origin and os.path.dirname(os.path.abspath(spec.origin)) == _SOURCE_PATH \
+                        and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader)
+                return spec
+        return None
+
+
+class _StageTimer:
+    """
+    Context manager adding time spent in it to _stage_times
+
+    Attributes:
+        stage (arg, String): stage being timed
+        start (float): time stage started
+    """
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        _stage_times.append((self.stage, time.perf_counter() - self.start))
+
+
+class _NullTimer:
+    """
+    Context manager that does nothing, used while startup isn't timed
+    """
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+def enable():
+    """
+    Starts timing startup. Has to be called before game modules are imported
+    """
+    global ENABLED, _start
+    if not ENABLED:
+        ENABLED = True
+        _start = time.perf_counter()
+        sys.meta_path.insert(0, _ImportTimer())
+
+
+def stage(name):
+    """
+    Returns context manager timing an initialization step, ie
+
+        with startup.stage("sprites"):
+            ...
+
+    Args:
+        name (String): name of step
+
+    Returns:
+        timer: context manager timing step, or one doing nothing if startup isn't timed
+    """
+    if ENABLED:
+        return _StageTimer(name)
+    return _NullTimer()
+
+
+def report():
+    """
+    Prints import time of every game module, slowest first, time of every
+    stage and time since enable was called
+    """
+    if not ENABLED:
+        return
+    print("{:<28}{:>10}{:>10}".format("import (ms)", "self", "total"))
+    for name, (self_time, total) in sorted(_import_times.items(), key=lambda item: -item[1][0]):
+        print("{:<28}{:>10.1f}{:>10.1f}".format(name, self_time * 1000, total * 1000))
+    print("{:<28}{:>10}".format("stage (ms)", ""))
+    for name, seconds in _stage_times:
+        print("{:<28}{:>10.1f}".format(name, seconds * 1000))
+    print("{:<28}{:>10.1f}".format("startup total (ms)", (time.perf_counter() - _start) * 1000))